@@ -7,7 +7,8 @@ from routes.ml import ml_bp
 
 app = Flask(__name__)
 # Vue(localhost:5173) からのアクセスを許可する設定
-CORS(app)
+# ページング情報のヘッダーはフロントエンドから読めるように公開する
+CORS(app, expose_headers=["X-Next-After-Id", "X-Total-Estimate"])
 
 # Register Blueprints
 app.register_blueprint(jobs_bp)
@@ -0,0 +1,68 @@
+# backend/benchmarks/bench_classify.py
+"""
+業界分類のスループット計測
+キーワードを1つずつ調べる従来の方法と、コンパイル済みの正規表現による
+classify_industry / classify_industries を比較する
+
+使い方: python benchmarks/bench_classify.py [件数]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawler import INDUSTRY_KEYWORDS, classify_industries, classify_industry
+
+EXTRA_WORDS = ["スタッフ", "正社員", "アルバイト", "未経験歓迎", "急募", "ドライバー"]
+
+
+def classify_by_loop(title):
+    """従来の実装（業界の順・キーワードの順に部分一致を調べる）"""
+    if not title:
+        return "その他"
+    title_upper = title.upper()
+    for industry, keywords in INDUSTRY_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword.upper() in title_upper:
+                return industry
+    return "その他"
+
+
+def make_titles(count, unique=50000):
+    """ベンチマーク用の職種タイトルを作成（実データのように同じタイトルが繰り返し現れる）"""
+    rng = random.Random(0)
+    words = [k for keywords in INDUSTRY_KEYWORDS.values() for k in keywords]
+    words += EXTRA_WORDS
+    pool = [
+        "".join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+        for _ in range(min(count, unique))
+    ]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    titles = make_titles(count)
+
+    cases = [
+        ("キーワードごとの部分一致", lambda: [classify_by_loop(t) for t in titles]),
+        ("classify_industry", lambda: [classify_industry(t) for t in titles]),
+        ("classify_industries", lambda: classify_industries(titles)),
+    ]
+
+    expected = None
+    for name, run in cases:
+        start = time.perf_counter()
+        result = run()
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {count}件 {elapsed:.2f}秒 ({count / elapsed:,.0f}件/秒)")
+        if expected is None:
+            expected = result
+        elif result != expected:
+            print(f"⚠️ {name} の分類結果が従来の実装と一致しません")
+
+
+if __name__ == "__main__":
+    main()
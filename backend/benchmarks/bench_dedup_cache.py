@@ -0,0 +1,106 @@
+# backend/benchmarks/bench_dedup_cache.py
+"""
+重複判定キャッシュ（DedupCache）のメモリ使用量と判定速度の計測
+保存済み求人の件数に対するメモリ使用量・1ページ（50件）あたりの判定時間と、
+DBからの読み込み時間・保存済みのページをSQLiteで重複スキップする場合との比較を表示する
+
+使い方: python benchmarks/bench_dedup_cache.py [保存済み件数] [DB読み込み件数]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import (
+    close_pools,
+    get_connection,
+    init_db_with_path,
+    make_dedup_key,
+    save_jobs_bulk,
+)
+from dedup_cache import DedupCache
+
+PAGE_SIZE = 50
+
+
+def bench_memory(count):
+    """count件の保存済み求人を持つキャッシュのメモリ使用量と判定速度"""
+    rng = np.random.default_rng(0)
+    hashes = rng.integers(0, 2**64, size=count, dtype=np.uint64)
+    start = time.perf_counter()
+    cache = DedupCache(hashes)
+    build = time.perf_counter() - start
+    del hashes
+
+    keys = [make_dedup_key(f"求人{i}", f"会社{i}") for i in range(PAGE_SIZE * 200)]
+    start = time.perf_counter()
+    for i in range(0, len(keys), PAGE_SIZE):
+        cache.contains(keys[i : i + PAGE_SIZE])
+    lookup = (time.perf_counter() - start) / (len(keys) / PAGE_SIZE)
+
+    print(
+        f"キャッシュ {len(cache):,}件: {cache.nbytes / 1024 ** 2:,.1f}MB "
+        f"(整列 {build:.2f}秒, 1ページ{PAGE_SIZE}件の判定 {lookup * 1000:.3f}ミリ秒)"
+    )
+
+
+def bench_load(count):
+    """DBからの読み込み時間と、保存済みのページをsave_jobs_bulkでスキップする場合との比較"""
+    rows = [
+        (
+            f"求人{i}",
+            200000,
+            300000,
+            "monthly",
+            f"会社{i % 5000}",
+            "東京都",
+            "",
+            "その他",
+        )
+        for i in range(count)
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench_dedup.db")
+        init_db_with_path(db_path)
+        conn = get_connection(db_path)
+        for i in range(0, count, 10000):
+            save_jobs_bulk(conn, rows[i : i + 10000])
+
+        start = time.perf_counter()
+        cache = DedupCache.load(db_path)
+        load = time.perf_counter() - start
+
+        known = rows[: PAGE_SIZE * 200]
+        pages = len(known) / PAGE_SIZE
+        start = time.perf_counter()
+        for i in range(0, len(known), PAGE_SIZE):
+            save_jobs_bulk(conn, known[i : i + PAGE_SIZE])
+        sqlite = (time.perf_counter() - start) / pages
+        start = time.perf_counter()
+        for i in range(0, len(known), PAGE_SIZE):
+            cache.filter_new(known[i : i + PAGE_SIZE])
+        memory = (time.perf_counter() - start) / pages
+        conn.close()
+        close_pools(db_path)
+
+    print(f"DBから{count:,}件を読み込み: {load:.2f}秒")
+    print(
+        f"保存済みの1ページ{PAGE_SIZE}件: save_jobs_bulk {sqlite * 1000:.3f}ミリ秒 / "
+        f"キャッシュ {memory * 1000:.3f}ミリ秒（DBへの書き込みなし）"
+    )
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    load_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200_000
+
+    bench_memory(count)
+    bench_load(load_count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# backend/benchmarks/bench_ingest.py
+"""
+求人データ保存のスループット計測
+1件ずつcommitする従来の保存とsave_jobs_bulkを比較する
+
+使い方: python benchmarks/bench_ingest.py [件数] [ページサイズ]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import (
+    close_pools,
+    get_connection,
+    init_db_with_path,
+    save_job_if_not_duplicate,
+    save_jobs_bulk,
+)
+
+
+def make_rows(count, offset=0):
+    """ベンチマーク用の求人データを作成"""
+    return [
+        (
+            f"求人{offset + i}",
+            200000 + i % 1000,
+            300000,
+            "monthly",
+            f"会社{(offset + i) % 5000}",
+            "東京都千代田区",
+            f"https://example.com/{offset + i}",
+            "その他",
+        )
+        for i in range(count)
+    ]
+
+
+def bench_per_row(db_path, rows):
+    conn = get_connection(db_path)
+    start = time.perf_counter()
+    for row in rows:
+        save_job_if_not_duplicate(conn, row)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def bench_bulk(db_path, rows, page_size):
+    conn = get_connection(db_path)
+    start = time.perf_counter()
+    for i in range(0, len(rows), page_size):
+        save_jobs_bulk(conn, rows[i : i + page_size])
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    rows = make_rows(count)
+
+    cases = [
+        ("1件ずつcommit", lambda path: bench_per_row(path, rows)),
+        (
+            f"save_jobs_bulk ({page_size}件/ページ)",
+            lambda path: bench_bulk(path, rows, page_size),
+        ),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (name, run) in enumerate(cases):
+            db_path = os.path.join(tmp, f"bench_{i}.db")
+            init_db_with_path(db_path)
+            elapsed = run(db_path)
+            print(f"{name}: {count}件 {elapsed:.2f}秒 ({count / elapsed:,.0f}件/秒)")
+            close_pools(db_path)
+
+
+if __name__ == "__main__":
+    main()
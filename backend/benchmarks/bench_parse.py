@@ -0,0 +1,121 @@
+# backend/benchmarks/bench_parse.py
+"""
+求人ページのパース性能の計測
+ページ全体をhtml.parserで解析する従来の方法と、
+求人カードの部分だけをlxmlで解析するfind_job_elementsを比較する
+
+使い方: python benchmarks/bench_parse.py [ページ数] [1ページの求人数]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from crawler import parse_job_html
+from html_parsing import HTML_PARSER, find_job_elements
+from indeed_crawler import parse_indeed_job
+
+HELLOWORK_CARD = """
+<table class="kyujin">
+    <tr class="kyujin_head"><td><a href="/detail/{i}">介護スタッフ{i}</a></td></tr>
+    <tr class="kyujin_body"><td>
+        <table class="noborder">
+            <tr class="border_new"><td class="fb">事業所名</td><td>株式会社サンプル{i}</td></tr>
+            <tr class="border_new"><td class="fb">就業場所</td><td>東京都新宿区</td></tr>
+            <tr class="border_new"><td class="fb">賃金（手当等を含む）</td><td>月給 {wage},000円〜300,000円</td></tr>
+            <tr class="border_new"><td class="fb">仕事の内容</td><td>{detail}</td></tr>
+        </table>
+    </td></tr>
+</table>
+"""
+
+INDEED_CARD = """
+<div class="job_seen_beacon">
+    <h2 class="jobTitle"><a href="/rc/clk?jk={i}">倉庫作業スタッフ{i}</a></h2>
+    <span data-testid="company-name">株式会社サンプル{i}</span>
+    <div data-testid="text-location">大阪府大阪市</div>
+    <ul>
+        <li class="salary-snippet-container" data-testid="attribute_snippet_testid">時給 1,{wage}円</li>
+        <li data-testid="attribute_snippet_testid">アルバイト・パート</li>
+    </ul>
+    <div class="snippet">{detail}</div>
+</div>
+"""
+
+# 求人カード以外の部分（ナビゲーション・検索フォーム・スクリプトなど）
+PAGE_NOISE = (
+    "<div class='nav'>"
+    + "".join(f"<a href='/m/{n}'>メニュー{n}</a>" for n in range(300))
+    + "</div><form>"
+    + "".join(f"<option value='{n}'>選択肢{n}</option>" for n in range(500))
+    + "</form><script>"
+    + "var data = '"
+    + "x" * 50000
+    + "';"
+    + "</script>"
+)
+
+
+def make_page(card, count):
+    detail = "業務内容の説明。" * 20
+    cards = "".join(
+        card.format(i=i, wage=200 + i % 100, detail=detail) for i in range(count)
+    )
+    return f"<html><body>{PAGE_NOISE}{cards}{PAGE_NOISE}</body></html>"
+
+
+def bench(pages, parse):
+    start = time.perf_counter()
+    results = [parse(html) for html in pages]
+    return time.perf_counter() - start, results
+
+
+def main():
+    page_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    per_page = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    sources = [
+        (
+            "ハローワーク",
+            [make_page(HELLOWORK_CARD, per_page)] * page_count,
+            lambda html: [
+                parse_job_html(t)
+                for t in BeautifulSoup(html, "html.parser").select("table.kyujin")
+            ],
+            lambda html: [
+                parse_job_html(t) for t in find_job_elements(html, "table", "kyujin")
+            ],
+        ),
+        (
+            "Indeed",
+            [make_page(INDEED_CARD, per_page)] * page_count,
+            lambda html: [
+                parse_indeed_job(c)
+                for c in BeautifulSoup(html, "html.parser").find_all(
+                    "div", class_="job_seen_beacon"
+                )
+            ],
+            lambda html: [
+                parse_indeed_job(c)
+                for c in find_job_elements(html, "div", "job_seen_beacon")
+            ],
+        ),
+    ]
+
+    for name, pages, parse_full, parse_strained in sources:
+        jobs = page_count * per_page
+        full_time, expected = bench(pages, parse_full)
+        strained_time, results = bench(pages, parse_strained)
+        print(
+            f"{name}: {page_count}ページ {jobs}件 "
+            f"html.parser(全体) {full_time:.2f}秒 ({jobs / full_time:,.0f}件/秒) / "
+            f"{HTML_PARSER}(求人部分) {strained_time:.2f}秒 ({jobs / strained_time:,.0f}件/秒)"
+        )
+        if results != expected:
+            print(f"⚠️ {name} のパース結果が一致しません")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# backend/benchmarks/bench_region.py
+"""
+複数都道府県の並列クロールの計測
+ローカルの代役サーバー（応答に一定の遅延を入れる）に対してHTTP取得モードで
+crawl_prefecturesを実行し、ワーカー数ごとの所要時間を比較する
+
+使い方: python benchmarks/bench_region.py [都道府県数] [応答遅延（秒）]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import crawler
+from database import close_pools, init_db_with_path
+from prefectures import PREFECTURE_CODES
+from region_crawler import crawl_prefectures
+
+PAGES_PER_PREFECTURE = 3
+JOBS_PER_PAGE = 20
+
+SEARCH_FORM = """
+<html><body>
+<form method="post" action="/kensaku/GECA110010.do">
+  <input type="hidden" name="screenId" value="GECA110010">
+  <select name="tDFK1CmbBox" id="ID_tDFK1CmbBox"><option value="">-</option></select>
+  <input type="submit" name="searchBtn" id="ID_searchBtn" value="検索">
+</form>
+</body></html>
+"""
+
+CARD = """
+<table class="kyujin">
+  <tr class="kyujin_head"><td><a href="/detail/{code}-{page}-{i}">介護スタッフ{i}</a></td></tr>
+  <tr class="kyujin_body"><td><table class="noborder">
+    <tr class="border_new"><td class="fb">事業所名</td><td>株式会社サンプル{code}-{page}</td></tr>
+    <tr class="border_new"><td class="fb">就業場所</td><td>市内</td></tr>
+    <tr class="border_new"><td class="fb">賃金（手当等を含む）</td><td>月給 {wage},000円〜300,000円</td></tr>
+  </table></td></tr>
+</table>
+"""
+
+
+def make_result_page(code, page):
+    cards = "".join(
+        CARD.format(code=code, page=page, i=i, wage=200 + i)
+        for i in range(JOBS_PER_PAGE)
+    )
+    next_disabled = " disabled" if page >= PAGES_PER_PREFECTURE else ""
+    return f"""
+    <html><body>
+    <form method="post" action="/kensaku/GECA110010.do">
+      <input type="hidden" name="tDFK1CmbBox" value="{code}">
+      <input type="hidden" name="page" value="{page}">
+      {cards}
+      <input type="submit" name="fwListNaviBtnNext" value="次へ"{next_disabled}>
+    </form>
+    </body></html>
+    """
+
+
+def make_handler(latency):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, text):
+            time.sleep(latency)
+            body = text.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=UTF-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            self._send(SEARCH_FORM)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            form = parse_qs(self.rfile.read(length).decode("utf-8"))
+            code = form.get("tDFK1CmbBox", [""])[0]
+            page = int(form.get("page", ["0"])[0]) + 1
+            self._send(make_result_page(code, page))
+
+    return Handler
+
+
+def main():
+    prefecture_count = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+    prefectures = list(PREFECTURE_CODES)[:prefecture_count]
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    crawler.HELLOWORK_BASE_URL = f"http://127.0.0.1:{server.server_address[1]}"
+
+    # 計測中のログ出力を抑える
+    stdout = sys.stdout
+    baseline = None
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for workers in (1, 2, 4, 8):
+                db_path = os.path.join(tmp, f"bench_region_{workers}.db")
+                sys.stdout = open(os.devnull, "w")
+                try:
+                    init_db_with_path(db_path)
+                    result = crawl_prefectures(
+                        prefectures,
+                        workers=workers,
+                        max_pages=PAGES_PER_PREFECTURE,
+                        fetch_mode="http",
+                        politeness_delay=0,
+                        db_name=db_path,
+                    )
+                finally:
+                    sys.stdout.close()
+                    sys.stdout = stdout
+                close_pools()
+
+                elapsed = result["elapsed_seconds"]
+                baseline = baseline or elapsed
+                print(
+                    f"ワーカー{workers}: {prefecture_count}都道府県 {result['count']:,}件 "
+                    f"{elapsed:.2f}秒 (1ワーカー比 {baseline / elapsed:.1f}倍)"
+                )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# backend/benchmarks/bench_search.py
+"""
+キーワード検索のレイテンシ計測
+LIKEによる部分一致検索と全文検索インデックス（jobs_fts）を比較する
+
+使い方: python benchmarks/bench_search.py [件数] [キーワード...]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import (
+    _search_conditions,
+    close_pools,
+    get_connection,
+    init_db_with_path,
+    save_jobs_bulk,
+)
+
+TITLES = ["介護スタッフ", "倉庫内作業", "一般事務", "飲食店ホール", "施工管理技士"]
+BATCH_SIZE = 10000
+REPEAT = 5
+
+
+def make_rows(count, offset=0):
+    """ベンチマーク用の求人データを作成"""
+    return [
+        (
+            f"{TITLES[(offset + i) % len(TITLES)]}{offset + i}",
+            200000 + i % 1000,
+            300000,
+            "monthly",
+            f"会社{(offset + i) % 5000}",
+            "東京都千代田区",
+            f"https://example.com/{offset + i}",
+            "その他",
+        )
+        for i in range(count)
+    ]
+
+
+def fill_db(db_path, count):
+    conn = get_connection(db_path)
+    for offset in range(0, count, BATCH_SIZE):
+        save_jobs_bulk(conn, make_rows(min(BATCH_SIZE, count - offset), offset))
+    conn.close()
+
+
+def bench_keyword(c, keyword, use_fts):
+    """キーワード1件の検索時間（REPEAT回の最小値）と件数を返す"""
+    conditions, params = _search_conditions(keyword=keyword, c=c if use_fts else None)
+    query = f"SELECT id FROM jobs WHERE {' AND '.join(conditions)}"
+    best = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        hits = len(c.execute(query, params).fetchall())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, hits
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    keywords = sys.argv[2:] or ["介護スタッフ", "施工管理", "会社123"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "bench_search.db")
+        init_db_with_path(db_path)
+        fill_db(db_path, count)
+
+        conn = get_connection(db_path)
+        c = conn.cursor()
+        for keyword in keywords:
+            like_time, like_hits = bench_keyword(c, keyword, use_fts=False)
+            fts_time, fts_hits = bench_keyword(c, keyword, use_fts=True)
+            print(
+                f"「{keyword}」 {count}件中 {like_hits}件: "
+                f"LIKE {like_time * 1000:.1f}ms / 全文検索 {fts_time * 1000:.1f}ms"
+                + ("" if like_hits == fts_hits else f" (全文検索 {fts_hits}件)")
+            )
+        conn.close()
+        close_pools(db_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+# backend/crawl_checkpoints.py
+"""
+クロールの再開位置（チェックポイント）
+取得元・都道府県・キーワードごとに、最後に保存まで完了したページと
+検索結果の指紋（1ページ目の求人の並び）をcrawl_checkpointsテーブルに記録する
+途中で失敗したクロールは、次回同じ検索結果であれば続きのページから再開する
+並列クロールではJobWriterを渡し、記録の書き込みを求人の保存と同じスレッドで行う
+"""
+import os
+import threading
+
+import database
+from database import get_connection
+
+# 実行中のクロールが使っているチェックポイント（同じ条件の同時実行で記録を壊さない）
+_claimed = set()
+_claimed_lock = threading.Lock()
+
+
+def _upsert_checkpoint(conn, key, last_page, fingerprint):
+    with conn:
+        conn.execute(
+            """
+            INSERT INTO crawl_checkpoints
+                (source, prefecture, keyword, last_page, fingerprint, updated_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT (source, prefecture, keyword) DO UPDATE SET
+                last_page = excluded.last_page,
+                fingerprint = excluded.fingerprint,
+                updated_at = excluded.updated_at
+        """,
+            (*key, last_page, fingerprint),
+        )
+
+
+def _delete_checkpoint(conn, key):
+    with conn:
+        conn.execute(
+            """
+            DELETE FROM crawl_checkpoints
+            WHERE source = ? AND prefecture = ? AND keyword = ?
+        """,
+            key,
+        )
+
+
+class CrawlCheckpoint:
+    """
+    1つの検索条件のチェックポイント
+
+    使い方:
+        checkpoint = CrawlCheckpoint("hellowork", "北海道")
+        if checkpoint.claim():  # 同じ条件のクロールが実行中ならFalse
+            try:
+                resume_page = checkpoint.start(fingerprint)  # 0なら先頭から
+                ...ページを保存するたびに checkpoint.page_done(page)...
+                checkpoint.complete()  # 最後まで取得したら消す
+            finally:
+                checkpoint.release()
+
+    Args:
+        source: 取得元（"hellowork" など）
+        prefecture: 都道府県名
+        keyword: 検索キーワード
+        db_name: データベースファイル名（省略時はDB_NAME、writer指定時はwriterのDB）
+        writer: 書き込みを任せるJobWriter（並列クロール用、省略時はこのスレッドで書き込む）
+    """
+
+    def __init__(self, source, prefecture, keyword="", db_name=None, writer=None):
+        self.source = source
+        self.prefecture = prefecture or ""
+        self.keyword = keyword or ""
+        self.writer = writer
+        self.db_name = writer.db_name if writer is not None else db_name
+
+    def _key(self):
+        return (self.source, self.prefecture, self.keyword)
+
+    def _claim_key(self):
+        return (os.path.abspath(self.db_name or database.DB_NAME), *self._key())
+
+    def claim(self):
+        """
+        このプロセスでチェックポイントを使う権利を取得する
+
+        Returns:
+            取得できた場合True、同じ条件のクロールが実行中の場合False
+        """
+        with _claimed_lock:
+            if self._claim_key() in _claimed:
+                return False
+            _claimed.add(self._claim_key())
+            return True
+
+    def release(self):
+        """claimで取得した権利を返す"""
+        with _claimed_lock:
+            _claimed.discard(self._claim_key())
+
+    def load(self):
+        """
+        保存済みのチェックポイントを取得する
+
+        Returns:
+            {"last_page": 最後に完了したページ, "fingerprint": 検索結果の指紋}、なければNone
+        """
+        conn = get_connection(self.db_name)
+        try:
+            row = conn.execute(
+                """
+                SELECT last_page, fingerprint FROM crawl_checkpoints
+                WHERE source = ? AND prefecture = ? AND keyword = ?
+            """,
+                self._key(),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        return {"last_page": row[0], "fingerprint": row[1]}
+
+    def _write(self, func, *args):
+        """書き込みをwriterのスレッド（なければこのスレッド）で行う"""
+        if self.writer is not None:
+            return self.writer.call(func, *args)
+        conn = get_connection(self.db_name)
+        try:
+            return func(conn, *args)
+        finally:
+            conn.close()
+
+    def _save(self, last_page, fingerprint):
+        self._write(_upsert_checkpoint, self._key(), last_page, fingerprint)
+
+    def start(self, fingerprint):
+        """
+        クロール開始時に呼ぶ（1ページ目の指紋で前回と同じ検索結果か確認する）
+
+        Returns:
+            再開できる場合は前回最後に完了したページ、先頭から取得する場合は0
+        """
+        self.fingerprint = fingerprint
+        saved = self.load()
+        if saved and saved["last_page"] and saved["fingerprint"] == fingerprint:
+            return saved["last_page"]
+        # 検索結果が変わっている（新着でページがずれた）場合は先頭からやり直す
+        self._save(0, fingerprint)
+        return 0
+
+    def page_done(self, page):
+        """ページの保存が完了したら呼ぶ"""
+        self._save(page, self.fingerprint)
+
+    def complete(self):
+        """最後まで取得したらチェックポイントを消す（次回は先頭から）"""
+        self._write(_delete_checkpoint, self._key())
+
+
+def list_checkpoints(db_name=None):
+    """未完了のクロールのチェックポイント一覧（更新が新しい順）"""
+    conn = get_connection(db_name)
+    try:
+        rows = conn.execute(
+            """
+            SELECT source, prefecture, keyword, last_page, updated_at
+            FROM crawl_checkpoints
+            ORDER BY updated_at DESC
+        """
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(row) for row in rows]
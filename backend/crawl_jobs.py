@@ -0,0 +1,351 @@
+# backend/crawl_jobs.py
+"""
+クロールジョブのキュー
+APIやスケジューラーから受け付けたクロールをジョブとして登録し、
+取得元（ハローワーク / Indeed）ごとに同時実行数を制限したワーカーで順番に実行する
+ジョブごとにIDを発行し、進捗と結果を参照できるようにする
+"""
+import datetime
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# 取得元ごとの同時実行数
+CRAWL_CONCURRENCY = {"hellowork": 2, "indeed": 1}
+
+# 終了したジョブを保持する件数（古いものから削除）
+MAX_FINISHED_JOBS = 100
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATES = (SUCCEEDED, FAILED)
+
+
+class CrawlJobConflict(Exception):
+    """同じ検索条件のジョブが別のパラメーターで待機中・実行中の場合のエラー"""
+
+    def __init__(self, job):
+        super().__init__(f"同じ条件のクロールが待機中・実行中です: {job.id}")
+        self.job = job
+
+
+def _now():
+    return datetime.datetime.now().isoformat()
+
+
+class CrawlJob:
+    """
+    クロールジョブ1件（状態の更新・参照はスレッドセーフ）
+
+    Attributes:
+        id: ジョブID
+        source: 取得元（"hellowork" / "indeed"）
+        kind: ジョブの種類（"prefecture" / "region" / "indeed" など）
+        params: 実行時のパラメーター
+    """
+
+    def __init__(self, source, kind, params):
+        self.id = uuid.uuid4().hex[:12]
+        self.source = source
+        self.kind = kind
+        self.params = params
+        self.key = None
+        self.status = QUEUED
+        self.progress = {}
+        self.result = None
+        self.error = None
+        self.created_at = _now()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def update_progress(self, **progress):
+        """進捗を更新する（実行中の関数から呼ぶ）"""
+        with self._lock:
+            self.progress.update(progress)
+
+    def _start(self):
+        with self._lock:
+            self.status = RUNNING
+            self.started_at = _now()
+
+    def _finish(self, result=None, error=None):
+        with self._lock:
+            self.result = result
+            self.error = error
+            self.status = FAILED if error else SUCCEEDED
+            self.finished_at = _now()
+        self._done.set()
+
+    @property
+    def finished(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """ジョブの終了を待つ（終了していればTrue）"""
+        return self._done.wait(timeout)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "id": self.id,
+                "source": self.source,
+                "kind": self.kind,
+                "params": dict(self.params),
+                "status": self.status,
+                "progress": dict(self.progress),
+                "result": self.result,
+                "error": self.error,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+
+class CrawlQueue:
+    """
+    取得元ごとのワーカーでクロールジョブを実行するキュー
+
+    Args:
+        concurrency: 取得元ごとの同時実行数の辞書（例: {"hellowork": 2, "indeed": 1}）
+        max_finished: 終了したジョブを保持する件数
+    """
+
+    def __init__(self, concurrency=None, max_finished=MAX_FINISHED_JOBS):
+        self.concurrency = dict(
+            CRAWL_CONCURRENCY if concurrency is None else concurrency
+        )
+        self.max_finished = max_finished
+        self._executors = {}
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _executor(self, source):
+        """取得元のワーカーを取得する（ロック内で呼ぶ）"""
+        executor = self._executors.get(source)
+        if executor is None:
+            if source not in self.concurrency:
+                raise ValueError(f"不明な取得元です: {source}")
+            executor = self._executors[source] = ThreadPoolExecutor(
+                max_workers=max(1, self.concurrency[source]),
+                thread_name_prefix=f"crawl-{source}",
+            )
+        return executor
+
+    def submit(self, source, kind, params, func, key=None):
+        """
+        ジョブを登録する
+
+        Args:
+            source: 取得元（"hellowork" / "indeed"）
+            kind: ジョブの種類
+            params: 実行時のパラメーター（状態APIでそのまま返す）
+            func: ジョブを受け取って結果を返す関数
+                結果が {"success": False, ...} の場合や例外が起きた場合は失敗とする
+            key: 同じ取得元・キーのジョブが待機中・実行中なら新しく登録せずにそのジョブを返す
+                （同じ検索条件のクロールがチェックポイントを奪い合わないようにする）
+
+        Returns:
+            CrawlJob
+
+        Raises:
+            CrawlJobConflict: 同じキーのジョブがparamsの異なる条件で待機中・実行中の場合
+        """
+        job = CrawlJob(source, kind, params)
+        job.key = key
+        with self._lock:
+            if key is not None:
+                for active in self._jobs.values():
+                    if (
+                        active.source == source
+                        and active.key == key
+                        and not active.finished
+                    ):
+                        if active.params != params:
+                            raise CrawlJobConflict(active)
+                        return active
+            executor = self._executor(source)
+            self._jobs[job.id] = job
+            self._prune()
+            executor.submit(self._run, job, func)
+        return job
+
+    def _run(self, job, func):
+        job._start()
+        try:
+            result = func(job)
+        except Exception as e:
+            print(f"❌ クロールジョブ {job.id} でエラー: {e}")
+            job._finish(error=str(e))
+            return
+        if isinstance(result, dict) and result.get("success") is False:
+            job._finish(result=result, error=result.get("error") or "失敗しました")
+        else:
+            job._finish(result=result)
+
+    def _prune(self):
+        """終了したジョブを古いものから削除する（ロック内で呼ぶ）"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        """登録順のジョブ一覧"""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def summary(self):
+        """
+        全体の状態（従来の /api/crawl/status 形式）
+
+        Returns:
+            {"is_running": 実行中・待機中のジョブがあるか, "queued": 待機数, "running": 実行数,
+             "progress": 最後に開始した地域一括収集の都道府県ごとの進捗,
+             "last_result": 最後に終了したジョブの結果, "last_error": そのエラー}
+        """
+        jobs = [job.to_dict() for job in self.jobs()]
+        queued = sum(1 for job in jobs if job["status"] == QUEUED)
+        running = sum(1 for job in jobs if job["status"] == RUNNING)
+        finished = [job for job in jobs if job["status"] in FINISHED_STATES]
+        last = max(finished, key=lambda job: job["finished_at"], default=None)
+        regions = [job for job in jobs if job["kind"] == "region" and job["started_at"]]
+        region = max(regions, key=lambda job: job["started_at"], default=None)
+        return {
+            "is_running": bool(queued or running),
+            "queued": queued,
+            "running": running,
+            "progress": region["progress"].get("prefectures") if region else None,
+            "last_result": last["result"] if last else None,
+            "last_error": last["error"] if last else None,
+        }
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executors, self._executors = list(self._executors.values()), {}
+        for executor in executors:
+            executor.shutdown(wait=wait)
+
+
+# APIとスケジューラーで共有するキュー
+crawl_queue = CrawlQueue()
+
+
+def _count_pages(job):
+    """ページごとの保存件数を進捗に加算するコールバック"""
+
+    def on_page(page, saved):
+        job.update_progress(
+            pages=page, count=job.progress.get("count", 0) + saved["inserted"]
+        )
+
+    return on_page
+
+
+def submit_prefecture_crawl(
+    prefecture,
+    max_pages=10,
+    headless=True,
+    force=False,
+    keyword="",
+    fetch_mode="selenium",
+    incremental=False,
+    queue=None,
+):
+    """ハローワークの都道府県クロールをジョブとして登録する"""
+    params = {
+        "prefecture": prefecture,
+        "max_pages": max_pages,
+        "force": force,
+        "keyword": keyword,
+        "fetch_mode": fetch_mode,
+        "incremental": incremental,
+    }
+
+    def run(job):
+        from crawler import run_crawler
+
+        return run_crawler(headless=headless, on_page=_count_pages(job), **job.params)
+
+    # チェックポイント（都道府県・キーワード）が同じクロールは1つだけ実行する
+    return (queue or crawl_queue).submit(
+        "hellowork", "prefecture", params, run, key=(prefecture, keyword or "")
+    )
+
+
+def submit_region_crawl(
+    region,
+    prefectures,
+    max_pages=3,
+    force=False,
+    keyword="",
+    fetch_mode="selenium",
+    workers=None,
+    queue=None,
+):
+    """ハローワークの地域一括クロールをジョブとして登録する"""
+    params = {
+        "region": region,
+        "prefectures": list(prefectures),
+        "max_pages": max_pages,
+        "force": force,
+        "keyword": keyword,
+        "fetch_mode": fetch_mode,
+        "workers": workers,
+    }
+
+    def run(job):
+        from region_crawler import REGION_CRAWL_WORKERS, crawl_prefectures
+
+        def on_progress(states):
+            job.update_progress(
+                prefectures=states,
+                done=sum(1 for s in states.values() if s["status"] == "done"),
+                failed=sum(1 for s in states.values() if s["status"] == "failed"),
+                count=sum(s["count"] for s in states.values()),
+            )
+
+        return crawl_prefectures(
+            prefectures,
+            workers=workers or REGION_CRAWL_WORKERS,
+            max_pages=max_pages,
+            force=force,
+            keyword=keyword,
+            fetch_mode=fetch_mode,
+            on_progress=on_progress,
+        )
+
+    return (queue or crawl_queue).submit("hellowork", "region", params, run)
+
+
+def submit_indeed_crawl(
+    keyword="",
+    location="東京都",
+    max_pages=3,
+    headless=True,
+    incremental=False,
+    queue=None,
+):
+    """Indeedのクロールをジョブとして登録する"""
+    params = {
+        "keyword": keyword,
+        "location": location,
+        "max_pages": max_pages,
+        "incremental": incremental,
+    }
+
+    def run(job):
+        from indeed_crawler import run_indeed_crawler
+
+        return run_indeed_crawler(
+            headless=headless, on_page=_count_pages(job), **job.params
+        )
+
+    return (queue or crawl_queue).submit("indeed", "indeed", params, run)
@@ -0,0 +1,201 @@
+# backend/crawl_waits.py
+"""
+クローラーの待機処理
+固定のtime.sleepではなく「ページが切り替わった」「求人が表示された」などの
+条件で待機し、サイトへの負荷を抑えるための最小間隔（POLITENESS_DELAY）だけを守る
+ページごとの所要時間を記録して、待ち時間の内訳を確認できるようにする
+"""
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# ページ取得の最小間隔（秒）: 条件待ちで早く進んでも、これより短い間隔ではアクセスしない
+POLITENESS_DELAY = 1.0
+
+# 条件待ちのタイムアウト（秒）
+PAGE_LOAD_TIMEOUT = 30
+
+# 遅延読み込みの待機: この時間だけ要素の数が増えなければ読み込み終わりとみなす（秒）
+LAZY_LOAD_SETTLE = 1.0
+LAZY_LOAD_TIMEOUT = 10
+
+
+def document_ready(driver):
+    """ページの読み込みが完了したか"""
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def wait_for_page_change(driver, old_element, timeout=PAGE_LOAD_TIMEOUT):
+    """
+    画面遷移を待つ（遷移前の要素が破棄され、新しいページの読み込みが完了するまで）
+
+    Args:
+        driver: WebDriver
+        old_element: 遷移前のページの要素（クリックしたボタンや求人テーブル）
+        timeout: タイムアウト（秒）
+    """
+    wait = WebDriverWait(driver, timeout)
+    wait.until(EC.staleness_of(old_element))
+    wait.until(document_ready)
+
+
+class _CountSettled:
+    """要素の数がsettle秒間変わらなければ、その数を返すWebDriverWaitの条件"""
+
+    def __init__(self, locator, settle):
+        self.locator = locator
+        self.settle = settle
+        self.count = None
+        self.changed = None
+
+    def __call__(self, driver):
+        count = len(driver.find_elements(*self.locator))
+        now = time.monotonic()
+        if count != self.count:
+            self.count, self.changed = count, now
+            return False
+        return now - self.changed >= self.settle
+
+
+def wait_for_count_to_settle(
+    driver, locator, settle=LAZY_LOAD_SETTLE, timeout=LAZY_LOAD_TIMEOUT, poll=0.2
+):
+    """
+    スクロールで遅延読み込みされる要素を待つ（要素の数が増えなくなるまで）
+    timeoutまで増え続けた場合も例外にせず、それまでに読み込まれた分で続ける
+
+    Args:
+        driver: WebDriver
+        locator: 数える要素の (By, 値)
+        settle: この秒数だけ数が変わらなければ読み込み終わりとみなす
+        timeout: 最長の待ち時間（秒）
+        poll: 数える間隔（秒）
+
+    Returns:
+        最後に数えた要素の数
+    """
+    condition = _CountSettled(locator, settle)
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)
+    except TimeoutException:
+        print(
+            f"  ⚠️ {timeout}秒待っても読み込みが終わらないため、読み込まれた分で続けます"
+        )
+    return condition.count
+
+
+class PolitenessDelay:
+    """
+    アクセス間隔を最小間隔以上に保つ
+    前回のアクセスから経過した分は待たないので、条件待ちで時間がかかったページでは待機しない
+    複数スレッドで共有した場合は、アクセス時刻を順番に予約して間隔を守る
+
+    Args:
+        min_interval: 最小間隔（秒）、0なら待機しない
+    """
+
+    def __init__(self, min_interval=POLITENESS_DELAY, clock=None, sleep=None):
+        self.min_interval = min_interval
+        self._clock = clock or time.monotonic
+        self._sleep = sleep or time.sleep
+        self._lock = threading.Lock()
+        self._last = None
+
+    def wait(self):
+        """次のアクセス時刻を予約し、その時刻まで待つ"""
+        with self._lock:
+            now = self._clock()
+            slot = now
+            if self._last is not None and self.min_interval:
+                slot = max(now, self._last + self.min_interval)
+            self._last = slot
+        if slot > now:
+            self._sleep(slot - now)
+
+
+# ホストごとのアクセス間隔（同じサイトへの並列クロールで共有する）
+_host_limiters = {}
+_host_limiters_lock = threading.Lock()
+
+
+def host_rate_limiter(host, min_interval=POLITENESS_DELAY):
+    """
+    ホスト単位で共有するPolitenessDelayを取得する
+
+    Args:
+        host: ホスト名（例: "www.hellowork.mhlw.go.jp"）
+        min_interval: 最小間隔（秒）、既存の場合は新しい値で上書きする
+    """
+    with _host_limiters_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None:
+            limiter = _host_limiters[host] = PolitenessDelay(min_interval)
+        else:
+            limiter.min_interval = min_interval
+        return limiter
+
+
+class PageTimer:
+    """
+    ページごとの所要時間（読み込み待ち・解析と保存）を記録する
+
+    使い方:
+        timer.start_page(page)
+        ...ページの読み込みを待つ...
+        timer.loaded()
+        ...解析して保存する...
+        timer.finish_page()
+    """
+
+    def __init__(self, clock=None):
+        self._clock = clock or time.perf_counter
+        self.pages = []
+        self._current = None
+
+    def start_page(self, page):
+        self._current = {"page": page, "start": self._clock(), "loaded": None}
+
+    def loaded(self):
+        if self._current is not None:
+            self._current["loaded"] = self._clock()
+
+    def finish_page(self):
+        """現在のページの計測を終えて、所要時間を表示する"""
+        if self._current is None:
+            return None
+        end = self._clock()
+        start = self._current["start"]
+        loaded = self._current["loaded"] or start
+        timing = {
+            "page": self._current["page"],
+            "load_seconds": round(loaded - start, 3),
+            "process_seconds": round(end - loaded, 3),
+            "total_seconds": round(end - start, 3),
+        }
+        self.pages.append(timing)
+        self._current = None
+        print(
+            f"  ⏱ 読み込み {timing['load_seconds']:.2f}秒 / "
+            f"解析・保存 {timing['process_seconds']:.2f}秒"
+        )
+        return timing
+
+    def summary(self):
+        """全ページの合計時間"""
+        return {
+            "pages": len(self.pages),
+            "load_seconds": round(sum(p["load_seconds"] for p in self.pages), 3),
+            "process_seconds": round(sum(p["process_seconds"] for p in self.pages), 3),
+            "total_seconds": round(sum(p["total_seconds"] for p in self.pages), 3),
+        }
+
+    def print_summary(self):
+        summary = self.summary()
+        if summary["pages"]:
+            print(
+                f"⏱ {summary['pages']}ページで合計 {summary['total_seconds']:.2f}秒 "
+                f"(読み込み待ち {summary['load_seconds']:.2f}秒)"
+            )
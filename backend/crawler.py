@@ -1,32 +1,41 @@
 # crawler.py
+import hashlib
 import re
-import time
 import sqlite3
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from database import save_job_if_not_duplicate, get_connection, init_db
+from database import save_jobs_bulk, get_connection, init_db
+from crawl_checkpoints import CrawlCheckpoint
+from dedup_cache import DedupCache
+from driver_pool import get_driver_pool
+from crawl_waits import (
+    PAGE_LOAD_TIMEOUT,
+    POLITENESS_DELAY,
+    PageTimer,
+    PolitenessDelay,
+    document_ready,
+    wait_for_page_change,
+)
+from hellowork_http import (
+    HELLOWORK_BASE_URL,
+    NEWEST_FIRST_LABELS,
+    HelloWorkHttpFetcher,
+)
+from html_parsing import find_job_elements
+from wage_parser import clean_money, parse_wage
+from prefectures import (
+    PREFECTURE_CODES,
+    REGION_PREFECTURES,
+    extract_prefecture,
+    get_prefecture_code,
+)
 
 # ==========================================
 # 1. ユーティリティ関数 (TDD済み)
 # ==========================================
 
 
-def clean_money(text):
-    """金額文字列を数値に変換する"""
-    if not text:
-        return 0
-    clean_text = re.sub(r"[^\d]", "", str(text))
-    if not clean_text:
-        return 0
-    return int(clean_text)
-
-
 # 業界分類のためのキーワード辞書（優先順位の高い順）
 INDUSTRY_KEYWORDS = {
     "製造・建設": [
@@ -106,9 +115,25 @@ INDUSTRY_KEYWORDS = {
 }
 
 
+def _compile_industry_patterns(industry_keywords):
+    """
+    業界ごとのキーワードを1つの正規表現（大文字に揃えたキーワードの選択）にまとめる
+    業界の優先順位（辞書の順序）はリストの順序で保つ
+    """
+    return [
+        (industry, re.compile("|".join(re.escape(k.upper()) for k in keywords)))
+        for industry, keywords in industry_keywords.items()
+    ]
+
+
+# 起動時に1度だけコンパイルする
+_INDUSTRY_PATTERNS = _compile_industry_patterns(INDUSTRY_KEYWORDS)
+
+
 def classify_industry(title):
     """
     職種タイトルから業界を推定する
+    キーワードを含む業界のうち、INDUSTRY_KEYWORDSで先に定義された業界を返す
 
     Args:
         title: 職種タイトル
@@ -121,14 +146,34 @@ def classify_industry(title):
 
     title_upper = title.upper()
 
-    for industry, keywords in INDUSTRY_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword.upper() in title_upper:
-                return industry
+    for industry, pattern in _INDUSTRY_PATTERNS:
+        if pattern.search(title_upper):
+            return industry
 
     return "その他"
 
 
+def classify_industries(titles):
+    """
+    複数の職種タイトルをまとめて業界に分類する（再分類・一括取り込み用）
+    同じタイトルは1度だけ判定する
+
+    Args:
+        titles: 職種タイトルのイテラブル
+
+    Returns:
+        業界名のリスト（titlesと同じ順序）
+    """
+    cache = {}
+    industries = []
+    for title in titles:
+        industry = cache.get(title)
+        if industry is None:
+            industry = cache[title] = classify_industry(title)
+        industries.append(industry)
+    return industries
+
+
 def parse_job_html(element):
     """
     本番用: ハローワークの求人カード(table.kyujin)を受け取り辞書を返す
@@ -181,42 +226,18 @@ def parse_job_html(element):
                         # タイトルが取れなかった場合のフォールバック
                         title = value[:100] if value else ""
 
-        # 給与情報の抽出
-        full_text = element.text
-
-        # 賃金形態の判定
-        wage_type = "unknown"
-        if "時給" in full_text:
-            wage_type = "hourly"
-        elif "月給" in full_text:
-            wage_type = "monthly"
-        elif "日給" in full_text:
-            wage_type = "daily"
-        elif "年俸" in full_text:
-            wage_type = "annual"
-
-        # 金額の抽出（wage_textから優先、なければfull_textから）
-        wages = re.findall(r"([\d,]+)円", wage_text if wage_text else "")
-        if not wages:
-            wages = re.findall(r"([\d,]+)円", full_text)
-
-        wage_min = 0
-        wage_max = 0
-        if len(wages) >= 1:
-            wage_min = clean_money(wages[0])
-            wage_max = clean_money(wages[1]) if len(wages) >= 2 else wage_min
-
-        # 金額から賃金形態を推測
-        if wage_type == "unknown" and wage_min > 0:
-            if wage_min < 10000:
-                wage_type = "hourly"
-            elif wage_min >= 100000:
-                wage_type = "monthly"
+        # 給与形態・金額（給与欄になければ求人カード全体から探す）
+        wage_type, wage_min, wage_max = parse_wage(wage_text, element.text)
+
+        # 都道府県（取り込み時に正規化しておく）
+        prefecture = extract_prefecture(location)
 
         return {
             "title": title[:100] if title else "",
             "company": company,
             "location": location,
+            "prefecture": prefecture,
+            "prefecture_code": get_prefecture_code(prefecture),
             "wage_min": wage_min,
             "wage_max": wage_max,
             "wage_type": wage_type,
@@ -233,95 +254,6 @@ def parse_job_html(element):
 # 2. クローラー実行処理（自動化版）
 # ==========================================
 
-# 都道府県コードの辞書
-PREFECTURE_CODES = {
-    "北海道": "01",
-    "青森県": "02",
-    "岩手県": "03",
-    "宮城県": "04",
-    "秋田県": "05",
-    "山形県": "06",
-    "福島県": "07",
-    "茨城県": "08",
-    "栃木県": "09",
-    "群馬県": "10",
-    "埼玉県": "11",
-    "千葉県": "12",
-    "東京都": "13",
-    "神奈川県": "14",
-    "新潟県": "15",
-    "富山県": "16",
-    "石川県": "17",
-    "福井県": "18",
-    "山梨県": "19",
-    "長野県": "20",
-    "岐阜県": "21",
-    "静岡県": "22",
-    "愛知県": "23",
-    "三重県": "24",
-    "滋賀県": "25",
-    "京都府": "26",
-    "大阪府": "27",
-    "兵庫県": "28",
-    "奈良県": "29",
-    "和歌山県": "30",
-    "鳥取県": "31",
-    "島根県": "32",
-    "岡山県": "33",
-    "広島県": "34",
-    "山口県": "35",
-    "徳島県": "36",
-    "香川県": "37",
-    "愛媛県": "38",
-    "高知県": "39",
-    "福岡県": "40",
-    "佐賀県": "41",
-    "長崎県": "42",
-    "熊本県": "43",
-    "大分県": "44",
-    "宮崎県": "45",
-    "鹿児島県": "46",
-    "沖縄県": "47",
-}
-
-# 地域別都道府県マッピング
-REGION_PREFECTURES = {
-    "hokkaido_tohoku": [
-        "北海道",
-        "青森県",
-        "岩手県",
-        "宮城県",
-        "秋田県",
-        "山形県",
-        "福島県",
-    ],
-    "kanto": ["茨城県", "栃木県", "群馬県", "埼玉県", "千葉県", "東京都", "神奈川県"],
-    "chubu": [
-        "新潟県",
-        "富山県",
-        "石川県",
-        "福井県",
-        "山梨県",
-        "長野県",
-        "岐阜県",
-        "静岡県",
-        "愛知県",
-    ],
-    "kansai": ["三重県", "滋賀県", "京都府", "大阪府", "兵庫県", "奈良県", "和歌山県"],
-    "chugoku": ["鳥取県", "島根県", "岡山県", "広島県", "山口県"],
-    "shikoku": ["徳島県", "香川県", "愛媛県", "高知県"],
-    "kyushu": [
-        "福岡県",
-        "佐賀県",
-        "長崎県",
-        "熊本県",
-        "大分県",
-        "宮崎県",
-        "鹿児島県",
-        "沖縄県",
-    ],
-}
-
 
 def get_prefectures_by_region(region):
     """
@@ -339,8 +271,471 @@ def get_prefectures_by_region(region):
     return REGION_PREFECTURES.get(region, [])
 
 
+def save_job_page(
+    conn, html, prefecture=None, force=False, writer=None, dedup_cache=None
+):
+    """
+    検索結果ページ1枚分の求人を解析して保存する（Selenium・HTTP取得で共通）
+
+    Args:
+        conn: データベース接続
+        html: 検索結果ページのHTML
+        prefecture: 就業場所に都道府県がない求人に使う都道府県（検索条件）
+        force: Trueの場合、重複をスキップせず既存の求人を最新の内容で更新
+        writer: 保存を任せるJobWriter（並列クロール用、指定時はconnを使わない）
+        dedup_cache: 保存済みの求人をメモリ上で除くDedupCache（強制モードでは使わない）
+
+    Returns:
+        save_jobs_bulkの結果、ページに求人がなければNone
+    """
+    # 求人テーブルの部分だけを解析する
+    job_rows = find_job_elements(html, "table", "kyujin")
+
+    if not job_rows:
+        print("  ⚠️ このページに求人データがありません")
+        return None
+
+    page_rows = []
+    for row in job_rows:
+        data = parse_job_html(row)
+        if data:
+            # 業界を自動分類
+            industry = classify_industry(data["title"])
+
+            page_rows.append(
+                (
+                    data["title"],
+                    data["wage_min"],
+                    data["wage_max"],
+                    data["wage_type"],
+                    data["company"],
+                    data["location"],
+                    data["url"],
+                    industry,  # 業界分類を追加
+                    # 就業場所に都道府県がなければ検索条件の都道府県を使う
+                    data["prefecture"] or prefecture,
+                )
+            )
+            print(
+                f"  - [{data['wage_type']}][{industry}]: {data['title'][:25]}... ({data['wage_min']}円)"
+            )
+
+    # 保存済みの求人はメモリ上で除き、新しい求人の候補だけをDBに送る
+    known = 0
+    if dedup_cache is not None and not force:
+        page_rows, new_keys, known = dedup_cache.filter_new(page_rows)
+
+    # ページ単位で1トランザクションにまとめて保存
+    # 強制モードの場合は重複をスキップせず既存の求人を最新の内容で更新
+    if not page_rows:
+        result = {"inserted": 0, "skipped": 0, "updated": 0}
+    elif writer is not None:
+        result = writer.save_jobs_bulk(page_rows, dedupe=not force)
+    else:
+        result = save_jobs_bulk(conn, page_rows, dedupe=not force)
+    if dedup_cache is not None and not force:
+        dedup_cache.add(new_keys)
+        result["skipped"] += known
+    if force:
+        print(
+            f"  ✅ {result['inserted']}件を保存 ({result['updated']}件は既存を更新, 強制モード)"
+        )
+    else:
+        print(
+            f"  ✅ {result['inserted']}件を保存 ({result['skipped']}件は重複スキップ)"
+        )
+    return result
+
+
+# チェックポイントの取得元
+CHECKPOINT_SOURCE = "hellowork"
+
+
+def page_fingerprint(html):
+    """
+    検索結果ページの指紋（求人カードのリンク・タイトルの並びのハッシュ）
+    1ページ目の指紋が前回と同じなら、検索結果の並びが変わっていないとみなして再開する
+    """
+    digest = hashlib.sha1()
+    for card in find_job_elements(html, "table", "kyujin"):
+        head = card.find("tr", class_="kyujin_head")
+        link = head.find("a") if head else None
+        key = link.get("href") if link and link.get("href") else card.get_text()
+        digest.update(key.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def is_known_page(result):
+    """
+    ページの求人がすべて保存済みだったか（差分収集の打ち切り判定）
+    求人を1件も解析できなかったページは既知とみなさない
+    """
+    return result["inserted"] == 0 and bool(result["skipped"] or result["updated"])
+
+
+def _crawl_result_pages(
+    pages,
+    conn,
+    prefecture,
+    max_pages,
+    force=False,
+    writer=None,
+    on_page=None,
+    timer=None,
+    checkpoint=None,
+    incremental=False,
+    dedup_cache=None,
+):
+    """
+    検索結果ページを順に保存する（Selenium・HTTP取得で共通）
+
+    Args:
+        pages: 検索結果のページ送り（first / next / skip_to と、firstの後に
+            検索結果が新着順かを表すnewest_firstを持つ）
+        conn: データベース接続（writer指定時はNone）
+        prefecture: 就業場所に都道府県がない求人に使う都道府県
+        max_pages: 取得する最後のページ番号
+        timer: ページごとの所要時間を記録するPageTimer
+        checkpoint: 再開位置を記録するCrawlCheckpoint（Noneなら毎回先頭から）
+        incremental: Trueの場合、すべて保存済みの求人だったページで打ち切る
+        dedup_cache: 保存済みの求人をメモリ上で除くDedupCache
+
+    Returns:
+        保存件数
+    """
+    if checkpoint is not None and not checkpoint.claim():
+        # 同じ条件のクロールが実行中の場合は、その再開位置を上書き・削除しない
+        print("  ⚠️ 同じ条件のクロールが実行中のため、再開位置を記録せずに取得します")
+        checkpoint = None
+    try:
+        return _save_result_pages(
+            pages,
+            conn,
+            prefecture,
+            max_pages,
+            force=force,
+            writer=writer,
+            on_page=on_page,
+            timer=timer or PageTimer(),
+            checkpoint=checkpoint,
+            incremental=incremental,
+            dedup_cache=dedup_cache,
+        )
+    finally:
+        if checkpoint is not None:
+            checkpoint.release()
+
+
+def _save_result_pages(
+    pages,
+    conn,
+    prefecture,
+    max_pages,
+    force,
+    writer,
+    on_page,
+    timer,
+    checkpoint,
+    incremental,
+    dedup_cache,
+):
+    """_crawl_result_pagesの本体（チェックポイントは取得済み）"""
+    total_count = 0
+
+    timer.start_page(1)
+    html = pages.first()
+    timer.loaded()
+    page = 1
+
+    if incremental and not force and not pages.newest_first:
+        # 新着順でなければ、保存済みだけのページより先にも新しい求人がありうる
+        print("  ⚠️ 検索結果を新着順に並べ替えられないため、差分収集せずに取得します")
+        incremental = False
+
+    if checkpoint is not None:
+        resume_page = checkpoint.start(page_fingerprint(html))
+        if 0 < resume_page < max_pages:
+            # 保存済みのページは解析せずに読み飛ばす
+            print(f"⏩ 前回の続き（{resume_page + 1}ページ目）から再開します")
+            timer.start_page(resume_page + 1)
+            html = pages.skip_to(page, resume_page + 1)
+            if html is None:
+                print("  → 最後のページに到達しました")
+                checkpoint.complete()
+                return total_count
+            timer.loaded()
+            page = resume_page + 1
+
+    while True:
+        print(f"\n📥 ページ {page}/{max_pages} を解析中...")
+        result = save_job_page(
+            conn,
+            html,
+            prefecture,
+            force=force,
+            writer=writer,
+            dedup_cache=dedup_cache,
+        )
+        timer.finish_page()
+        if result is None:
+            break
+        total_count += result["inserted"]
+        if on_page:
+            on_page(page, result)
+        if checkpoint is not None:
+            checkpoint.page_done(page)
+
+        # 新着順の検索結果なので、既知の求人だけのページより先は保存済み
+        if incremental and not force and is_known_page(result):
+            print("  → 保存済みの求人に到達したため打ち切ります（差分収集）")
+            break
+        if page >= max_pages:
+            break
+        timer.start_page(page + 1)
+        html = pages.next()
+        if html is None:
+            print("  → 最後のページに到達しました")
+            break
+        timer.loaded()
+        page += 1
+
+    # 最後まで取得したら次回は先頭から
+    if checkpoint is not None:
+        checkpoint.complete()
+    return total_count
+
+
+def _dedup_cache(dedup_cache, force, writer):
+    """重複判定キャッシュ（未指定ならクロール開始時にDBから読み込む）"""
+    if force:
+        return None
+    if dedup_cache is not None:
+        return dedup_cache
+    return DedupCache.load(writer.db_name if writer is not None else None)
+
+
+def _checkpoint(resume, prefecture, keyword, writer):
+    if not resume:
+        return None
+    # 並列クロールでは記録の書き込みも求人の保存と同じライターに任せる
+    return CrawlCheckpoint(CHECKPOINT_SOURCE, prefecture, keyword, writer=writer)
+
+
+class _HttpResultPages:
+    """HTTP取得での検索結果のページ送り"""
+
+    def __init__(self, fetcher, prefecture_code, sort_newest_first=False):
+        self._fetcher = fetcher
+        self._prefecture_code = prefecture_code
+        self._sort_newest_first = sort_newest_first
+        self._response = None
+
+    @property
+    def newest_first(self):
+        """検索結果を新着順に並べ替えられたか"""
+        return self._fetcher.newest_first
+
+    def first(self):
+        self._response = self._fetcher.search(
+            self._prefecture_code, newest_first=self._sort_newest_first
+        )
+        return self._response.content
+
+    def next(self):
+        response = self._fetcher.next_page(self._response)
+        if response is None:
+            return None
+        self._response = response
+        return response.content
+
+    def skip_to(self, current, target):
+        response = self._fetcher.go_to_page(self._response, current, target)
+        if response is None:
+            return None
+        self._response = response
+        return response.content
+
+
+def run_http_crawler(
+    prefecture="北海道",
+    max_pages=3,
+    force=False,
+    base_url=None,
+    politeness_delay=POLITENESS_DELAY,
+    writer=None,
+    rate_limiter=None,
+    on_page=None,
+    keyword="",
+    resume=True,
+    incremental=False,
+    dedup_cache=None,
+):
+    """
+    ブラウザを使わずにHTTPで検索結果ページを取得して保存する
+
+    Args:
+        prefecture: 検索する都道府県名
+        max_pages: 取得するページ数
+        force: Trueの場合、重複チェックをスキップして強制保存
+        base_url: ハローワークのURL（省略時は本番、テストではローカルサーバー）
+        politeness_delay: リクエストの最小間隔（秒）
+        writer: 保存を任せるJobWriter（省略時はこのスレッドで保存）
+        rate_limiter: 他のクロールと共有するPolitenessDelay（省略時はpoliteness_delay）
+        on_page: ページごとに (ページ番号, save_jobs_bulkの結果) を受け取るコールバック
+        keyword: 検索キーワード（チェックポイントの区別に使う）
+        resume: Trueの場合、前回中断したページの続きから取得する
+        incremental: Trueの場合、検索結果を新着順に並べ替え、すべて保存済みの求人だった
+            ページで打ち切る（新着順に並べ替えられなければ打ち切らない）
+        dedup_cache: 保存済みの求人の重複判定キャッシュ（省略時は開始時にDBから読み込む）
+
+    Returns:
+        {"success": True, "count": 保存件数, "page_timings": ページごとの所要時間}
+    """
+    pref_code = PREFECTURE_CODES.get(prefecture)
+    if pref_code is None:
+        print(f"  ⚠️ 都道府県が見つかりません: {prefecture} → 全国検索で続行します")
+
+    fetcher = HelloWorkHttpFetcher(
+        base_url=base_url or HELLOWORK_BASE_URL,
+        request_interval=politeness_delay,
+        rate_limiter=rate_limiter,
+    )
+    timer = PageTimer()
+    conn = None if writer else get_connection()
+    try:
+        total_count = _crawl_result_pages(
+            _HttpResultPages(
+                fetcher, pref_code, sort_newest_first=incremental and not force
+            ),
+            conn,
+            prefecture if pref_code else None,
+            max_pages,
+            force=force,
+            writer=writer,
+            on_page=on_page,
+            timer=timer,
+            checkpoint=_checkpoint(resume, prefecture, keyword, writer),
+            incremental=incremental,
+            dedup_cache=_dedup_cache(dedup_cache, force, writer),
+        )
+    finally:
+        if conn is not None:
+            conn.close()
+        fetcher.close()
+
+    print(f"\n🎉 完了！ 合計 {total_count} 件のデータを保存しました。")
+    timer.print_summary()
+    return {"success": True, "count": total_count, "page_timings": timer.pages}
+
+
+def _find_next_button(driver):
+    """検索結果の「次へ」ボタンを探す（見つからなければNone）"""
+    for selector in [
+        "//input[@value='次へ']",
+        "//button[contains(text(), '次へ')]",
+        "//a[contains(text(), '次')]",
+        "//input[contains(@value, '次')]",
+    ]:
+        buttons = driver.find_elements(By.XPATH, selector)
+        if buttons:
+            return buttons[0]
+    return None
+
+
+# ページ番号のボタン（value="2" などのsubmit・buttonのinput、hiddenの項目は除く）
+PAGE_BUTTON_XPATH = (
+    "//input[(@type='submit' or @type='button') and @value != ''"
+    " and translate(@value, '0123456789', '') = '']"
+)
+
+
+# 並び替えの選択欄の新着順の選択肢
+NEWEST_FIRST_OPTION_XPATH = "//select[@name]/option[{}]".format(
+    " or ".join(f"contains(., '{label}')" for label in NEWEST_FIRST_LABELS)
+)
+
+
+def _select_newest_first(driver):
+    """検索フォームの並び替えで新着順を選ぶ（新着順の選択肢がなければFalse）"""
+    options = driver.find_elements(By.XPATH, NEWEST_FIRST_OPTION_XPATH)
+    if not options:
+        return False
+    if not options[0].is_selected():
+        options[0].click()
+    return True
+
+
+def _find_page_button(driver, current, target):
+    """現在より先で目的のページ以下の、最も進んだページ番号のボタンを探す"""
+    best, best_page = None, current
+    for button in driver.find_elements(By.XPATH, PAGE_BUTTON_XPATH):
+        number = int(button.get_attribute("value"))
+        if best_page < number <= target and button.is_enabled():
+            best, best_page = button, number
+    return best, best_page
+
+
+class _BrowserResultPages:
+    """Seleniumでの検索結果のページ送り（クリックしたボタンが破棄されるまで待つ）"""
+
+    def __init__(self, driver, lease, delay, search_button, newest_first=False):
+        self._driver = driver
+        self._lease = lease
+        self._delay = delay
+        self._search_button = search_button
+        self.newest_first = newest_first
+
+    def _click(self, button):
+        self._delay.wait()
+        self._driver.execute_script("arguments[0].click();", button)
+        wait_for_page_change(self._driver, button)
+        self._lease.page_done()
+
+    def first(self):
+        print("📍 検索を実行中...")
+        try:
+            self._click(self._search_button)
+        except Exception as e:
+            print(f"  ❌ 検索ボタンクリックでエラー: {e}")
+            raise
+        print("  ✅ 検索実行完了")
+        return self._driver.page_source
+
+    def next(self):
+        next_button = _find_next_button(self._driver)
+        if next_button is None or not next_button.is_enabled():
+            return None
+        self._click(next_button)
+        return self._driver.page_source
+
+    def skip_to(self, current, target):
+        while current < target:
+            button, page = _find_page_button(self._driver, current, target)
+            if button is None:
+                button, page = _find_next_button(self._driver), current + 1
+                if button is None or not button.is_enabled():
+                    return None
+            self._click(button)
+            current = page
+        return self._driver.page_source
+
+
 def run_crawler(
-    prefecture="北海道", max_pages=3, headless=False, force=False, keyword=""
+    prefecture="北海道",
+    max_pages=3,
+    headless=False,
+    force=False,
+    keyword="",
+    fetch_mode="selenium",
+    politeness_delay=POLITENESS_DELAY,
+    writer=None,
+    rate_limiter=None,
+    on_page=None,
+    driver_pool=None,
+    resume=True,
+    incremental=False,
+    dedup_cache=None,
 ):
     """
     ハローワーク求人を自動収集する
@@ -350,45 +745,77 @@ def run_crawler(
         max_pages: 取得するページ数（1ページ50件）
         headless: ヘッドレスモードで実行するか
         force: Trueの場合、重複チェックをスキップして強制保存
+        fetch_mode: "selenium"（ブラウザ操作）または "http"（フォーム送信をHTTPで再現）
+        politeness_delay: ページ取得の最小間隔（秒）
+        writer: 保存を任せるJobWriter（省略時はこのスレッドで保存）
+        rate_limiter: 他のクロールと共有するPolitenessDelay（省略時はpoliteness_delay）
+        on_page: ページごとに (ページ番号, save_jobs_bulkの結果) を受け取るコールバック
+        driver_pool: ドライバーを借りるDriverPool（省略時はプロセス共有のプール）
+        resume: Trueの場合、前回中断したページの続きから取得する
+            （1ページ目の求人の並びが前回と同じ場合のみ、変わっていれば先頭から）
+        incremental: Trueの場合、検索結果を新着順に並べ替え、すべて保存済みの求人だった
+            ページで打ち切る（差分収集）。強制モードや、新着順に並べ替えられない場合は打ち切らない
+        dedup_cache: 保存済みの求人の重複判定キャッシュ（省略時は開始時にDBから読み込む、
+            並列クロールでは共有する）
+
+    Returns:
+        {"success": 成否, "count": 保存件数, "page_timings": ページごとの所要時間}
     """
-    mode = "強制" if force else "通常"
+    mode = "強制" if force else ("差分" if incremental else "通常")
     print(
-        f"🚀 クローラーを起動中... (対象: {prefecture}, 最大{max_pages}ページ, {mode}モード)"
-    )
-
-    options = Options()
-    if headless:
-        options.add_argument("--headless=new")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--window-size=1920,1080")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--disable-blink-features=AutomationControlled")
-    options.add_argument(
-        "user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        f"🚀 クローラーを起動中... (対象: {prefecture}, 最大{max_pages}ページ, {mode}モード, 取得: {fetch_mode})"
     )
 
-    driver = webdriver.Chrome(
-        service=ChromeService(ChromeDriverManager().install()), options=options
-    )
-    driver.implicitly_wait(5)
-    wait = WebDriverWait(driver, 30)
+    if fetch_mode == "http":
+        try:
+            return run_http_crawler(
+                prefecture=prefecture,
+                max_pages=max_pages,
+                force=force,
+                politeness_delay=politeness_delay,
+                writer=writer,
+                rate_limiter=rate_limiter,
+                on_page=on_page,
+                keyword=keyword,
+                resume=resume,
+                incremental=incremental,
+                dedup_cache=dedup_cache,
+            )
+        except Exception as e:
+            print(f"❌ エラーが発生しました: {e}")
+            import traceback
+
+            traceback.print_exc()
+            return {"success": False, "error": str(e)}
+    if fetch_mode != "selenium":
+        raise ValueError(f"不明な取得方式です: {fetch_mode}")
+
+    # 起動済みのドライバーを借りる（終了せずに返却して次のクロールで再利用）
+    pool = driver_pool or get_driver_pool()
+    lease = pool.acquire(headless=headless)
+    driver = lease.driver
+    wait = WebDriverWait(driver, PAGE_LOAD_TIMEOUT)
+    delay = rate_limiter or PolitenessDelay(politeness_delay)
+    timer = PageTimer()
+    conn = None
 
     try:
         # ハローワーク求人検索ページに直接アクセス
         print("📍 求人検索ページにアクセス中...")
+        delay.wait()
         driver.get(
             "https://www.hellowork.mhlw.go.jp/kensaku/GECA110010.do?action=initDisp&screenId=GECA110010"
         )
 
-        # ページ読み込み完了を待機
-        WebDriverWait(driver, 30).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
+        # ページ読み込み完了と検索フォームの表示を待機
+        wait.until(document_ready)
+        search_button = wait.until(
+            EC.visibility_of_element_located((By.ID, "ID_searchBtn"))
         )
-        time.sleep(3)
 
         # 都道府県を選択（SELECTドロップダウン）
         print(f"📍 都道府県を選択中: {prefecture}")
+        pref_selected = False
         try:
             pref_code = PREFECTURE_CODES.get(prefecture, "01")
             dropdown = wait.until(
@@ -396,125 +823,54 @@ def run_crawler(
             )
             select = Select(dropdown)
             select.select_by_value(pref_code)
+            pref_selected = True
             print(f"  ✅ {prefecture}を選択しました")
-            time.sleep(2)
         except Exception as e:
             print(f"  ⚠️ 都道府県選択でエラー: {e}")
             print("  → 全国検索で続行します")
 
-        # 検索ボタンをクリック（JavaScript経由）
-        print("📍 検索を実行中...")
-        try:
-            search_button = wait.until(
-                EC.visibility_of_element_located((By.ID, "ID_searchBtn"))
-            )
-            driver.execute_script("arguments[0].scrollIntoView(true);", search_button)
-            time.sleep(1)
-            driver.execute_script("arguments[0].click();", search_button)
-            time.sleep(5)
-            print("  ✅ 検索実行完了")
-        except Exception as e:
-            print(f"  ❌ 検索ボタンクリックでエラー: {e}")
-            raise
+        # 差分収集は新着順の検索結果でのみ打ち切れる
+        newest_first = False
+        if incremental and not force:
+            try:
+                newest_first = _select_newest_first(driver)
+            except Exception as e:
+                print(f"  ⚠️ 並び替えの選択でエラー: {e}")
+
+        conn = None if writer else get_connection()
+
+        # ページごとにデータ収集（ページ送りに失敗した場合はチェックポイントを残して中断）
+        total_count = _crawl_result_pages(
+            _BrowserResultPages(driver, lease, delay, search_button, newest_first),
+            conn,
+            prefecture if pref_selected else None,
+            max_pages,
+            force=force,
+            writer=writer,
+            on_page=on_page,
+            timer=timer,
+            checkpoint=_checkpoint(resume, prefecture, keyword, writer),
+            incremental=incremental,
+            dedup_cache=_dedup_cache(dedup_cache, force, writer),
+        )
 
-        conn = get_connection()
-        total_count = 0
-
-        # ページごとにデータ収集
-        for page in range(1, max_pages + 1):
-            print(f"\n📥 ページ {page}/{max_pages} を解析中...")
-
-            html = driver.page_source
-            soup = BeautifulSoup(html, "html.parser")
-
-            # 求人テーブルを探す
-            job_rows = soup.select("table.kyujin")
-
-            if not job_rows:
-                print("  ⚠️ このページに求人データがありません")
-                break
-
-            page_count = 0
-            skip_count = 0
-            for row in job_rows:
-                data = parse_job_html(row)
-                if data:
-                    # 業界を自動分類
-                    industry = classify_industry(data["title"])
-
-                    job_tuple = (
-                        data["title"],
-                        data["wage_min"],
-                        data["wage_max"],
-                        data["wage_type"],
-                        data["company"],
-                        data["location"],
-                        data["url"],
-                        industry,  # 業界分類を追加
-                    )
-
-                    # 強制モードの場合は重複チェックをスキップ
-                    if force:
-                        from database import save_job_to_db
-
-                        save_job_to_db(conn, job_tuple)
-                        page_count += 1
-                        print(
-                            f"  - [{data['wage_type']}][{industry}]: {data['title'][:25]}... ({data['wage_min']}円)"
-                        )
-                    elif save_job_if_not_duplicate(conn, job_tuple):
-                        page_count += 1
-                        print(
-                            f"  - [{data['wage_type']}][{industry}]: {data['title'][:25]}... ({data['wage_min']}円)"
-                        )
-                    else:
-                        skip_count += 1
-
-            total_count += page_count
-            if force:
-                print(f"  ✅ {page_count}件を保存 (強制モード)")
-            else:
-                print(f"  ✅ {page_count}件を保存 ({skip_count}件は重複スキップ)")
-
-            # 次のページへ
-            if page < max_pages:
-                try:
-                    # 複数のパターンで「次へ」ボタンを探す
-                    next_button = None
-                    for selector in [
-                        "//input[@value='次へ']",
-                        "//button[contains(text(), '次へ')]",
-                        "//a[contains(text(), '次')]",
-                        "//input[contains(@value, '次')]",
-                    ]:
-                        try:
-                            next_button = driver.find_element(By.XPATH, selector)
-                            break
-                        except:
-                            continue
-
-                    if next_button and next_button.is_enabled():
-                        driver.execute_script("arguments[0].click();", next_button)
-                        time.sleep(3)
-                    else:
-                        print("  → 最後のページに到達しました")
-                        break
-                except Exception as e:
-                    print(f"  → 次のページがありません: {e}")
-                    break
-
-        conn.close()
         print(f"\n🎉 完了！ 合計 {total_count} 件のデータを jobs.db に保存しました。")
+        timer.print_summary()
+        return {"success": True, "count": total_count, "page_timings": timer.pages}
 
     except Exception as e:
         print(f"❌ エラーが発生しました: {e}")
         import traceback
 
         traceback.print_exc()
+        # 画面の状態が分からないため再利用しない
+        lease.discard()
+        return {"success": False, "error": str(e), "page_timings": timer.pages}
 
     finally:
-        time.sleep(2)
-        driver.quit()
+        if conn is not None:
+            conn.close()
+        pool.release(lease)
 
 
 if __name__ == "__main__":
@@ -523,5 +879,7 @@ if __name__ == "__main__":
     # コマンドライン引数から都道府県を取得（デフォルト: 北海道）
     prefecture = sys.argv[1] if len(sys.argv) > 1 else "北海道"
     max_pages = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    # 第3引数に "http" を指定するとブラウザを使わずに取得する
+    fetch_mode = sys.argv[3] if len(sys.argv) > 3 else "selenium"
 
-    run_crawler(prefecture=prefecture, max_pages=max_pages)
+    run_crawler(prefecture=prefecture, max_pages=max_pages, fetch_mode=fetch_mode)
@@ -1,12 +1,182 @@
 # database.py
+import hashlib
+import os
 import sqlite3
+import threading
+import unicodedata
+from prefectures import (
+    PREFECTURE_CODES,
+    extract_prefecture,
+    get_prefecture_code,
+    normalize_prefecture,
+)
 
 DB_NAME = "jobs.db"
 
+# 接続プールの設定（configure_poolで変更可能）
+POOL_SIZE = 5  # DBファイルごとに保持するアイドル接続の上限
+PRAGMAS = {
+    # WALモード: クローラーの書き込み中もAPIの読み取りがブロックされない
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",  # WALではNORMALでもコミット済みデータは失われない
+    "cache_size": -20000,  # ページキャッシュ約20MB（負数はKiB指定）
+    "mmap_size": 268435456,  # 256MBまでメモリマップで読み取る
+    "busy_timeout": 5000,  # 書き込みロック待ちの上限（ミリ秒）
+    "temp_store": "MEMORY",
+}
+
+
+def apply_pragmas(conn, pragmas=None):
+    """接続にPRAGMA設定を適用する"""
+    for name, value in (PRAGMAS if pragmas is None else pragmas).items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    プールから貸し出されるSQLite接続
+    close()を呼ぶと実際には閉じずにプールへ返却する
+    """
+
+    pool = None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.release(self)
+        else:
+            super().close()
+
+    def dispose(self):
+        """接続を実際に閉じる"""
+        super().close()
+
+
+class ConnectionPool:
+    """
+    DBファイル単位の接続プール
+
+    - 同じスレッド内の入れ子の取得では同じ接続を再利用する
+    - 返却された接続はアイドル接続として保持し、ページキャッシュを温めたまま使い回す
+    """
+
+    def __init__(self, db_path, size=None, pragmas=None):
+        self.db_path = db_path
+        self.size = POOL_SIZE if size is None else size
+        self.pragmas = dict(PRAGMAS if pragmas is None else pragmas)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._closed = False
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path, factory=PooledConnection, check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        apply_pragmas(conn, self.pragmas)
+        conn.pool = self
+        return conn
+
+    def acquire(self):
+        """接続を取得する（このスレッドで貸出中の接続があればそれを返す）"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.depth += 1
+            return conn
+
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect()
+
+        self._local.conn = conn
+        self._local.depth = 1
+        return conn
+
+    def release(self, conn):
+        """接続を返却する（未コミットの変更はロールバックされる）"""
+        if getattr(self._local, "conn", None) is not conn:
+            # 別スレッドから返却された接続は再利用せずに閉じる
+            conn.dispose()
+            return
+
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        self._local.conn = None
+
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        conn.dispose()
+
+    def close(self):
+        """アイドル接続をすべて閉じる"""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.dispose()
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_name=None):
+    """DBファイルに対応する接続プールを取得（なければ作成）"""
+    db_path = os.path.abspath(db_name or DB_NAME)
+    with _pools_lock:
+        pool = _pools.get(db_path)
+        if pool is None:
+            pool = _pools[db_path] = ConnectionPool(db_path)
+        return pool
+
+
+def close_pools(db_name=None):
+    """
+    接続プールを破棄する
+
+    Args:
+        db_name: 対象のDBファイル（Noneの場合はすべてのプール）
+    """
+    with _pools_lock:
+        if db_name is None:
+            pools = list(_pools.values())
+            _pools.clear()
+        else:
+            pool = _pools.pop(os.path.abspath(db_name), None)
+            pools = [pool] if pool else []
+    for pool in pools:
+        pool.close()
+
+
+def configure_pool(size=None, pragmas=None):
+    """
+    接続プールの設定を変更する（既存のプールは破棄され、次回取得時に新設定で作り直す）
+
+    Args:
+        size: DBファイルごとのアイドル接続数の上限
+        pragmas: 接続ごとに設定するPRAGMAの辞書（既定値に上書きマージ）
+    """
+    global POOL_SIZE
+    if size is not None:
+        POOL_SIZE = size
+    if pragmas:
+        PRAGMAS.update(pragmas)
+    close_pools()
+
 
 def get_connection(db_name=None):
-    """本番用のDB接続を作るヘルパー関数"""
-    return sqlite3.connect(db_name or DB_NAME)
+    """
+    DB接続を取得するヘルパー関数（接続プール経由）
+    使い終わったらclose()でプールへ返却する
+    """
+    return get_pool(db_name).acquire()
 
 
 def init_db(reset=True):
@@ -14,6 +184,12 @@ def init_db(reset=True):
     init_db_with_path(DB_NAME, reset=reset)
 
 
+# db_metaに保存する業界の再分類（reclassify.py）の進捗と分類ルールの指紋
+# 進捗はjobsのidなので、resetでidが振り直されたら消す
+RECLASSIFY_CHECKPOINT_KEY = "reclassify_last_id"
+RECLASSIFY_RULES_KEY = "reclassify_rules"
+
+
 def init_db_with_path(db_path, reset=True):
     """
     テーブルの初期化（パス指定可能）
@@ -23,10 +199,19 @@ def init_db_with_path(db_path, reset=True):
         reset: Trueの場合はテーブルを削除して再作成、Falseの場合は既存テーブルを保持
     """
     conn = sqlite3.connect(db_path)
+    apply_pragmas(conn)
     c = conn.cursor()
 
     if reset:
         c.execute("DROP TABLE IF EXISTS jobs")
+        c.execute("DROP TABLE IF EXISTS jobs_fts")
+        c.execute("DROP TABLE IF EXISTS job_aggregates")
+        c.execute("DROP TABLE IF EXISTS crawl_checkpoints")
+        if _has_table(c, "db_meta"):
+            c.execute(
+                "DELETE FROM db_meta WHERE key IN (?, ?)",
+                (RECLASSIFY_CHECKPOINT_KEY, RECLASSIFY_RULES_KEY),
+            )
         print("データベースをリセットしました。")
 
     # テーブルが存在しない場合のみ作成
@@ -42,12 +227,22 @@ def init_db_with_path(db_path, reset=True):
             location TEXT,
             url TEXT,
             industry TEXT,
+            prefecture TEXT,
+            prefecture_code TEXT,
+            dedup_key TEXT,
+            wage_monthly_equiv INTEGER,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     """
     )
+    migrate_db(conn)
+    if reset:
+        bump_data_version(conn)
     conn.commit()
     conn.close()
+
+    # 初期化前に開いていたプール接続は破棄して作り直す
+    close_pools(db_path)
     print(f"DB initialized (reset={reset})")
 
 
@@ -59,38 +254,694 @@ def save_job(conn, job_data):
     save_job_to_db(conn, job_data)
 
 
-def save_job_to_db(conn, job_data):
+def migrate_db(conn):
     """
-    求人データを1件保存する
-    job_data: (title, wage_min, wage_max, wage_type, company, location, url)
-              または (title, wage_min, wage_max, wage_type, company, location, url, industry)
+    既存のjobsテーブルを最新のスキーマに揃える（蓄積モードのDB向け）
+    不足カラムの追加・既存行のバックフィル・インデックス作成を行う
     """
     c = conn.cursor()
+    columns = {row[1] for row in c.execute("PRAGMA table_info(jobs)")}
+
+    # データ更新の検知用（resetでテーブルを作り直しても値は引き継ぐ）
+    c.execute(
+        "CREATE TABLE IF NOT EXISTS db_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+    )
+    c.execute("INSERT OR IGNORE INTO db_meta (key, value) VALUES ('data_version', 0)")
+
+    # クロールの再開位置（取得元・都道府県・キーワードごとの最後に完了したページ）
+    c.execute(
+        """
+        CREATE TABLE IF NOT EXISTS crawl_checkpoints (
+            source TEXT NOT NULL,
+            prefecture TEXT NOT NULL,
+            keyword TEXT NOT NULL DEFAULT '',
+            last_page INTEGER NOT NULL DEFAULT 0,
+            fingerprint TEXT,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (source, prefecture, keyword)
+        )
+    """
+    )
+
+    if "industry" not in columns:
+        c.execute("ALTER TABLE jobs ADD COLUMN industry TEXT")
+    if "prefecture" not in columns:
+        c.execute("ALTER TABLE jobs ADD COLUMN prefecture TEXT")
+    if "prefecture_code" not in columns:
+        c.execute("ALTER TABLE jobs ADD COLUMN prefecture_code TEXT")
+    if "prefecture" not in columns or "prefecture_code" not in columns:
+        backfill_prefectures(conn)
+
+    # 重複判定キー: 既存行にキーを埋め、重複を畳み込んでからユニークインデックスを作る
+    if "dedup_key" not in columns:
+        c.execute("ALTER TABLE jobs ADD COLUMN dedup_key TEXT")
+    c.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_jobs_dedup_key'"
+    )
+    if c.fetchone() is None:
+        backfill_dedup_keys(conn)
+        folded = fold_duplicate_jobs(conn)
+        if folded:
+            print(f"重複していた求人 {folded} 件を統合しました。")
+        c.execute("CREATE UNIQUE INDEX idx_jobs_dedup_key ON jobs(dedup_key)")
+
+    # 月給換算の給与: 集計テーブルの計算式が変わるため作り直してから埋める
+    if "wage_monthly_equiv" not in columns:
+        drop_job_aggregates(conn)
+        c.execute("ALTER TABLE jobs ADD COLUMN wage_monthly_equiv INTEGER")
+        backfill_wage_monthly_equiv(conn)
+
+    create_job_indexes(conn)
+    create_fts_index(conn)
+    create_job_aggregates(conn)
+    conn.commit()
 
-    if len(job_data) == 8:
-        # industryを含む新形式
+
+def bump_data_version(conn):
+    """
+    データ更新の連番（data_version）を進める
+    求人を保存・更新したトランザクションの中で呼ぶ（commitは呼び出し側で行う）
+    """
+    conn.execute("UPDATE db_meta SET value = value + 1 WHERE key = 'data_version'")
+
+
+def get_data_version(db_name=None):
+    """
+    データ更新の連番を取得する（分析結果のキャッシュが古いかの判定に使う）
+
+    Returns:
+        連番、db_metaテーブルがない場合はNone
+    """
+    conn = get_connection(db_name)
+    try:
+        row = conn.execute(
+            "SELECT value FROM db_meta WHERE key = 'data_version'"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+# 分析・検索クエリ用のインデックス（名前: カラム）
+# 集計クエリ・集計テーブルの再計算がテーブルを読まずに済むよう、参照カラムを含めている
+JOB_INDEXES = {
+    # 業界での絞り込み、業界ごとの集計の再計算
+    "idx_jobs_industry_wage": ("industry", "wage_type", "wage_min"),
+    # 都道府県での絞り込み、都道府県×業界の集計
+    "idx_jobs_prefecture_industry": ("prefecture", "industry"),
+    # 給与形態での絞り込み
+    "idx_jobs_wage_type_wage": ("wage_type", "wage_min"),
+    # 給与の範囲指定
+    "idx_jobs_wage_min": ("wage_min",),
+    # 月別の集計
+    "idx_jobs_created_at": ("created_at", "wage_type", "wage_min"),
+    # 月給換算での範囲指定
+    "idx_jobs_wage_monthly_equiv": ("wage_monthly_equiv",),
+}
+
+# 上のインデックスで置き換えたため削除するインデックス
+OBSOLETE_INDEXES = ("idx_jobs_prefecture",)
+
+
+def create_job_indexes(conn):
+    """JOB_INDEXESのインデックスを作成し、不要になったインデックスを削除する"""
+    c = conn.cursor()
+    for name in OBSOLETE_INDEXES:
+        c.execute(f"DROP INDEX IF EXISTS {name}")
+    for name, columns in JOB_INDEXES.items():
+        c.execute(f"CREATE INDEX IF NOT EXISTS {name} ON jobs({', '.join(columns)})")
+
+
+def _has_table(c, name):
+    c.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (name,))
+    return c.fetchone() is not None
+
+
+def create_fts_index(conn):
+    """
+    キーワード検索用の全文検索インデックス（FTS5・trigram）を作成する
+    jobsテーブルへの追加・更新・削除はトリガーで自動的に反映する
+
+    Returns:
+        True: 利用可能, False: SQLiteがFTS5/trigramに未対応
+    """
+    c = conn.cursor()
+    if _has_table(c, "jobs_fts"):
+        return True
+
+    try:
+        # trigramトークナイザーなら分かち書きなしで日本語の部分一致検索ができる
         c.execute(
             """
-            INSERT INTO jobs (title, wage_min, wage_max, wage_type, company, location, url, industry) 
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            job_data,
+            CREATE VIRTUAL TABLE jobs_fts USING fts5(
+                title, company, location,
+                content='jobs', content_rowid='id', tokenize='trigram'
+            )
+        """
         )
-    else:
-        # 後方互換性のための旧形式
+    except sqlite3.OperationalError as e:
+        print(f"⚠️ 全文検索インデックスを作成できません（LIKE検索を使用します）: {e}")
+        return False
+
+    c.executescript(
+        """
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts(rowid, title, company, location)
+            VALUES (new.id, new.title, new.company, new.location);
+        END;
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location)
+            VALUES ('delete', old.id, old.title, old.company, old.location);
+        END;
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update
+        AFTER UPDATE OF title, company, location ON jobs BEGIN
+            INSERT INTO jobs_fts(jobs_fts, rowid, title, company, location)
+            VALUES ('delete', old.id, old.title, old.company, old.location);
+            INSERT INTO jobs_fts(rowid, title, company, location)
+            VALUES (new.id, new.title, new.company, new.location);
+        END;
+        """
+    )
+    # 既存の行をインデックスに取り込む
+    c.execute("INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')")
+    return True
+
+
+# ---------------------------------------------------------------------------
+# 分析用の集計テーブル
+# (業界, 都道府県, 給与形態, 月) ごとの件数・合計・最小・最大を保持し、
+# jobsへの追加・更新・削除をトリガーで差分反映する
+# ---------------------------------------------------------------------------
+
+# 分析対象とする給与の範囲（0円や桁違いの値を除外する）
+VALID_WAGE_SQL = "(IFNULL({row}wage_min, 0) > 0 AND {row}wage_min < 10000000)"
+
+# 集計が最大・最小値を再計算待ちの状態で溜まったら全体を作り直す件数
+AGGREGATE_REBUILD_THRESHOLD = 100
+
+_AGGREGATE_COLUMNS = """
+    industry, prefecture, wage_type, month,
+    job_count, wage_count, wage_sum, wage_max, positive_wage_min,
+    monthly_count, monthly_sum, monthly_min, monthly_max
+"""
+
+_AGGREGATE_SELECT = f"""
+    SELECT
+        industry, prefecture, wage_type, strftime('%Y-%m', created_at),
+        COUNT(*),
+        COUNT(wage_min),
+        IFNULL(SUM(wage_min), 0),
+        MAX(wage_min),
+        MIN(CASE WHEN wage_min > 0 THEN wage_min END),
+        SUM({VALID_WAGE_SQL.format(row="")}),
+        IFNULL(SUM(CASE WHEN {VALID_WAGE_SQL.format(row="")}
+            THEN wage_monthly_equiv END), 0),
+        MIN(CASE WHEN {VALID_WAGE_SQL.format(row="")} THEN wage_monthly_equiv END),
+        MAX(CASE WHEN {VALID_WAGE_SQL.format(row="")} THEN wage_monthly_equiv END)
+    FROM jobs
+"""
+
+
+def _aggregate_key_match(row):
+    """集計テーブルの行とjobsの行（new/old）のキーが一致する条件"""
+    return (
+        f"industry IS {row}.industry AND prefecture IS {row}.prefecture "
+        f"AND wage_type IS {row}.wage_type "
+        f"AND month IS strftime('%Y-%m', {row}.created_at)"
+    )
+
+
+def _larger(column, value):
+    return f"CASE WHEN {column} IS NULL OR {value} > {column} THEN {value} ELSE {column} END"
+
+
+def _smaller(column, value):
+    return f"CASE WHEN {column} IS NULL OR {value} < {column} THEN {value} ELSE {column} END"
+
+
+def _aggregate_add_sql(row):
+    """jobsの行を集計に加えるSQL"""
+    valid = VALID_WAGE_SQL.format(row=f"{row}.")
+    monthly = f"{row}.wage_monthly_equiv"
+    match = _aggregate_key_match(row)
+    return f"""
+        INSERT INTO job_aggregates (industry, prefecture, wage_type, month)
+        SELECT {row}.industry, {row}.prefecture, {row}.wage_type,
+            strftime('%Y-%m', {row}.created_at)
+        WHERE NOT EXISTS (SELECT 1 FROM job_aggregates WHERE {match});
+        UPDATE job_aggregates SET
+            job_count = job_count + 1,
+            wage_count = wage_count + ({row}.wage_min IS NOT NULL),
+            wage_sum = wage_sum + IFNULL({row}.wage_min, 0),
+            wage_max = {_larger("wage_max", f"{row}.wage_min")},
+            positive_wage_min = CASE WHEN {row}.wage_min > 0
+                THEN {_smaller("positive_wage_min", f"{row}.wage_min")}
+                ELSE positive_wage_min END,
+            monthly_count = monthly_count + {valid},
+            monthly_sum = monthly_sum + CASE WHEN {valid} THEN {monthly} ELSE 0 END,
+            monthly_min = CASE WHEN {valid}
+                THEN {_smaller("monthly_min", monthly)} ELSE monthly_min END,
+            monthly_max = CASE WHEN {valid}
+                THEN {_larger("monthly_max", monthly)} ELSE monthly_max END
+        WHERE {match};
+    """
+
+
+def _aggregate_remove_sql(row):
+    """
+    jobsの行を集計から除くSQL
+    最大・最小値は差し引けないため、除いた値が一致した場合はstaleにして後で再計算する
+    """
+    valid = VALID_WAGE_SQL.format(row=f"{row}.")
+    monthly = f"{row}.wage_monthly_equiv"
+    match = _aggregate_key_match(row)
+    return f"""
+        UPDATE job_aggregates SET
+            job_count = job_count - 1,
+            wage_count = wage_count - ({row}.wage_min IS NOT NULL),
+            wage_sum = wage_sum - IFNULL({row}.wage_min, 0),
+            monthly_count = monthly_count - {valid},
+            monthly_sum = monthly_sum - CASE WHEN {valid} THEN {monthly} ELSE 0 END,
+            stale = stale
+                OR IFNULL({row}.wage_min IN (wage_max, positive_wage_min), 0)
+                OR ({valid} AND IFNULL({monthly} IN (monthly_min, monthly_max), 0))
+        WHERE {match};
+        DELETE FROM job_aggregates WHERE job_count = 0 AND {match};
+    """
+
+
+def create_job_aggregates(conn):
+    """
+    分析用の集計テーブル（job_aggregates）と、差分反映用のトリガーを作成する
+    新しく作成した場合は既存の行から集計を作る
+    """
+    c = conn.cursor()
+    if _has_table(c, "job_aggregates"):
+        return
+
+    c.executescript(
+        f"""
+        CREATE TABLE job_aggregates (
+            industry TEXT,
+            prefecture TEXT,
+            wage_type TEXT,
+            month TEXT,
+            job_count INTEGER NOT NULL DEFAULT 0,
+            -- wage_minの件数・合計・最大、0円を除いた最小
+            wage_count INTEGER NOT NULL DEFAULT 0,
+            wage_sum INTEGER NOT NULL DEFAULT 0,
+            wage_max INTEGER,
+            positive_wage_min INTEGER,
+            -- 分析対象の給与（VALID_WAGE_SQL）を月給換算した件数・合計・最小・最大
+            monthly_count INTEGER NOT NULL DEFAULT 0,
+            monthly_sum INTEGER NOT NULL DEFAULT 0,
+            monthly_min INTEGER,
+            monthly_max INTEGER,
+            -- 1: 最大・最小値の再計算待ち
+            stale INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX idx_job_aggregates_key
+            ON job_aggregates(industry, prefecture, wage_type, month);
+
+        DROP TRIGGER IF EXISTS job_aggregates_insert;
+        DROP TRIGGER IF EXISTS job_aggregates_delete;
+        DROP TRIGGER IF EXISTS job_aggregates_update;
+        CREATE TRIGGER job_aggregates_insert AFTER INSERT ON jobs BEGIN
+            {_aggregate_add_sql("new")}
+        END;
+        CREATE TRIGGER job_aggregates_delete AFTER DELETE ON jobs BEGIN
+            {_aggregate_remove_sql("old")}
+        END;
+        CREATE TRIGGER job_aggregates_update
+        AFTER UPDATE OF
+            industry, prefecture, wage_type, wage_min, wage_monthly_equiv, created_at
+        ON jobs
+        WHEN old.industry IS NOT new.industry
+            OR old.prefecture IS NOT new.prefecture
+            OR old.wage_type IS NOT new.wage_type
+            OR old.wage_min IS NOT new.wage_min
+            OR old.wage_monthly_equiv IS NOT new.wage_monthly_equiv
+            OR old.created_at IS NOT new.created_at
+        BEGIN
+            {_aggregate_remove_sql("old")}
+            {_aggregate_add_sql("new")}
+        END;
+        """
+    )
+    rebuild_job_aggregates(conn)
+
+
+def drop_job_aggregates(conn):
+    """集計テーブルとトリガーを削除する（次のcreate_job_aggregatesで作り直される）"""
+    conn.executescript(
+        """
+        DROP TRIGGER IF EXISTS job_aggregates_insert;
+        DROP TRIGGER IF EXISTS job_aggregates_delete;
+        DROP TRIGGER IF EXISTS job_aggregates_update;
+        DROP TABLE IF EXISTS job_aggregates;
+        """
+    )
+
+
+def _rebuild_aggregate_rows(c):
+    """集計行をjobsの全行から作り直す（トランザクションは呼び出し側で管理）"""
+    c.execute("DELETE FROM job_aggregates")
+    c.execute(
+        f"""
+        INSERT INTO job_aggregates ({_AGGREGATE_COLUMNS})
+        {_AGGREGATE_SELECT}
+        GROUP BY industry, prefecture, wage_type, strftime('%Y-%m', created_at)
+    """
+    )
+
+
+def rebuild_job_aggregates(conn):
+    """集計テーブルをjobsの全行から作り直す（移行・CLI用）"""
+    _rebuild_aggregate_rows(conn.cursor())
+    conn.commit()
+
+
+def _refresh_stale_aggregates(c):
+    """
+    staleの集計行をjobsから計算し直す（トランザクションは呼び出し側で管理）
+
+    Returns:
+        再計算した集計行の数
+    """
+    if not _has_table(c, "job_aggregates"):
+        return 0
+    c.execute(
+        "SELECT industry, prefecture, wage_type, month FROM job_aggregates WHERE stale"
+    )
+    keys = c.fetchall()
+    if len(keys) > AGGREGATE_REBUILD_THRESHOLD:
+        _rebuild_aggregate_rows(c)
+        return len(keys)
+
+    match = "industry IS ? AND prefecture IS ? AND wage_type IS ? AND month IS ?"
+    for key in keys:
+        key = tuple(key)
+        c.execute(f"DELETE FROM job_aggregates WHERE {match}", key)
         c.execute(
-            """
-            INSERT INTO jobs (title, wage_min, wage_max, wage_type, company, location, url) 
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            f"""
+            INSERT INTO job_aggregates ({_AGGREGATE_COLUMNS})
+            {_AGGREGATE_SELECT}
+            WHERE industry IS ? AND prefecture IS ? AND wage_type IS ?
+                AND strftime('%Y-%m', created_at) IS ?
+            GROUP BY industry, prefecture, wage_type, strftime('%Y-%m', created_at)
         """,
-            job_data,
+            key,
         )
+    return len(keys)
+
+
+def refresh_job_aggregates(conn):
+    """
+    最大・最小値が再計算待ち（stale）の集計行をjobsから計算し直す
+    行の更新・削除を行う書き込み処理の最後に呼ぶ（分析APIの読み取りからは呼ばない）
+
+    Returns:
+        再計算した集計行の数
+    """
+    with conn:
+        return _refresh_stale_aggregates(conn.cursor())
+
+
+# 給与形態ごとの月給換算の倍率（時給160時間・日給20日・年収12か月）
+# 変更した場合は backfill_wage_monthly_equiv で保存済みの値を計算し直す
+WAGE_MONTHLY_FACTORS = {
+    "monthly": 1,
+    "hourly": 160,
+    "daily": 20,
+    "annual": 1 / 12,
+}
+
+
+def monthly_wage_equivalent(wage_min, wage_type, factors=None):
+    """
+    給与を月給に換算する（未知の給与形態は月給として扱う）
+
+    Returns:
+        月給換算の給与（円）、wage_minがない場合はNone
+    """
+    if wage_min is None:
+        return None
+    factors = WAGE_MONTHLY_FACTORS if factors is None else factors
+    return int(round(wage_min * factors.get(wage_type, 1)))
+
+
+def backfill_wage_monthly_equiv(conn):
+    """
+    全行のwage_monthly_equivをWAGE_MONTHLY_FACTORSで計算し直す
+    集計テーブルがあれば作り直す
+
+    Returns:
+        更新した行数
+    """
+    conn.create_function(
+        "monthly_wage_equivalent", 2, monthly_wage_equivalent, deterministic=True
+    )
+    c = conn.cursor()
+    c.execute(
+        """
+        UPDATE jobs
+        SET wage_monthly_equiv = monthly_wage_equivalent(wage_min, wage_type)
+        WHERE wage_monthly_equiv IS NOT monthly_wage_equivalent(wage_min, wage_type)
+    """
+    )
+    updated = c.rowcount
+    if updated:
+        bump_data_version(conn)
+        if _has_table(c, "job_aggregates"):
+            rebuild_job_aggregates(conn)
+    conn.commit()
+    return updated
+
+
+def backfill_prefectures(conn):
+    """
+    prefectureが未設定の既存行に、locationから判定した都道府県を埋める
+    埋めた行があればデータ更新の連番を進める（分析結果のキャッシュを無効にする）
+
+    Returns:
+        更新した行数
+    """
+    conn.create_function(
+        "extract_prefecture", 1, extract_prefecture, deterministic=True
+    )
+    conn.create_function("prefecture_code", 1, get_prefecture_code, deterministic=True)
+    c = conn.cursor()
+    c.execute(
+        """
+        UPDATE jobs
+        SET prefecture = extract_prefecture(location),
+            prefecture_code = prefecture_code(extract_prefecture(location))
+        WHERE prefecture IS NULL AND location IS NOT NULL AND location != ''
+    """
+    )
+    updated = c.rowcount
+    if updated:
+        bump_data_version(conn)
+    conn.commit()
+    return updated
+
+
+def _normalize_dedup_text(text):
+    """重複判定用に文字列を正規化する（全角半角・大文字小文字・空白の揺れを吸収）"""
+    text = unicodedata.normalize("NFKC", str(text or ""))
+    return " ".join(text.split()).casefold()
+
+
+def make_dedup_key(title, company):
+    """
+    重複判定キーを作成する（正規化したタイトル＋会社名のSHA-1）
+
+    Returns:
+        40桁の16進文字列
+    """
+    normalized = f"{_normalize_dedup_text(title)}\x1f{_normalize_dedup_text(company)}"
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+
+def backfill_dedup_keys(conn):
+    """
+    dedup_keyが未設定の既存行にキーを埋める
+
+    Returns:
+        更新した行数
+    """
+    conn.create_function("make_dedup_key", 2, make_dedup_key, deterministic=True)
+    c = conn.cursor()
+    c.execute(
+        "UPDATE jobs SET dedup_key = make_dedup_key(title, company) "
+        "WHERE dedup_key IS NULL"
+    )
     conn.commit()
+    return c.rowcount
+
+
+def fold_duplicate_jobs(conn):
+    """
+    同じdedup_keyを持つ既存の重複行を、最も古い1件（最小のid）に畳み込む
+    削除した行があればデータ更新の連番を進める（分析結果のキャッシュを無効にする）
+
+    Returns:
+        削除した行数
+    """
+    c = conn.cursor()
+    c.execute(
+        """
+        DELETE FROM jobs
+        WHERE dedup_key IS NOT NULL
+          AND id NOT IN (
+              SELECT MIN(id) FROM jobs
+              WHERE dedup_key IS NOT NULL
+              GROUP BY dedup_key
+          )
+    """
+    )
+    deleted = c.rowcount
+    if deleted:
+        _refresh_stale_aggregates(c)
+        bump_data_version(conn)
+    conn.commit()
+    return deleted
+
+
+_JOB_COLUMNS = """
+    title, wage_min, wage_max, wage_type, company, location, url,
+    industry, prefecture, prefecture_code, wage_monthly_equiv, dedup_key
+"""
+
+# 重複（同じdedup_key）は保存しない
+_INSERT_JOB_SQL = f"""
+    INSERT OR IGNORE INTO jobs ({_JOB_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# 重複の場合は既存行の内容を最新の値で更新する（強制保存用）
+_UPSERT_JOB_SQL = f"""
+    INSERT INTO jobs ({_JOB_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(dedup_key) DO UPDATE SET
+        wage_min = excluded.wage_min,
+        wage_max = excluded.wage_max,
+        wage_type = excluded.wage_type,
+        location = excluded.location,
+        url = excluded.url,
+        industry = excluded.industry,
+        prefecture = excluded.prefecture,
+        prefecture_code = excluded.prefecture_code,
+        wage_monthly_equiv = excluded.wage_monthly_equiv
+"""
+
+# 既存キーの照会1回あたりの件数（SQLite変数上限に収まる数）
+DEDUPE_CHUNK_SIZE = 500
+
+
+def _job_values(job_data):
+    """
+    job_dataタプルをINSERT用の値タプルに変換する
+    prefectureが省略された場合はlocationから判定する
+    """
+    title, wage_min, wage_max, wage_type, company, location, url = job_data[:7]
+    industry = job_data[7] if len(job_data) >= 8 else None
+    prefecture = job_data[8] if len(job_data) >= 9 else None
+    prefecture = normalize_prefecture(prefecture) or extract_prefecture(location)
+
+    return (
+        title,
+        wage_min,
+        wage_max,
+        wage_type,
+        company,
+        location,
+        url,
+        industry,
+        prefecture,
+        get_prefecture_code(prefecture),
+        monthly_wage_equivalent(wage_min, wage_type),
+        make_dedup_key(title, company),
+    )
+
+
+def save_job_to_db(conn, job_data):
+    """
+    求人データを1件保存する（同じ求人が既にあれば内容を更新する）
+    job_data: (title, wage_min, wage_max, wage_type, company, location, url)
+              または (title, wage_min, wage_max, wage_type, company, location, url, industry)
+              または (title, wage_min, wage_max, wage_type, company, location, url, industry, prefecture)
+    prefectureが省略された場合はlocationから判定する
+    """
+    c = conn.cursor()
+    c.execute(_UPSERT_JOB_SQL, _job_values(job_data))
+    bump_data_version(conn)
+    _refresh_stale_aggregates(c)
+    conn.commit()
+
+
+def _count_existing_keys(conn, keys):
+    """dedup_keyのうちDBに既に存在するものの件数を返す"""
+    keys = list(keys)
+    count = 0
+    c = conn.cursor()
+    for i in range(0, len(keys), DEDUPE_CHUNK_SIZE):
+        chunk = keys[i : i + DEDUPE_CHUNK_SIZE]
+        placeholders = ", ".join(["?"] * len(chunk))
+        c.execute(
+            f"SELECT COUNT(*) FROM jobs WHERE dedup_key IN ({placeholders})", chunk
+        )
+        count += c.fetchone()[0]
+    return count
+
+
+def save_jobs_bulk(conn, rows, dedupe=True):
+    """
+    求人データをまとめて保存する（1トランザクション・executemany）
+
+    Args:
+        conn: DB接続
+        rows: save_job_to_dbと同じ形式のjob_dataタプルのリスト
+        dedupe: Trueの場合は重複（DB内・rows内）をスキップ、
+                Falseの場合は重複している既存行を最新の内容で更新する
+
+    Returns:
+        {"inserted": 新規保存件数, "skipped": 重複スキップ件数, "updated": 更新件数}
+    """
+    values = [_job_values(row) for row in rows]
+
+    with conn:
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+
+        if dedupe:
+            c = conn.executemany(_INSERT_JOB_SQL, values)
+            inserted = max(c.rowcount, 0)
+            if inserted:
+                bump_data_version(conn)
+            return {
+                "inserted": inserted,
+                "skipped": len(values) - inserted,
+                "updated": 0,
+            }
+
+        keys = {v[-1] for v in values}
+        existing = _count_existing_keys(conn, keys)
+        conn.executemany(_UPSERT_JOB_SQL, values)
+        if values:
+            bump_data_version(conn)
+            # 既存行の給与が変わって最大・最小値が再計算待ちになった集計を同じトランザクションで直す
+            _refresh_stale_aggregates(conn.cursor())
+
+    inserted = len(keys) - existing
+    return {"inserted": inserted, "skipped": 0, "updated": len(values) - inserted}
 
 
 def is_duplicate(conn, title, company):
     """
-    同じタイトルと会社名の求人が既に存在するかチェック
+    同じタイトルと会社名の求人が既に存在するかチェック（dedup_keyのユニークインデックスを使用）
 
     Returns:
         True: 重複あり
@@ -98,13 +949,10 @@ def is_duplicate(conn, title, company):
     """
     c = conn.cursor()
     c.execute(
-        """
-        SELECT COUNT(*) FROM jobs WHERE title = ? AND company = ?
-    """,
-        (title, company),
+        "SELECT 1 FROM jobs WHERE dedup_key = ? LIMIT 1",
+        (make_dedup_key(title, company),),
     )
-    count = c.fetchone()[0]
-    return count > 0
+    return c.fetchone() is not None
 
 
 def save_job_if_not_duplicate(conn, job_data):
@@ -115,14 +963,13 @@ def save_job_if_not_duplicate(conn, job_data):
         True: 保存成功
         False: 重複のためスキップ
     """
-    title = job_data[0]
-    company = job_data[4]
-
-    if is_duplicate(conn, title, company):
-        return False
-
-    save_job_to_db(conn, job_data)
-    return True
+    c = conn.cursor()
+    c.execute(_INSERT_JOB_SQL, _job_values(job_data))
+    saved = c.rowcount > 0
+    if saved:
+        bump_data_version(conn)
+    conn.commit()
+    return saved
 
 
 def calculate_stats(jobs):
@@ -171,73 +1018,189 @@ def get_all_jobs(db_name=None, wage_type=None):
     Returns:
         求人データのリスト
     """
-    conn = sqlite3.connect(db_name or DB_NAME)
-    conn.row_factory = sqlite3.Row
+    conn = get_connection(db_name)
     c = conn.cursor()
 
-    if wage_type:
-        c.execute(
-            "SELECT * FROM jobs WHERE wage_type = ? ORDER BY id DESC", (wage_type,)
-        )
-    else:
-        c.execute("SELECT * FROM jobs ORDER BY id DESC")
+    try:
+        if wage_type:
+            c.execute(
+                "SELECT * FROM jobs WHERE wage_type = ? ORDER BY id DESC", (wage_type,)
+            )
+        else:
+            c.execute("SELECT * FROM jobs ORDER BY id DESC")
 
-    rows = c.fetchall()
-    conn.close()
+        rows = c.fetchall()
+    finally:
+        conn.close()
 
     return [dict(row) for row in rows]
 
 
-def search_jobs(
+# 一覧APIで返却できるカラム（fields=での射影用）
+JOB_FIELDS = (
+    "id",
+    "title",
+    "wage_min",
+    "wage_max",
+    "wage_type",
+    "company",
+    "location",
+    "url",
+    "industry",
+    "prefecture",
+    "prefecture_code",
+    "wage_monthly_equiv",
+    "created_at",
+)
+
+# 絞り込み時の件数見積もりで数える上限
+TOTAL_ESTIMATE_CAP = 10000
+
+
+# trigramの全文検索は3文字以上のキーワードでのみ使える（短い場合はLIKE検索）
+FTS_MIN_KEYWORD_LENGTH = 3
+
+
+def _fts_match_query(c, keyword):
+    """
+    キーワードを全文検索のMATCH式（タイトル・会社名のフレーズ一致）に変換する
+
+    Returns:
+        MATCH式、全文検索を使えない場合はNone
+    """
+    if len(keyword) < FTS_MIN_KEYWORD_LENGTH or not _has_table(c, "jobs_fts"):
+        return None
+    phrase = keyword.replace('"', '""')
+    return f'{{title company}} : "{phrase}"'
+
+
+# 全文検索でヒットした求人のidと関連度（bm25、タイトルを重視、小さいほど関連が高い）
+_FTS_HITS_SQL = """
+    SELECT rowid AS hit_id, bm25(jobs_fts, 2.0, 1.0, 0.0) AS score
+    FROM jobs_fts WHERE jobs_fts MATCH ?
+"""
+
+
+def _search_conditions(
     keyword=None,
     wage_min=None,
     wage_max=None,
+    monthly_wage_min=None,
+    monthly_wage_max=None,
     industry=None,
     location=None,
-    db_name=None,
+    wage_type=None,
+    c=None,
 ):
     """
-    求人を検索する
-
-    Args:
-        keyword: 検索キーワード（タイトル・会社名に部分一致）
-        wage_min: 最低給与
-        wage_max: 最高給与
-        industry: 業界フィルター
-        location: 都道府県フィルター（部分一致）
-        db_name: データベースファイル名
-
-    Returns:
-        検索結果のリスト
+    検索条件からWHERE句の条件リストとパラメータを組み立てる
+    カーソルcを渡すと、キーワードは可能な限り全文検索インデックスで絞り込む
     """
-    conn = sqlite3.connect(db_name or DB_NAME)
-    conn.row_factory = sqlite3.Row
-    c = conn.cursor()
-
-    query = "SELECT * FROM jobs WHERE 1=1"
+    conditions = []
     params = []
 
     if keyword:
-        query += " AND (title LIKE ? OR company LIKE ?)"
-        params.extend([f"%{keyword}%", f"%{keyword}%"])
+        match_query = _fts_match_query(c, keyword) if c is not None else None
+        if match_query:
+            conditions.append(
+                "id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)"
+            )
+            params.append(match_query)
+        else:
+            conditions.append("(title LIKE ? OR company LIKE ?)")
+            params.extend([f"%{keyword}%", f"%{keyword}%"])
+
+    if wage_type:
+        conditions.append("wage_type = ?")
+        params.append(wage_type)
 
     if wage_min is not None:
-        query += " AND wage_min >= ?"
+        conditions.append("wage_min >= ?")
         params.append(wage_min)
 
     if wage_max is not None:
-        query += " AND wage_min <= ?"
+        conditions.append("wage_min <= ?")
         params.append(wage_max)
 
+    if monthly_wage_min is not None:
+        conditions.append("wage_monthly_equiv >= ?")
+        params.append(monthly_wage_min)
+
+    if monthly_wage_max is not None:
+        conditions.append("wage_monthly_equiv <= ?")
+        params.append(monthly_wage_max)
+
     if industry:
-        query += " AND industry = ?"
+        conditions.append("industry = ?")
         params.append(industry)
 
     if location:
-        query += " AND location LIKE ?"
-        params.append(f"%{location}%")
+        prefecture = normalize_prefecture(location)
+        if prefecture:
+            # 都道府県名はインデックス付きのprefectureカラムで絞り込む
+            conditions.append("prefecture = ?")
+            params.append(prefecture)
+        else:
+            conditions.append("location LIKE ?")
+            params.append(f"%{location}%")
+
+    return conditions, params
+
+
+def search_jobs(
+    keyword=None,
+    wage_min=None,
+    wage_max=None,
+    monthly_wage_min=None,
+    monthly_wage_max=None,
+    industry=None,
+    location=None,
+    db_name=None,
+):
+    """
+    求人を検索する
+
+    Args:
+        keyword: 検索キーワード（タイトル・会社名に部分一致、3文字以上は全文検索で関連度順）
+        wage_min: 最低給与
+        wage_max: 最高給与
+        monthly_wage_min: 月給換算の最低給与（時給・日給・年収も含めて比較）
+        monthly_wage_max: 月給換算の最高給与
+        industry: 業界フィルター
+        location: 都道府県フィルター（都道府県名なら完全一致、それ以外は部分一致）
+        db_name: データベースファイル名
+
+    Returns:
+        検索結果のリスト
+    """
+    conn = get_connection(db_name)
+    c = conn.cursor()
+
+    match_query = _fts_match_query(c, keyword) if keyword else None
+    conditions, params = _search_conditions(
+        keyword=None if match_query else keyword,
+        wage_min=wage_min,
+        wage_max=wage_max,
+        monthly_wage_min=monthly_wage_min,
+        monthly_wage_max=monthly_wage_max,
+        industry=industry,
+        location=location,
+    )
+    if match_query:
+        # 全文検索でヒットした求人を関連度（bm25、タイトルを重視）順に並べる
+        query = f"""
+            SELECT jobs.* FROM ({_FTS_HITS_SQL}) AS hits
+            JOIN jobs ON jobs.id = hits.hit_id
+            WHERE 1=1"""
+        params = [match_query] + params
+        order_by = " ORDER BY hits.score, jobs.id DESC"
+    else:
+        query = "SELECT * FROM jobs WHERE 1=1"
+        order_by = " ORDER BY id DESC"
 
-    query += " ORDER BY id DESC"
+    for condition in conditions:
+        query += f" AND {condition}"
+    query += order_by
 
     try:
         c.execute(query, params)
@@ -257,6 +1220,231 @@ def search_jobs(
     return [dict(row) for row in rows]
 
 
+def job_columns(fields=None):
+    """
+    fields指定から取得するカラムのリストを作る（idは常に先頭に含む）
+
+    Raises:
+        ValueError: fieldsに不明なカラムが含まれる場合
+    """
+    if not fields:
+        return list(JOB_FIELDS)
+
+    unknown = [f for f in fields if f not in JOB_FIELDS]
+    if unknown:
+        raise ValueError(f"不明なフィールド: {', '.join(unknown)}")
+    return ["id"] + [f for f in fields if f != "id"]
+
+
+def get_jobs_page(
+    after_id=None,
+    after_score=None,
+    limit=100,
+    fields=None,
+    keyword=None,
+    wage_min=None,
+    wage_max=None,
+    monthly_wage_min=None,
+    monthly_wage_max=None,
+    industry=None,
+    location=None,
+    wage_type=None,
+    db_name=None,
+):
+    """
+    求人をカーソル（キーセット）ページングで取得する
+    通常はid降順、全文検索を使うキーワード検索では関連度（bm25）順に並べ、
+    (関連度, id) をカーソルにする
+
+    Args:
+        after_id: 前ページの最後のid（このidより後に並ぶ求人を返す）。Noneなら先頭ページ
+        after_score: 関連度順のキーワード検索での、前ページの最後の関連度
+        limit: 1ページの件数
+        fields: 返却するカラムのリスト（Noneなら全カラム、idは常に含む）
+        その他: search_jobsと同じ絞り込み条件（wage_typeも指定可能）
+
+    Returns:
+        {"items": 求人リスト, "next_after_id": 次ページのカーソル（最終ページはNone）,
+         "next_after_score": 関連度順の場合の次ページの関連度（それ以外はNone）,
+         "total_estimate": 該当件数の見積もり}
+
+    Raises:
+        ValueError: fieldsに不明なカラムが含まれる場合、
+            関連度順の検索でafter_idとafter_scoreの一方だけを指定した場合
+    """
+    columns = job_columns(fields)
+
+    conn = get_connection(db_name)
+    c = conn.cursor()
+
+    try:
+        filters = dict(
+            wage_min=wage_min,
+            wage_max=wage_max,
+            monthly_wage_min=monthly_wage_min,
+            monthly_wage_max=monthly_wage_max,
+            industry=industry,
+            location=location,
+            wage_type=wage_type,
+        )
+        conditions, params = _search_conditions(keyword=keyword, c=c, **filters)
+        where = " AND ".join(conditions) if conditions else "1=1"
+
+        match_query = _fts_match_query(c, keyword) if keyword else None
+        if match_query:
+            if (after_id is None) != (after_score is None):
+                raise ValueError(
+                    "キーワード検索の次ページはafter_idとafter_scoreを指定してください"
+                )
+            rows = _ranked_jobs_page(
+                c, columns, match_query, filters, after_score, after_id, limit
+            )
+        else:
+            page_where = where
+            page_params = list(params)
+            if after_id is not None:
+                page_where += " AND id < ?"
+                page_params.append(after_id)
+
+            # 1件多く取得して次ページの有無を判定する
+            c.execute(
+                f"""
+                SELECT {", ".join(columns)} FROM jobs
+                WHERE {page_where}
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                page_params + [limit + 1],
+            )
+            rows = c.fetchall()
+
+        total_estimate = _estimate_total(c, where, params)
+    finally:
+        conn.close()
+
+    items = [dict(row) for row in rows[:limit]]
+    has_next = len(rows) > limit
+    next_after_score = None
+    if match_query:
+        scores = [item.pop("_score") for item in items]
+        next_after_score = scores[-1] if has_next else None
+
+    return {
+        "items": items,
+        "next_after_id": items[-1]["id"] if has_next else None,
+        "next_after_score": next_after_score,
+        "total_estimate": total_estimate,
+    }
+
+
+def _ranked_jobs_page(c, columns, match_query, filters, after_score, after_id, limit):
+    """全文検索のヒットを関連度順（同じ関連度は新しい順）に1ページ分取得する"""
+    conditions, params = _search_conditions(**filters)
+    params = [match_query] + params
+    if after_id is not None:
+        # (関連度, id) のカーソルより後に並ぶ求人
+        conditions.append("(hits.score > ? OR (hits.score = ? AND jobs.id < ?))")
+        params.extend([after_score, after_score, after_id])
+    where = " AND ".join(conditions) if conditions else "1=1"
+
+    c.execute(
+        f"""
+        SELECT {", ".join(f"jobs.{column}" for column in columns)},
+            hits.score AS _score
+        FROM ({_FTS_HITS_SQL}) AS hits
+        JOIN jobs ON jobs.id = hits.hit_id
+        WHERE {where}
+        ORDER BY hits.score, jobs.id DESC
+        LIMIT ?
+        """,
+        params + [limit + 1],
+    )
+    return c.fetchall()
+
+
+def iter_jobs(
+    fields=None,
+    batch_size=1000,
+    keyword=None,
+    wage_min=None,
+    wage_max=None,
+    monthly_wage_min=None,
+    monthly_wage_max=None,
+    industry=None,
+    location=None,
+    wage_type=None,
+    db_name=None,
+):
+    """
+    条件に合う求人をid降順に1件ずつ返すジェネレーター（エクスポート用）
+    idのカーソルでbatch_size件ずつ読み進めるため、件数によらずメモリ使用量は一定
+
+    Args:
+        fields: 返却するカラムのリスト（Noneなら全カラム）
+        batch_size: 1回のクエリで読み込む件数
+        その他: search_jobsと同じ絞り込み条件（wage_typeも指定可能）
+
+    Yields:
+        求人データの辞書
+    """
+    columns = job_columns(fields)
+    select = f"SELECT {', '.join(columns)} FROM jobs"
+
+    conn = get_connection(db_name)
+    try:
+        c = conn.cursor()
+        conditions, params = _search_conditions(
+            keyword=keyword,
+            wage_min=wage_min,
+            wage_max=wage_max,
+            monthly_wage_min=monthly_wage_min,
+            monthly_wage_max=monthly_wage_max,
+            industry=industry,
+            location=location,
+            wage_type=wage_type,
+            c=c,
+        )
+        where = " AND ".join(conditions) if conditions else "1=1"
+
+        last_id = None
+        while True:
+            # 各バッチは短い読み取りで終わるので、書き込み中のクローラーを妨げない
+            if last_id is None:
+                c.execute(
+                    f"{select} WHERE {where} ORDER BY id DESC LIMIT ?",
+                    params + [batch_size],
+                )
+            else:
+                c.execute(
+                    f"{select} WHERE {where} AND id < ? ORDER BY id DESC LIMIT ?",
+                    params + [last_id, batch_size],
+                )
+            rows = c.fetchall()
+            for row in rows:
+                yield dict(row)
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1]["id"]
+    finally:
+        conn.close()
+
+
+def _estimate_total(c, where, params):
+    """
+    該当件数を見積もる
+    条件なしの場合は最大idで近似し、条件ありの場合はTOTAL_ESTIMATE_CAP件まで数える
+    """
+    if not params:
+        c.execute("SELECT COALESCE(MAX(id), 0) FROM jobs")
+        return c.fetchone()[0]
+
+    c.execute(
+        f"SELECT COUNT(*) FROM (SELECT 1 FROM jobs WHERE {where} LIMIT ?)",
+        params + [TOTAL_ESTIMATE_CAP],
+    )
+    return c.fetchone()[0]
+
+
 def get_industry_stats(db_name=None):
     """
     業界別の統計を取得
@@ -264,8 +1452,7 @@ def get_industry_stats(db_name=None):
     Returns:
         業界ごとの件数と平均給与
     """
-    conn = sqlite3.connect(db_name or DB_NAME)
-    conn.row_factory = sqlite3.Row
+    conn = get_connection(db_name)
     c = conn.cursor()
 
     try:
@@ -273,9 +1460,9 @@ def get_industry_stats(db_name=None):
             """
             SELECT 
                 industry,
-                COUNT(*) as count,
-                AVG(wage_min) as avg_wage
-            FROM jobs
+                SUM(job_count) as count,
+                SUM(wage_sum) * 1.0 / SUM(wage_count) as avg_wage
+            FROM job_aggregates
             WHERE industry IS NOT NULL
             GROUP BY industry
             ORDER BY count DESC
@@ -297,41 +1484,26 @@ def get_location_stats(db_name=None):
     Returns:
         地域ごとの件数
     """
-    conn = sqlite3.connect(db_name or DB_NAME)
-    conn.row_factory = sqlite3.Row
+    conn = get_connection(db_name)
     c = conn.cursor()
 
-    # 都道府県を抽出して集計
-    c.execute(
+    try:
+        # 取り込み時に判定済みのprefectureごとの集計を合算
+        c.execute(
+            """
+            SELECT
+                prefecture,
+                SUM(job_count) as count
+            FROM job_aggregates
+            WHERE prefecture IS NOT NULL
+            GROUP BY prefecture
+            ORDER BY count DESC
+            LIMIT 10
         """
-        SELECT 
-            CASE
-                WHEN location LIKE '%北海道%' THEN '北海道'
-                WHEN location LIKE '%東京%' THEN '東京都'
-                WHEN location LIKE '%大阪%' THEN '大阪府'
-                WHEN location LIKE '%京都%' THEN '京都府'
-                WHEN location LIKE '%神奈川%' THEN '神奈川県'
-                WHEN location LIKE '%埼玉%' THEN '埼玉県'
-                WHEN location LIKE '%千葉%' THEN '千葉県'
-                WHEN location LIKE '%愛知%' THEN '愛知県'
-                WHEN location LIKE '%福岡%' THEN '福岡県'
-                WHEN location LIKE '%兵庫%' THEN '兵庫県'
-                WHEN location LIKE '%沖縄%' THEN '沖縄県'
-                WHEN location LIKE '%広島%' THEN '広島県'
-                WHEN location LIKE '%宮城%' THEN '宮城県'
-                WHEN location LIKE '%静岡%' THEN '静岡県'
-                ELSE location
-            END as prefecture,
-            COUNT(*) as count
-        FROM jobs
-        WHERE location IS NOT NULL AND location != ''
-        GROUP BY prefecture
-        ORDER BY count DESC
-        LIMIT 10
-    """
-    )
-    rows = c.fetchall()
-    conn.close()
+        )
+        rows = c.fetchall()
+    finally:
+        conn.close()
 
     return [{"location": row["prefecture"], "count": row["count"]} for row in rows]
 
@@ -343,8 +1515,7 @@ def get_industry_ranking(db_name=None):
     Returns:
         業界ごとの求人数、平均月給、平均時給のリスト
     """
-    conn = sqlite3.connect(db_name or DB_NAME)
-    conn.row_factory = sqlite3.Row
+    conn = get_connection(db_name)
     c = conn.cursor()
 
     try:
@@ -352,12 +1523,18 @@ def get_industry_ranking(db_name=None):
             """
             SELECT 
                 industry,
-                COUNT(*) as job_count,
-                ROUND(AVG(CASE WHEN wage_type = 'monthly' THEN wage_min END)) as avg_monthly,
-                ROUND(AVG(CASE WHEN wage_type = 'hourly' THEN wage_min END)) as avg_hourly,
-                MAX(CASE WHEN wage_type = 'monthly' THEN wage_min END) as max_monthly,
-                MIN(CASE WHEN wage_type = 'monthly' AND wage_min > 0 THEN wage_min END) as min_monthly
-            FROM jobs
+                SUM(job_count) as job_count,
+                ROUND(
+                    SUM(CASE WHEN wage_type = 'monthly' THEN wage_sum END) * 1.0
+                    / SUM(CASE WHEN wage_type = 'monthly' THEN wage_count END)
+                ) as avg_monthly,
+                ROUND(
+                    SUM(CASE WHEN wage_type = 'hourly' THEN wage_sum END) * 1.0
+                    / SUM(CASE WHEN wage_type = 'hourly' THEN wage_count END)
+                ) as avg_hourly,
+                MAX(CASE WHEN wage_type = 'monthly' THEN wage_max END) as max_monthly,
+                MIN(CASE WHEN wage_type = 'monthly' THEN positive_wage_min END) as min_monthly
+            FROM job_aggregates
             WHERE industry IS NOT NULL AND industry != ''
             GROUP BY industry
             ORDER BY job_count DESC
@@ -378,8 +1555,7 @@ def get_hot_industries(db_name=None):
     Returns:
         業界のホットスコアランキング
     """
-    conn = sqlite3.connect(db_name or DB_NAME)
-    conn.row_factory = sqlite3.Row
+    conn = get_connection(db_name)
     c = conn.cursor()
 
     try:
@@ -387,26 +1563,13 @@ def get_hot_industries(db_name=None):
             """
             SELECT 
                 industry,
-                COUNT(*) as job_count,
-                ROUND(AVG(
-                    CASE 
-                        WHEN wage_type = 'hourly' THEN wage_min * 160
-                        WHEN wage_type = 'annual' THEN wage_min / 12
-                        ELSE wage_min 
-                    END
-                )) as estimated_monthly,
-                COUNT(*) * AVG(
-                    CASE 
-                        WHEN wage_type = 'hourly' THEN wage_min * 160
-                        WHEN wage_type = 'annual' THEN wage_min / 12
-                        ELSE wage_min 
-                    END
-                ) / 10000 as hot_score
-            FROM jobs
-            WHERE industry IS NOT NULL AND industry != '' 
-                AND wage_min > 0 
-                AND wage_min < 10000000
+                SUM(monthly_count) as job_count,
+                ROUND(SUM(monthly_sum) * 1.0 / SUM(monthly_count)) as estimated_monthly,
+                SUM(monthly_sum) / 10000.0 as hot_score
+            FROM job_aggregates
+            WHERE industry IS NOT NULL AND industry != ''
             GROUP BY industry
+            HAVING SUM(monthly_count) > 0
             ORDER BY hot_score DESC
         """
         )
@@ -425,26 +1588,19 @@ def get_salary_trend(db_name=None):
     Returns:
         月別の平均給与と求人数のリスト
     """
-    conn = sqlite3.connect(db_name or DB_NAME)
-    conn.row_factory = sqlite3.Row
+    conn = get_connection(db_name)
     c = conn.cursor()
 
     try:
         c.execute(
             """
             SELECT 
-                strftime('%Y-%m', created_at) as month,
-                COUNT(*) as job_count,
-                ROUND(AVG(
-                    CASE 
-                        WHEN wage_type = 'hourly' THEN wage_min * 160
-                        WHEN wage_type = 'annual' THEN wage_min / 12
-                        ELSE wage_min 
-                    END
-                )) as avg_wage
-            FROM jobs
-            WHERE wage_min > 0 AND wage_min < 10000000
+                month,
+                SUM(monthly_count) as job_count,
+                ROUND(SUM(monthly_sum) * 1.0 / SUM(monthly_count)) as avg_wage
+            FROM job_aggregates
             GROUP BY month
+            HAVING SUM(monthly_count) > 0
             ORDER BY month DESC
             LIMIT 12
         """
@@ -464,8 +1620,7 @@ def get_industry_comparison(db_name=None):
     Returns:
         業界ごとの求人数、平均給与、最小・最大給与
     """
-    conn = sqlite3.connect(db_name or DB_NAME)
-    conn.row_factory = sqlite3.Row
+    conn = get_connection(db_name)
     c = conn.cursor()
 
     try:
@@ -473,32 +1628,14 @@ def get_industry_comparison(db_name=None):
             """
             SELECT 
                 industry,
-                COUNT(*) as job_count,
-                ROUND(AVG(
-                    CASE 
-                        WHEN wage_type = 'hourly' THEN wage_min * 160
-                        WHEN wage_type = 'annual' THEN wage_min / 12
-                        ELSE wage_min 
-                    END
-                )) as avg_wage,
-                MIN(
-                    CASE 
-                        WHEN wage_type = 'hourly' THEN wage_min * 160
-                        WHEN wage_type = 'annual' THEN wage_min / 12
-                        ELSE wage_min 
-                    END
-                ) as min_wage,
-                MAX(
-                    CASE 
-                        WHEN wage_type = 'hourly' THEN wage_min * 160
-                        WHEN wage_type = 'annual' THEN wage_min / 12
-                        ELSE wage_min 
-                    END
-                ) as max_wage
-            FROM jobs
-            WHERE industry IS NOT NULL AND industry != '' 
-                AND wage_min > 0 AND wage_min < 10000000
+                SUM(monthly_count) as job_count,
+                ROUND(SUM(monthly_sum) * 1.0 / SUM(monthly_count)) as avg_wage,
+                MIN(monthly_min) as min_wage,
+                MAX(monthly_max) as max_wage
+            FROM job_aggregates
+            WHERE industry IS NOT NULL AND industry != ''
             GROUP BY industry
+            HAVING SUM(monthly_count) > 0
             ORDER BY job_count DESC
         """
         )
@@ -513,48 +1650,44 @@ def get_industry_comparison(db_name=None):
 def get_heatmap_data(db_name=None):
     """
     ヒートマップ用データを取得（地域×業界）
+    都道府県×業界の件数を集計テーブルから1回のGROUP BYで求める
 
     Returns:
         地域と業界のマトリクスデータ
     """
-    conn = sqlite3.connect(db_name or DB_NAME)
-    conn.row_factory = sqlite3.Row
+    conn = get_connection(db_name)
     c = conn.cursor()
 
     try:
-        # 都道府県リスト
-        prefectures = [
-            "北海道",
-            "東京都",
-            "大阪府",
-            "神奈川県",
-            "愛知県",
-            "福岡県",
-            "沖縄県",
-        ]
-
-        # 業界リスト
         c.execute(
-            "SELECT DISTINCT industry FROM jobs WHERE industry IS NOT NULL AND industry != ''"
+            """
+            SELECT
+                prefecture,
+                industry,
+                SUM(job_count) as count
+            FROM job_aggregates
+            WHERE industry IS NOT NULL AND industry != ''
+            GROUP BY prefecture, industry
+            """
         )
-        industries = [row["industry"] for row in c.fetchall()]
+        rows = c.fetchall()
+
+        # 業界リスト（求人数の多い順）
+        industry_totals = {}
+        counts = {}
+        for row in rows:
+            industry_totals[row["industry"]] = (
+                industry_totals.get(row["industry"], 0) + row["count"]
+            )
+            if row["prefecture"]:
+                counts[(row["prefecture"], row["industry"])] = row["count"]
+        industries = sorted(industry_totals, key=industry_totals.get, reverse=True)
 
         # マトリクスデータ作成
-        data = []
-        for pref in prefectures:
-            row_data = []
-            for ind in industries:
-                c.execute(
-                    """
-                    SELECT COUNT(*) as count 
-                    FROM jobs 
-                    WHERE location LIKE ? AND industry = ?
-                    """,
-                    (f"%{pref}%", ind),
-                )
-                result = c.fetchone()
-                row_data.append(result["count"] if result else 0)
-            data.append(row_data)
+        prefectures = list(PREFECTURE_CODES)
+        data = [
+            [counts.get((pref, ind), 0) for ind in industries] for pref in prefectures
+        ]
 
         return {"prefectures": prefectures, "industries": industries, "data": data}
     except:
@@ -0,0 +1,144 @@
+# backend/dedup_cache.py
+"""
+保存済み求人の重複判定キャッシュ
+クロール開始時にjobs.dedup_keyの先頭64bitを整列済みのuint64配列として読み込み、
+求人カードが保存済みかをメモリ上で判定する（新しい求人の候補だけをSQLiteに送る）
+
+dedup_key（SHA-1）の先頭64bitで判定するため、別の求人と衝突する確率は
+1000万件でも1回の判定あたり約5×10^-13（実用上無視できる）
+"""
+import threading
+
+import numpy as np
+
+from database import get_connection, make_dedup_key
+
+# dedup_keyの先頭から使う16進の桁数（64bit）
+KEY_HEX_DIGITS = 16
+
+# 追加分をまとめて配列に統合する件数
+MERGE_THRESHOLD = 4096
+
+# DBから読み込む際に1度に取得する件数
+LOAD_CHUNK_SIZE = 100_000
+
+
+def key_hash(dedup_key):
+    """dedup_key（40桁の16進）を64bit整数にする"""
+    return int(dedup_key[:KEY_HEX_DIGITS], 16)
+
+
+def _hashes_from_hex(prefixes):
+    """16桁の16進文字列のリストをuint64配列に変換する（bytes.fromhexで一括変換）"""
+    if not prefixes:
+        return np.empty(0, dtype=np.uint64)
+    raw = bytes.fromhex("".join(prefixes))
+    return np.frombuffer(raw, dtype=">u8").astype(np.uint64)
+
+
+def _sorted_unique(hashes):
+    """整列して重複を除く（np.uniqueより速いsortと隣接比較で行う）"""
+    hashes = np.sort(np.asarray(hashes, dtype=np.uint64))
+    if len(hashes) < 2:
+        return hashes
+    keep = np.empty(len(hashes), dtype=bool)
+    keep[0] = True
+    np.not_equal(hashes[1:], hashes[:-1], out=keep[1:])
+    return hashes[keep]
+
+
+class DedupCache:
+    """
+    保存済みの求人のdedup_keyの集合（スレッドセーフ）
+
+    Args:
+        hashes: dedup_keyの先頭64bitの配列（整列していなくてよい）
+    """
+
+    def __init__(self, hashes=None):
+        if hashes is None:
+            hashes = np.empty(0, dtype=np.uint64)
+        self._sorted = _sorted_unique(hashes)
+        self._added = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, db_name=None):
+        """DBの保存済み求人からキャッシュを作成する"""
+        conn = get_connection(db_name)
+        chunks = []
+        try:
+            c = conn.execute(
+                f"SELECT substr(dedup_key, 1, {KEY_HEX_DIGITS}) FROM jobs "
+                "WHERE dedup_key IS NOT NULL"
+            )
+            # 件数が多くても文字列のまま全件を保持しないよう、少しずつ配列に変換する
+            while True:
+                rows = c.fetchmany(LOAD_CHUNK_SIZE)
+                if not rows:
+                    break
+                chunks.append(_hashes_from_hex([row[0] for row in rows]))
+        finally:
+            conn.close()
+        if not chunks:
+            return cls()
+        return cls(np.concatenate(chunks))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sorted) + len(self._added)
+
+    @property
+    def nbytes(self):
+        """キャッシュのおおよそのメモリ使用量（バイト）"""
+        with self._lock:
+            # 追加分のsetは1要素あたりint（32バイト）＋ハッシュ表の枠（約30バイト）
+            return int(self._sorted.nbytes + len(self._added) * 62)
+
+    def _contains(self, hashes):
+        """ロック内で呼ぶ"""
+        array = np.asarray(hashes, dtype=np.uint64)
+        positions = np.searchsorted(self._sorted, array)
+        found = positions < len(self._sorted)
+        found[found] = self._sorted[positions[found]] == array[found]
+        if self._added:
+            found |= np.fromiter(
+                (h in self._added for h in hashes), dtype=bool, count=len(hashes)
+            )
+        return found
+
+    def contains(self, dedup_keys):
+        """
+        dedup_keyごとに保存済みかを返す
+
+        Returns:
+            bool型の配列（dedup_keysと同じ順序）
+        """
+        hashes = [key_hash(key) for key in dedup_keys]
+        with self._lock:
+            return self._contains(hashes)
+
+    def add(self, dedup_keys):
+        """保存したdedup_keyを追加する（一定件数ごとに整列済み配列へ統合）"""
+        with self._lock:
+            self._added.update(key_hash(key) for key in dedup_keys)
+            if len(self._added) >= MERGE_THRESHOLD:
+                added = np.fromiter(self._added, dtype=np.uint64)
+                self._sorted = _sorted_unique(np.concatenate([self._sorted, added]))
+                self._added = set()
+
+    def filter_new(self, rows):
+        """
+        保存済みの求人を除いた行を返す
+
+        Args:
+            rows: save_jobs_bulkと同じ形式の行（0番目がタイトル、4番目が会社名）
+
+        Returns:
+            (新しい求人の候補の行, 候補の行のdedup_key, 保存済みとして除いた件数)
+        """
+        keys = [make_dedup_key(row[0], row[4]) for row in rows]
+        known = self.contains(keys)
+        new_rows = [row for row, hit in zip(rows, known) if not hit]
+        new_keys = [key for key, hit in zip(keys, known) if not hit]
+        return new_rows, new_keys, int(known.sum())
@@ -0,0 +1,287 @@
+# backend/driver_pool.py
+"""
+Chromeドライバーのプール
+クロールのたびにChromeを起動・終了せず、起動済みのドライバーを貸し出して使い回す
+- ドライバーのバイナリ（ChromeDriverManager）の解決はプロセスで1回だけ
+- 貸し出し時に応答を確認し、応答しないドライバーは作り直す
+- 一定ページ数を処理したドライバーは終了してメモリ使用量を抑える
+
+使い方:
+    with get_driver_pool().lease(headless=True) as lease:
+        lease.driver.get(url)
+        lease.page_done()
+"""
+import atexit
+import functools
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service as ChromeService
+from webdriver_manager.chrome import ChromeDriverManager
+
+from hellowork_http import USER_AGENT
+
+# 同時に起動しておくドライバーの上限（超えた貸し出しは返却を待つ）
+DRIVER_POOL_SIZE = 4
+
+# 1つのドライバーで処理するページ数の上限（超えたら終了して作り直す）
+DRIVER_MAX_PAGES = 200
+
+# 使われていないドライバーを終了するまでの時間（秒）
+DRIVER_IDLE_TIMEOUT = 600
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_chromedriver_path():
+    """ChromeDriverのパスを解決する（ダウンロード・確認はプロセスで1回だけ）"""
+    return ChromeDriverManager().install()
+
+
+def create_chrome_driver(headless=True):
+    """クローラー用のChromeを起動する"""
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument(f"user-agent={USER_AGENT}")
+
+    driver = webdriver.Chrome(
+        service=ChromeService(resolve_chromedriver_path()), options=options
+    )
+    # 待機はWebDriverWaitの条件待ちで行う
+    driver.implicitly_wait(0)
+    return driver
+
+
+def is_driver_healthy(driver):
+    """ドライバーが応答するか"""
+    try:
+        return driver.execute_script("return 1") == 1 and bool(driver.window_handles)
+    except Exception:
+        return False
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class _PooledDriver:
+    def __init__(self, driver, headless):
+        self.driver = driver
+        self.headless = headless
+        self.pages = 0
+        self.released_at = time.monotonic()
+
+
+class DriverLease:
+    """貸し出し中のドライバー"""
+
+    def __init__(self, entry):
+        self._entry = entry
+        self.discarded = False
+
+    @property
+    def driver(self):
+        return self._entry.driver
+
+    @property
+    def pages(self):
+        return self._entry.pages
+
+    def page_done(self, count=1):
+        """処理したページ数を記録する（再利用の上限の判定に使う）"""
+        self._entry.pages += count
+
+    def discard(self):
+        """返却時に再利用せず終了する（エラーで状態が分からなくなった場合など）"""
+        self.discarded = True
+
+
+class DriverPool:
+    """
+    ドライバーを貸し出すプール
+
+    Args:
+        max_size: 同時に起動しておくドライバーの上限
+        max_pages: 1つのドライバーで処理するページ数の上限
+        idle_timeout: 使われていないドライバーを終了するまでの時間（秒）
+        factory: ドライバーを作成する関数（headlessを受け取る）
+    """
+
+    def __init__(
+        self,
+        max_size=DRIVER_POOL_SIZE,
+        max_pages=DRIVER_MAX_PAGES,
+        idle_timeout=DRIVER_IDLE_TIMEOUT,
+        factory=create_chrome_driver,
+    ):
+        self.max_size = max_size
+        self.max_pages = max_pages
+        self.idle_timeout = idle_timeout
+        self._factory = factory
+        self._condition = threading.Condition()
+        self._idle = []
+        self._size = 0  # 貸し出し中と待機中の合計
+        self.stats = {"created": 0, "reused": 0, "recycled": 0, "unhealthy": 0}
+        self._reaper = None
+
+    def _count(self, key):
+        with self._condition:
+            self.stats[key] += 1
+
+    def _expire_idle(self):
+        """長く使われていないドライバーを待機中から外す（ロック内で呼ぶ）"""
+        now = time.monotonic()
+        expired = [e for e in self._idle if now - e.released_at >= self.idle_timeout]
+        for entry in expired:
+            self._idle.remove(entry)
+            self._size -= 1
+        return expired
+
+    def _checkout(self, headless, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                expired = self._expire_idle()
+                for i, entry in enumerate(self._idle):
+                    if entry.headless == headless:
+                        del self._idle[i]
+                        return entry, expired
+                if self._size < self.max_size:
+                    self._size += 1
+                    return None, expired
+                # 表示モードの違うドライバーが空いていれば終了して枠を空ける
+                if self._idle:
+                    expired.append(self._idle.pop(0))
+                    self._size -= 1
+                    continue
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("空いているドライバーがありません")
+                self._condition.wait(remaining)
+
+    def _release_slot(self):
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def acquire(self, headless=True, timeout=None):
+        """
+        ドライバーを借りる（返却はrelease）
+
+        Returns:
+            DriverLease
+        """
+        entry, expired = self._checkout(headless, timeout)
+        for old in expired:
+            _quit(old.driver)
+
+        if entry is not None:
+            if is_driver_healthy(entry.driver):
+                self._count("reused")
+                return DriverLease(entry)
+            # 応答しないドライバーは作り直す
+            self._count("unhealthy")
+            _quit(entry.driver)
+
+        try:
+            driver = self._factory(headless)
+        except Exception:
+            self._release_slot()
+            raise
+        self._count("created")
+        return DriverLease(_PooledDriver(driver, headless))
+
+    def release(self, lease):
+        """借りたドライバーを返す（上限ページ数に達したものや破棄指定は終了する）"""
+        entry = lease._entry
+        if lease.discarded or entry.pages >= self.max_pages:
+            if not lease.discarded:
+                self._count("recycled")
+            _quit(entry.driver)
+            self._release_slot()
+            return
+
+        # 前のクロールのセッション（Cookie）を持ち越さない
+        try:
+            entry.driver.delete_all_cookies()
+        except Exception:
+            _quit(entry.driver)
+            self._release_slot()
+            return
+
+        with self._condition:
+            entry.released_at = time.monotonic()
+            self._idle.append(entry)
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self, headless=True, timeout=None):
+        """with文でドライバーを借りる（例外が起きた場合は再利用しない）"""
+        lease = self.acquire(headless=headless, timeout=timeout)
+        try:
+            yield lease
+        except BaseException:
+            lease.discard()
+            raise
+        finally:
+            self.release(lease)
+
+    def reap_idle(self):
+        """使われていない時間がidle_timeoutを超えたドライバーを終了する"""
+        with self._condition:
+            expired = self._expire_idle()
+            if expired:
+                self._condition.notify_all()
+        for entry in expired:
+            _quit(entry.driver)
+        return len(expired)
+
+    def start_reaper(self, interval=60):
+        """reap_idleを定期的に実行するスレッドを開始する"""
+        if self._reaper is not None:
+            return
+
+        def run():
+            while True:
+                time.sleep(interval)
+                self.reap_idle()
+
+        self._reaper = threading.Thread(
+            target=run, name="driver-pool-reaper", daemon=True
+        )
+        self._reaper.start()
+
+    def close(self):
+        """待機中のドライバーをすべて終了する（貸し出し中のものは返却時に戻る）"""
+        with self._condition:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for entry in idle:
+            _quit(entry.driver)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """プロセス全体で共有するドライバープール（クローラー・地域一括収集・スケジューラー）"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            _pool.start_reaper()
+            atexit.register(_pool.close)
+        return _pool
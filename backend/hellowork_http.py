@@ -0,0 +1,281 @@
+# backend/hellowork_http.py
+"""
+ハローワーク求人検索のHTTP取得
+ブラウザ（Selenium）を使わずに、検索フォーム（GECA110010）の送信と
+ページ送りをHTTPセッションで再現して検索結果ページのHTMLを取得する
+"""
+import re
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from crawl_waits import POLITENESS_DELAY, PolitenessDelay
+from html_parsing import HTML_PARSER
+
+HELLOWORK_BASE_URL = "https://www.hellowork.mhlw.go.jp"
+SEARCH_PAGE_PATH = "/kensaku/GECA110010.do?action=initDisp&screenId=GECA110010"
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# フォーム内の要素のid
+PREFECTURE_SELECT_ID = "ID_tDFK1CmbBox"
+SEARCH_BUTTON_ID = "ID_searchBtn"
+NEXT_BUTTON_VALUE = "次へ"
+
+# ページ番号のボタン（value="2" など）
+PAGE_BUTTON_VALUE = re.compile(r"^\d+$")
+PAGE_BUTTON_TYPES = ("submit", "button")
+
+# 並び替えの選択肢のうち新着順のもの（差分収集は新着順の検索結果を前提にする）
+NEWEST_FIRST_LABELS = ("新着順", "新しい順")
+NEWEST_FIRST_LABEL = re.compile("|".join(NEWEST_FIRST_LABELS))
+
+
+class HelloWorkFetchError(Exception):
+    """検索ページの構造が想定と異なる場合のエラー"""
+
+
+def create_session(pool_size=4, retries=3):
+    """
+    接続を使い回すHTTPセッションを作成する（一時的なエラーは再試行）
+    """
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset(["GET", "POST"]),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def form_data(form, submit=None):
+    """
+    ブラウザと同じ規則でフォームの送信データを組み立てる
+
+    Args:
+        form: formタグの要素
+        submit: 押したことにする送信ボタンの要素（そのname/valueだけを送る）
+
+    Returns:
+        (name, value) のリスト
+    """
+    data = []
+    for field in form.find_all(["input", "select", "textarea"]):
+        name = field.get("name")
+        if not name or field.has_attr("disabled"):
+            continue
+
+        if field.name == "select":
+            options = field.find_all("option")
+            selected = [o for o in options if o.has_attr("selected")]
+            if field.has_attr("multiple"):
+                data.extend((name, o.get("value", o.get_text())) for o in selected)
+            elif selected or options:
+                option = (selected or options)[0]
+                data.append((name, option.get("value", option.get_text())))
+        elif field.name == "textarea":
+            data.append((name, field.get_text()))
+        else:
+            input_type = (field.get("type") or "text").lower()
+            if input_type in ("submit", "button", "image", "reset", "file"):
+                continue
+            if input_type in ("checkbox", "radio"):
+                if field.has_attr("checked"):
+                    data.append((name, field.get("value", "on")))
+                continue
+            data.append((name, field.get("value", "")))
+
+    if submit is not None and submit.get("name"):
+        data.append((submit["name"], submit.get("value", "")))
+    return data
+
+
+def newest_first_option(form):
+    """
+    フォームの並び替えの選択欄から新着順の選択肢を探す
+
+    Returns:
+        (選択欄のname, 選択肢のvalue)、新着順の選択肢がなければNone
+    """
+    for select in form.find_all("select"):
+        if not select.get("name") or select.has_attr("disabled"):
+            continue
+        for option in select.find_all("option"):
+            if NEWEST_FIRST_LABEL.search(option.get_text()):
+                return select["name"], option.get("value", option.get_text())
+    return None
+
+
+def _set_value(data, name, value):
+    """送信データの指定した項目の値を置き換える（なければ追加）"""
+    replaced = [(n, value if n == name else v) for n, v in data]
+    if all(n != name for n, _ in data):
+        replaced.append((name, value))
+    return replaced
+
+
+class HelloWorkHttpFetcher:
+    """
+    ハローワークの検索結果ページをHTTPで取得する
+
+    Args:
+        base_url: ハローワークのURL（テストではローカルサーバーを指定）
+        session: 使い回すHTTPセッション（省略時はcreate_sessionで作成）
+        request_interval: リクエストの最小間隔（秒）
+        rate_limiter: 他の取得と共有するPolitenessDelay（指定時はrequest_intervalを使わない）
+        timeout: 1リクエストのタイムアウト（秒）
+    """
+
+    def __init__(
+        self,
+        base_url=HELLOWORK_BASE_URL,
+        session=None,
+        request_interval=POLITENESS_DELAY,
+        timeout=30,
+        rate_limiter=None,
+    ):
+        self.base_url = base_url
+        self.session = session or create_session()
+        self.timeout = timeout
+        self._delay = rate_limiter or PolitenessDelay(request_interval)
+        # 直前のsearchで検索結果を新着順に並べ替えたか
+        self.newest_first = False
+
+    def _request(self, method, url, data=None, params=None):
+        self._delay.wait()
+        response = self.session.request(
+            method, url, data=data, params=params, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response
+
+    def _submit(self, response, form, submit=None, overrides=None):
+        """フォームを送信して次のページを取得する"""
+        data = form_data(form, submit)
+        for name, value in (overrides or {}).items():
+            data = _set_value(data, name, value)
+        action = urljoin(response.url, form.get("action") or response.url)
+        method = (form.get("method") or "get").upper()
+        if method == "POST":
+            return self._request("POST", action, data=data)
+        return self._request("GET", action, params=data)
+
+    def search(self, prefecture_code=None, newest_first=False):
+        """
+        検索フォームを開いて都道府県を指定した検索を実行する
+
+        Args:
+            prefecture_code: 都道府県コード（省略時は全国）
+            newest_first: Trueの場合、並び替えで新着順を選ぶ
+                （フォームに新着順の選択肢がなければ並び替えず、self.newest_firstがFalseになる）
+
+        Returns:
+            検索結果1ページ目のレスポンス
+        """
+        response = self._request("GET", urljoin(self.base_url, SEARCH_PAGE_PATH))
+        soup = BeautifulSoup(response.content, HTML_PARSER)
+
+        button = soup.find(id=SEARCH_BUTTON_ID)
+        form = button.find_parent("form") if button else None
+        if form is None:
+            raise HelloWorkFetchError("検索フォームが見つかりません")
+
+        overrides = {}
+        if prefecture_code:
+            select = form.find(id=PREFECTURE_SELECT_ID)
+            if select is None or not select.get("name"):
+                raise HelloWorkFetchError("都道府県の選択欄が見つかりません")
+            overrides[select["name"]] = prefecture_code
+
+        self.newest_first = False
+        if newest_first:
+            sort = newest_first_option(form)
+            if sort is not None:
+                overrides[sort[0]] = sort[1]
+                self.newest_first = True
+
+        return self._submit(response, form, submit=button, overrides=overrides)
+
+    def next_page(self, response):
+        """
+        検索結果の「次へ」を送信する
+
+        Returns:
+            次ページのレスポンス、最後のページならNone
+        """
+        soup = BeautifulSoup(response.content, HTML_PARSER)
+        for button in soup.find_all("input", attrs={"value": NEXT_BUTTON_VALUE}):
+            form = button.find_parent("form")
+            if form is not None and not button.has_attr("disabled"):
+                return self._submit(response, form, submit=button)
+        return None
+
+    def go_to_page(self, response, current, target):
+        """
+        検索結果の指定ページまで進む（再開用）
+        ページ番号のボタンがあれば目的のページに最も近いものを押し、なければ「次へ」で1ページずつ進む
+
+        Args:
+            response: 現在のページのレスポンス
+            current: 現在のページ番号
+            target: 進むページ番号
+
+        Returns:
+            指定ページのレスポンス、途中で最後のページに達したらNone
+        """
+        while current < target:
+            soup = BeautifulSoup(response.content, HTML_PARSER)
+            jump = None
+            for button in soup.find_all("input"):
+                value = button.get("value", "")
+                # hiddenの項目（都道府県コードなど）はページ番号のボタンではない
+                if (button.get("type") or "text").lower() not in PAGE_BUTTON_TYPES:
+                    continue
+                if not PAGE_BUTTON_VALUE.match(value) or button.has_attr("disabled"):
+                    continue
+                if current < int(value) <= target and (
+                    jump is None or int(value) > int(jump["value"])
+                ):
+                    jump = button
+            form = jump.find_parent("form") if jump is not None else None
+            if form is not None:
+                response = self._submit(response, form, submit=jump)
+                current = int(jump["value"])
+                continue
+            response = self.next_page(response)
+            if response is None:
+                return None
+            current += 1
+        return response
+
+    def iter_pages(self, prefecture_code=None, max_pages=3):
+        """
+        検索結果ページのHTMLを1ページずつ返す
+
+        Yields:
+            検索結果ページのHTML（bytes）
+        """
+        response = self.search(prefecture_code)
+        for page in range(1, max_pages + 1):
+            yield response.content
+            if page == max_pages:
+                break
+            response = self.next_page(response)
+            if response is None:
+                break
+
+    def close(self):
+        self.session.close()
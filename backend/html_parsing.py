@@ -0,0 +1,32 @@
+# backend/html_parsing.py
+"""
+求人ページのHTML解析
+ページ全体ではなく求人カードの部分木だけを解析して、パースのCPU時間を抑える
+lxmlがあればlxml（C実装）で、なければ標準のhtml.parserで解析する
+"""
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+def find_job_elements(html, name, class_, parser=None):
+    """
+    ページのHTMLから求人カードの要素だけを取り出す
+
+    Args:
+        html: ページのHTML
+        name: 求人カードのタグ名（例: "table"）
+        class_: 求人カードのクラス名、または正規表現
+        parser: BeautifulSoupのパーサー（省略時はHTML_PARSER）
+
+    Returns:
+        求人カード要素のリスト（find/find_all/textはページ全体を解析した場合と同じ）
+    """
+    strainer = SoupStrainer(name, class_=class_)
+    soup = BeautifulSoup(html, parser or HTML_PARSER, parse_only=strainer)
+    return soup.find_all(name, class_=class_)
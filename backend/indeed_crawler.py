@@ -5,15 +5,25 @@ Indeed求人クローラー
 undetected-chromedriverでCAPTCHA回避
 """
 import re
-import time
 import sqlite3
-from bs4 import BeautifulSoup
 import undetected_chromedriver as uc
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from database import get_connection, init_db
-from crawler import classify_industry, clean_money
+from crawl_waits import (
+    PAGE_LOAD_TIMEOUT,
+    POLITENESS_DELAY,
+    PageTimer,
+    PolitenessDelay,
+    wait_for_count_to_settle,
+)
+from database import get_connection, init_db, save_jobs_bulk
+from dedup_cache import DedupCache
+from crawler import classify_industry, is_known_page
+from html_parsing import find_job_elements
+from prefectures import extract_prefecture, get_prefecture_code
+from wage_parser import parse_wage
 
 
 def parse_indeed_job(card):
@@ -57,47 +67,12 @@ def parse_indeed_job(card):
         # 給与 - salary-snippet-containerから取得
         salary_elem = card.find("li", class_="salary-snippet-container")
 
-        wage_min = 0
-        wage_max = 0
-        wage_type = "unknown"
+        # 給与形態・金額（例: "月給 25万円 ~ 30万円" → monthly, 250000, 300000）
+        # 年収はそのまま保存し、月給換算は保存時にwage_monthly_equivで行う
+        salary_text = salary_elem.get_text(strip=True) if salary_elem else ""
+        wage_type, wage_min, wage_max = parse_wage(salary_text)
         employment_type = ""
 
-        if salary_elem:
-            salary_text = salary_elem.get_text(strip=True)
-
-            # 給与タイプ判定
-            if "時給" in salary_text:
-                wage_type = "hourly"
-            elif "月給" in salary_text or "月収" in salary_text:
-                wage_type = "monthly"
-            elif "年収" in salary_text or "年俸" in salary_text:
-                wage_type = "annual"
-
-            # 金額抽出（例: "月給 25万円 ~ 30万円" → 250000, 300000）
-            # 「万円」パターン
-            man_pattern = re.findall(r"([\d.]+)\s*万円", salary_text)
-            if man_pattern:
-                wage_min = int(float(man_pattern[0]) * 10000)
-                if len(man_pattern) > 1:
-                    wage_max = int(float(man_pattern[1]) * 10000)
-                else:
-                    wage_max = wage_min
-            else:
-                # 通常の数値パターン（例: "1,800円"）
-                yen_pattern = re.findall(r"([\d,]+)円", salary_text.replace(",", ""))
-                if yen_pattern:
-                    wage_min = int(yen_pattern[0])
-                    if len(yen_pattern) > 1:
-                        wage_max = int(yen_pattern[1])
-                    else:
-                        wage_max = wage_min
-
-            # 年収を月給に変換（12で割る）- 統一のため
-            if wage_type == "annual" and wage_min > 0:
-                wage_min = wage_min // 12
-                wage_max = wage_max // 12
-                wage_type = "monthly"  # 月給として統一
-
         # 雇用形態 - 給与以外のattribute_snippet_testidから取得
         attribute_elems = card.find_all(
             "li", {"data-testid": "attribute_snippet_testid"}
@@ -109,17 +84,14 @@ def parse_indeed_job(card):
                     employment_type = text
                     break
 
-        # 金額から推測
-        if wage_type == "unknown" and wage_min > 0:
-            if wage_min < 10000:
-                wage_type = "hourly"
-            elif wage_min >= 100000:
-                wage_type = "monthly"
+        prefecture = extract_prefecture(location)
 
         return {
             "title": title[:100] if title else "",
             "company": company,
             "location": location,
+            "prefecture": prefecture,
+            "prefecture_code": get_prefecture_code(prefecture),
             "wage_min": wage_min,
             "wage_max": wage_max,
             "wage_type": wage_type,
@@ -133,7 +105,37 @@ def parse_indeed_job(card):
         return None
 
 
-def run_indeed_crawler(keyword="", location="東京都", max_pages=3, headless=True):
+# 求人カードのセレクタ（いずれかが表示されたら読み込み完了とみなす）
+JOB_CARD_LOCATORS = (
+    (By.CLASS_NAME, "job_seen_beacon"),
+    (By.CSS_SELECTOR, "[class*='cardOutline']"),
+)
+
+# 遅延読み込みの完了判定で数える求人カード
+JOB_CARD_COUNT_LOCATOR = (By.CSS_SELECTOR, ".job_seen_beacon, [class*='cardOutline']")
+
+
+def search_url(keyword, location, start, incremental=False):
+    """
+    Indeedの検索結果のURL
+
+    差分収集では既知の求人だけのページで打ち切るため、新着順（sort=date）で取得する
+    """
+    url = f"https://jp.indeed.com/jobs?q={keyword}&l={location}&start={start}"
+    if incremental:
+        url += "&sort=date"
+    return url
+
+
+def run_indeed_crawler(
+    keyword="",
+    location="東京都",
+    max_pages=3,
+    headless=True,
+    politeness_delay=POLITENESS_DELAY,
+    on_page=None,
+    incremental=False,
+):
     """
     Indeedから求人を収集
     undetected-chromedriverでCAPTCHA回避
@@ -143,6 +145,12 @@ def run_indeed_crawler(keyword="", location="東京都", max_pages=3, headless=T
         location: 地域
         max_pages: 取得ページ数
         headless: ヘッドレスモード
+        politeness_delay: ページ取得の最小間隔（秒）
+        on_page: ページごとに (ページ番号, 保存結果) を受け取るコールバック
+        incremental: Trueの場合、すべて保存済みの求人だったページで打ち切る（差分収集）
+
+    Returns:
+        {"success": 成否, "count": 保存件数, "page_timings": ページごとの所要時間}
     """
     print(f"🔍 Indeed検索開始 (キーワード: {keyword or '全て'}, 地域: {location})")
 
@@ -154,118 +162,111 @@ def run_indeed_crawler(keyword="", location="東京都", max_pages=3, headless=T
 
     # undetected_chromedriverでドライバー作成（CAPTCHA回避機能内蔵）
     driver = uc.Chrome(options=options, headless=headless)
-    wait = WebDriverWait(driver, 20)
+    wait = WebDriverWait(driver, PAGE_LOAD_TIMEOUT)
+    delay = PolitenessDelay(politeness_delay)
+    timer = PageTimer()
 
     try:
         conn = get_connection()
+        # 保存済みの求人は開始時に読み込んだキャッシュでメモリ上で判定する
+        dedup_cache = DedupCache.load()
         total_count = 0
 
         for page in range(max_pages):
-            start = page * 10
-            url = f"https://jp.indeed.com/jobs?q={keyword}&l={location}&start={start}"
+            url = search_url(keyword, location, page * 10, incremental)
 
             print(f"\n📥 ページ {page + 1}/{max_pages} を取得中...")
+            timer.start_page(page + 1)
+            delay.wait()
             driver.get(url)
 
-            # ページ読み込み完了を待機
-            time.sleep(3)
-
-            # ページをスクロールしてコンテンツを読み込む
-            driver.execute_script("window.scrollTo(0, 500);")
-            time.sleep(1)
-            driver.execute_script("window.scrollTo(0, 1000);")
-            time.sleep(1)
-            driver.execute_script("window.scrollTo(0, 0);")
-            time.sleep(1)
-
             # JavaScriptレンダリングを待機 - 求人カードが表示されるまで待つ
             try:
                 wait.until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "job_seen_beacon"))
-                )
-            except:
-                # 別のセレクタを試す
-                try:
-                    wait.until(
-                        EC.presence_of_element_located(
-                            (By.CSS_SELECTOR, "[class*='cardOutline']")
+                    EC.any_of(
+                        *(
+                            EC.presence_of_element_located(locator)
+                            for locator in JOB_CARD_LOCATORS
                         )
                     )
-                except:
-                    print(f"  ⚠️ 求人カードが見つかりません")
+                )
+                # 遅延読み込みされるカードがあるため最下部までスクロールし、
+                # カードの数が増えなくなるまで待ってからHTMLを取得する
+                driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                wait_for_count_to_settle(driver, JOB_CARD_COUNT_LOCATOR)
+            except TimeoutException:
+                print(f"  ⚠️ 求人カードが見つかりません")
+            timer.loaded()
 
             # 求人カードを取得
+            # Indeed求人カードの部分だけを解析する
             html = driver.page_source
-            soup = BeautifulSoup(html, "html.parser")
-
-            # Indeed求人カードセレクタ
-            job_cards = soup.find_all("div", class_="job_seen_beacon")
+            job_cards = find_job_elements(html, "div", "job_seen_beacon")
             if not job_cards:
-                job_cards = soup.find_all("div", {"class": re.compile("cardOutline")})
+                job_cards = find_job_elements(html, "div", re.compile("cardOutline"))
 
             print(f"  📋 {len(job_cards)}件の求人を発見")
 
-            page_count = 0
-            skip_count = 0
+            page_rows = []
             for card in job_cards:
                 job_data = parse_indeed_job(card)
                 if job_data and job_data["title"]:
                     # 業界分類
                     job_data["industry"] = classify_industry(job_data["title"])
 
-                    # 重複チェック
-                    try:
-                        c = conn.cursor()
-                        c.execute(
-                            """
-                            SELECT COUNT(*) FROM jobs 
-                            WHERE title = ? AND company = ?
-                            """,
-                            (job_data["title"], job_data["company"]),
+                    page_rows.append(
+                        (
+                            job_data["title"],
+                            job_data["wage_min"],
+                            job_data["wage_max"],
+                            job_data["wage_type"],
+                            job_data["company"],
+                            job_data["location"],
+                            job_data.get("url", ""),
+                            job_data["industry"],
+                            # 勤務地に都道府県がなければ検索地域から補完
+                            job_data["prefecture"] or extract_prefecture(location),
                         )
-                        exists = c.fetchone()[0] > 0
-
-                        if exists:
-                            skip_count += 1
-                            continue
-
-                        # 保存
-                        c.execute(
-                            """
-                            INSERT INTO jobs 
-                            (title, company, location, wage_min, wage_max, wage_type, industry, url)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                            """,
-                            (
-                                job_data["title"],
-                                job_data["company"],
-                                job_data["location"],
-                                job_data["wage_min"],
-                                job_data["wage_max"],
-                                job_data["wage_type"],
-                                job_data["industry"],
-                                job_data.get("url", ""),
-                            ),
-                        )
-                        page_count += 1
-                    except Exception as e:
-                        print(f"  ⚠️ 保存エラー: {e}")
+                    )
+
+            # ページ単位で重複チェックと保存を1トランザクションで行う
+            page_count = 0
+            skip_count = 0
+            result = None
+            try:
+                new_rows, new_keys, known = dedup_cache.filter_new(page_rows)
+                result = {"inserted": 0, "skipped": 0, "updated": 0}
+                if new_rows:
+                    result = save_jobs_bulk(conn, new_rows)
+                dedup_cache.add(new_keys)
+                result["skipped"] += known
+                page_count = result["inserted"]
+                skip_count = result["skipped"]
+            except Exception as e:
+                print(f"  ⚠️ 保存エラー: {e}")
 
-            conn.commit()
             total_count += page_count
             if skip_count > 0:
                 print(f"  ✅ {page_count}件を保存 (重複スキップ: {skip_count}件)")
             else:
                 print(f"  ✅ {page_count}件を保存")
+            timer.finish_page()
+            if on_page:
+                on_page(page + 1, {"inserted": page_count, "skipped": skip_count})
 
-            time.sleep(2)
+            # 新着順の検索結果なので、既知の求人だけのページより先は保存済み
+            if incremental and result is not None and is_known_page(result):
+                print("  → 保存済みの求人に到達したため打ち切ります（差分収集）")
+                break
 
+        conn.close()
         print(f"\n🎉 Indeed収集完了！ 合計 {total_count} 件を保存")
-        return {"success": True, "count": total_count}
+        timer.print_summary()
+        return {"success": True, "count": total_count, "page_timings": timer.pages}
 
     except Exception as e:
         print(f"❌ エラー: {e}")
-        return {"success": False, "error": str(e)}
+        return {"success": False, "error": str(e), "page_timings": timer.pages}
     finally:
         driver.quit()
 
@@ -0,0 +1,101 @@
+# backend/job_writer.py
+"""
+求人の保存を1スレッドにまとめるライター
+並列クロールの各ワーカーは解析したページをキューに入れ、
+専用スレッドが1つの接続で順番に保存する（SQLiteの書き込みロック競合を避ける）
+チェックポイントの更新など、求人以外の書き込みもcallで同じスレッドに任せられる
+"""
+import queue
+import threading
+from concurrent.futures import Future
+
+from database import get_connection, save_jobs_bulk
+
+_STOP = object()
+
+
+class JobWriter:
+    """
+    求人を1つの書き込みスレッドで保存する
+
+    使い方:
+        with JobWriter() as writer:
+            result = writer.save_jobs_bulk(rows, dedupe=True)
+
+    Args:
+        db_name: データベースファイル名（省略時はDB_NAME）
+        max_pending: キューに溜められるページ数（超えると保存を待つ）
+    """
+
+    def __init__(self, db_name=None, max_pending=32):
+        self.db_name = db_name
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run, name="job-writer", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def _run(self):
+        conn = get_connection(self.db_name)
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                future, func, args = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(func(conn, *args))
+                except Exception as e:
+                    future.set_exception(e)
+        finally:
+            conn.close()
+
+    def submit_call(self, func, *args):
+        """
+        書き込みスレッドの接続でfunc(conn, *args)を実行するよう依頼する
+
+        Returns:
+            funcの戻り値を返すFuture
+        """
+        if self._thread is None:
+            raise RuntimeError("JobWriterが開始されていません")
+        future = Future()
+        self._queue.put((future, func, args))
+        return future
+
+    def call(self, func, *args):
+        """func(conn, *args)を書き込みスレッドで実行して結果を待つ"""
+        return self.submit_call(func, *args).result()
+
+    def submit(self, rows, dedupe=True):
+        """
+        保存を依頼する（結果はFutureで受け取る）
+
+        Returns:
+            save_jobs_bulkの結果を返すFuture
+        """
+        return self.submit_call(lambda conn: save_jobs_bulk(conn, rows, dedupe=dedupe))
+
+    def save_jobs_bulk(self, rows, dedupe=True):
+        """保存を依頼して完了を待つ（database.save_jobs_bulkと同じ結果を返す）"""
+        return self.submit(rows, dedupe).result()
+
+    def close(self):
+        """キューに残った保存を終えてからスレッドを終了する"""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -5,8 +5,8 @@
 """
 import os
 import pickle
-import sqlite3
-from database import DB_NAME
+from database import get_connection
+from prefectures import extract_prefecture
 
 # scikit-learn
 try:
@@ -35,11 +35,14 @@ class SalaryPredictor:
 
     def load_training_data(self, db_name=None):
         """DBから訓練データを取得"""
-        conn = sqlite3.connect(db_name or DB_NAME)
-        conn.row_factory = sqlite3.Row
+        conn = get_connection(db_name)
 
-        query = """
-            SELECT industry, location, wage_type, wage_min
+        # 取り込み時に判定済みのprefectureカラムがあれば利用する
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        prefecture_col = ", prefecture" if "prefecture" in columns else ""
+
+        query = f"""
+            SELECT industry, location, wage_type, wage_min{prefecture_col}
             FROM jobs
             WHERE wage_min > 0 
               AND industry IS NOT NULL 
@@ -59,6 +62,12 @@ class SalaryPredictor:
         df = df.copy()
         if "prefecture" not in df.columns:
             df["prefecture"] = df["location"].apply(self._extract_prefecture)
+        else:
+            # 取り込み時に判定できなかった行のみ住所から補完
+            missing = df["prefecture"].isna()
+            df.loc[missing, "prefecture"] = df.loc[missing, "location"].apply(
+                self._extract_prefecture
+            )
 
         # カテゴリ変数をエンコード
         for col in ["industry", "prefecture", "wage_type"]:
@@ -88,59 +97,7 @@ class SalaryPredictor:
 
     def _extract_prefecture(self, location):
         """住所から都道府県を抽出"""
-        prefectures = [
-            "北海道",
-            "青森県",
-            "岩手県",
-            "宮城県",
-            "秋田県",
-            "山形県",
-            "福島県",
-            "茨城県",
-            "栃木県",
-            "群馬県",
-            "埼玉県",
-            "千葉県",
-            "東京都",
-            "神奈川県",
-            "新潟県",
-            "富山県",
-            "石川県",
-            "福井県",
-            "山梨県",
-            "長野県",
-            "岐阜県",
-            "静岡県",
-            "愛知県",
-            "三重県",
-            "滋賀県",
-            "京都府",
-            "大阪府",
-            "兵庫県",
-            "奈良県",
-            "和歌山県",
-            "鳥取県",
-            "島根県",
-            "岡山県",
-            "広島県",
-            "山口県",
-            "徳島県",
-            "香川県",
-            "愛媛県",
-            "高知県",
-            "福岡県",
-            "佐賀県",
-            "長崎県",
-            "熊本県",
-            "大分県",
-            "宮崎県",
-            "鹿児島県",
-            "沖縄県",
-        ]
-        for pref in prefectures:
-            if pref in str(location):
-                return pref
-        return "その他"
+        return extract_prefecture(location) or "その他"
 
     def train(self, db_name=None):
         """モデルを訓練"""
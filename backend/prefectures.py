@@ -0,0 +1,145 @@
+# backend/prefectures.py
+"""
+都道府県マスタ
+クローラー・DB・MLで共有する都道府県コードと地域区分
+"""
+import re
+
+# 都道府県コードの辞書
+PREFECTURE_CODES = {
+    "北海道": "01",
+    "青森県": "02",
+    "岩手県": "03",
+    "宮城県": "04",
+    "秋田県": "05",
+    "山形県": "06",
+    "福島県": "07",
+    "茨城県": "08",
+    "栃木県": "09",
+    "群馬県": "10",
+    "埼玉県": "11",
+    "千葉県": "12",
+    "東京都": "13",
+    "神奈川県": "14",
+    "新潟県": "15",
+    "富山県": "16",
+    "石川県": "17",
+    "福井県": "18",
+    "山梨県": "19",
+    "長野県": "20",
+    "岐阜県": "21",
+    "静岡県": "22",
+    "愛知県": "23",
+    "三重県": "24",
+    "滋賀県": "25",
+    "京都府": "26",
+    "大阪府": "27",
+    "兵庫県": "28",
+    "奈良県": "29",
+    "和歌山県": "30",
+    "鳥取県": "31",
+    "島根県": "32",
+    "岡山県": "33",
+    "広島県": "34",
+    "山口県": "35",
+    "徳島県": "36",
+    "香川県": "37",
+    "愛媛県": "38",
+    "高知県": "39",
+    "福岡県": "40",
+    "佐賀県": "41",
+    "長崎県": "42",
+    "熊本県": "43",
+    "大分県": "44",
+    "宮崎県": "45",
+    "鹿児島県": "46",
+    "沖縄県": "47",
+}
+
+# 地域別都道府県マッピング
+REGION_PREFECTURES = {
+    "hokkaido_tohoku": [
+        "北海道",
+        "青森県",
+        "岩手県",
+        "宮城県",
+        "秋田県",
+        "山形県",
+        "福島県",
+    ],
+    "kanto": ["茨城県", "栃木県", "群馬県", "埼玉県", "千葉県", "東京都", "神奈川県"],
+    "chubu": [
+        "新潟県",
+        "富山県",
+        "石川県",
+        "福井県",
+        "山梨県",
+        "長野県",
+        "岐阜県",
+        "静岡県",
+        "愛知県",
+    ],
+    "kansai": ["三重県", "滋賀県", "京都府", "大阪府", "兵庫県", "奈良県", "和歌山県"],
+    "chugoku": ["鳥取県", "島根県", "岡山県", "広島県", "山口県"],
+    "shikoku": ["徳島県", "香川県", "愛媛県", "高知県"],
+    "kyushu": [
+        "福岡県",
+        "佐賀県",
+        "長崎県",
+        "熊本県",
+        "大分県",
+        "宮崎県",
+        "鹿児島県",
+        "沖縄県",
+    ],
+}
+
+
+def _prefecture_stem(name):
+    """「東京都」→「東京」のように末尾の都・府・県を除いた名前（北海道はそのまま）"""
+    return name[:-1] if name[-1] in "都府県" else name
+
+
+# 正式名称 → 略称の順に並べた正規表現（住所の先頭に近い一致を優先）
+_PREFECTURE_BY_NAME = {name: name for name in PREFECTURE_CODES}
+_PREFECTURE_BY_NAME.update({_prefecture_stem(name): name for name in PREFECTURE_CODES})
+_PREFECTURE_PATTERN = re.compile(
+    "|".join(
+        list(PREFECTURE_CODES) + [_prefecture_stem(name) for name in PREFECTURE_CODES]
+    )
+)
+
+
+def extract_prefecture(location):
+    """
+    住所文字列から都道府県名を抽出する
+
+    Args:
+        location: 住所（例: "東京都渋谷区", "大阪市北区"）
+
+    Returns:
+        都道府県の正式名称（例: "東京都"）、判定できない場合はNone
+    """
+    if not location:
+        return None
+    match = _PREFECTURE_PATTERN.search(str(location))
+    if not match:
+        return None
+    return _PREFECTURE_BY_NAME[match.group(0)]
+
+
+def normalize_prefecture(name):
+    """
+    都道府県名（略称可）を正式名称に揃える
+
+    Returns:
+        正式名称、都道府県名でない場合はNone
+    """
+    if not name:
+        return None
+    return _PREFECTURE_BY_NAME.get(str(name).strip())
+
+
+def get_prefecture_code(prefecture):
+    """都道府県名から2桁の都道府県コードを返す（不明な場合はNone）"""
+    return PREFECTURE_CODES.get(prefecture) if prefecture else None
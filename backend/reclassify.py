@@ -0,0 +1,147 @@
+# backend/reclassify.py
+"""
+保存済み求人の業界の再分類
+INDUSTRY_KEYWORDSを調整した後に、既存行のindustryを最新の分類ルールで付け直す
+id順にバッチで処理し、中断しても続きから再開できる
+
+使い方: python reclassify.py [--restart] [バッチサイズ]
+"""
+import hashlib
+import json
+from crawler import INDUSTRY_KEYWORDS, classify_industries
+from database import (
+    RECLASSIFY_CHECKPOINT_KEY,
+    RECLASSIFY_RULES_KEY,
+    bump_data_version,
+    get_connection,
+    init_db,
+    refresh_job_aggregates,
+)
+
+RECLASSIFY_BATCH_SIZE = 5000
+
+# 進捗（最後に処理したid）と、その時点の分類ルールをdb_metaに保存する
+CHECKPOINT_KEY = RECLASSIFY_CHECKPOINT_KEY
+RULES_KEY = RECLASSIFY_RULES_KEY
+
+
+def rules_fingerprint(industry_keywords=None):
+    """分類ルールの指紋（ルールが変わったら途中から再開しないため）"""
+    industry_keywords = (
+        INDUSTRY_KEYWORDS if industry_keywords is None else industry_keywords
+    )
+    text = json.dumps(industry_keywords, ensure_ascii=False)
+    return int(hashlib.sha1(text.encode("utf-8")).hexdigest()[:15], 16)
+
+
+def _get_meta(conn, key):
+    row = conn.execute("SELECT value FROM db_meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def _set_meta(conn, key, value):
+    conn.execute(
+        "INSERT OR REPLACE INTO db_meta (key, value) VALUES (?, ?)", (key, value)
+    )
+
+
+def reclassify_industries(
+    db_name=None, batch_size=RECLASSIFY_BATCH_SIZE, restart=False, on_batch=None
+):
+    """
+    jobsテーブルの業界を最新の分類ルールで付け直す
+    バッチごとに1トランザクションで、分類が変わった行だけを更新する
+    集計の最大・最小値の再計算（stale）は最後に1度だけ行う
+
+    Args:
+        db_name: データベースファイル名
+        batch_size: 1バッチで読み込む件数
+        restart: Trueの場合はチェックポイントを無視して先頭からやり直す
+        on_batch: バッチ完了ごとに進捗の辞書を受け取るコールバック
+
+    Returns:
+        {"scanned": 処理件数, "updated": 更新件数, "resumed_from": 再開したid（先頭からならNone）}
+    """
+    fingerprint = rules_fingerprint()
+    conn = get_connection(db_name)
+
+    try:
+        last_id = _get_meta(conn, CHECKPOINT_KEY)
+        if restart or last_id is None or _get_meta(conn, RULES_KEY) != fingerprint:
+            last_id = None
+        resumed_from = last_id
+
+        scanned = 0
+        updated = 0
+        while True:
+            rows = conn.execute(
+                """
+                SELECT id, title, industry FROM jobs
+                WHERE id > ?
+                ORDER BY id
+                LIMIT ?
+            """,
+                (last_id or 0, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+
+            industries = classify_industries(row["title"] for row in rows)
+            changes = [
+                (industry, row["id"])
+                for row, industry in zip(rows, industries)
+                if industry != row["industry"]
+            ]
+            last_id = rows[-1]["id"]
+
+            with conn:
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                if changes:
+                    conn.executemany(
+                        "UPDATE jobs SET industry = ? WHERE id = ?", changes
+                    )
+                    bump_data_version(conn)
+                _set_meta(conn, CHECKPOINT_KEY, last_id)
+                _set_meta(conn, RULES_KEY, fingerprint)
+
+            scanned += len(rows)
+            updated += len(changes)
+            if on_batch:
+                on_batch({"scanned": scanned, "updated": updated, "last_id": last_id})
+
+        # 業界を移した行が最大・最小値だった集計を、中断した前回の分も含めて計算し直す
+        # （バッチごとに計算し直すと、staleの集計行が多い場合に毎回全体を作り直すことになる）
+        refresh_job_aggregates(conn)
+
+        # 最後まで処理したらチェックポイントを消す（次回は先頭から）
+        with conn:
+            conn.execute(
+                "DELETE FROM db_meta WHERE key IN (?, ?)", (CHECKPOINT_KEY, RULES_KEY)
+            )
+    finally:
+        conn.close()
+
+    return {"scanned": scanned, "updated": updated, "resumed_from": resumed_from}
+
+
+if __name__ == "__main__":
+    import sys
+
+    args = sys.argv[1:]
+    restart = "--restart" in args
+    args = [arg for arg in args if arg != "--restart"]
+    batch_size = int(args[0]) if args else RECLASSIFY_BATCH_SIZE
+
+    # 既存DBを最新のスキーマに揃えてから実行する
+    init_db(reset=False)
+
+    def print_progress(progress):
+        print(f"  {progress['scanned']:,}件処理 / {progress['updated']:,}件更新")
+
+    result = reclassify_industries(
+        batch_size=batch_size, restart=restart, on_batch=print_progress
+    )
+    if result["resumed_from"]:
+        print(f"id {result['resumed_from']} の続きから再開しました")
+    print(f"✅ 再分類完了: {result['scanned']:,}件中 {result['updated']:,}件を更新")
@@ -0,0 +1,138 @@
+# backend/region_crawler.py
+"""
+複数都道府県の並列クロール
+都道府県ごとのクロールを上限付きのワーカー（ヘッドレスブラウザまたはHTTP）で同時に実行する
+- 同じサイトへのアクセス間隔はホスト単位で共有して守る
+- 保存はJobWriterの1スレッドにまとめる
+- 都道府県ごとの進捗を記録する
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import crawler
+from crawl_waits import POLITENESS_DELAY, host_rate_limiter
+from dedup_cache import DedupCache
+from job_writer import JobWriter
+
+# 同時に実行する都道府県数（ブラウザを使う場合はメモリ使用量に注意）
+REGION_CRAWL_WORKERS = 4
+
+
+class RegionProgress:
+    """
+    都道府県ごとの進捗（スレッドセーフ）
+
+    各都道府県の状態:
+        {"status": "pending"|"running"|"done"|"failed", "pages": 取得ページ数,
+         "count": 保存件数, "error": エラー内容}
+    """
+
+    def __init__(self, prefectures, on_change=None):
+        self._lock = threading.Lock()
+        self._on_change = on_change
+        self._states = {
+            pref: {"status": "pending", "pages": 0, "count": 0, "error": None}
+            for pref in prefectures
+        }
+
+    def update(self, prefecture, **changes):
+        with self._lock:
+            self._states[prefecture].update(changes)
+            snapshot = self._snapshot()
+        if self._on_change:
+            self._on_change(snapshot)
+
+    def add_page(self, prefecture, inserted):
+        with self._lock:
+            state = self._states[prefecture]
+            state["pages"] += 1
+            state["count"] += inserted
+            snapshot = self._snapshot()
+        if self._on_change:
+            self._on_change(snapshot)
+
+    def _snapshot(self):
+        return {pref: dict(state) for pref, state in self._states.items()}
+
+    def snapshot(self):
+        with self._lock:
+            return self._snapshot()
+
+
+def crawl_prefectures(
+    prefectures,
+    workers=REGION_CRAWL_WORKERS,
+    max_pages=3,
+    force=False,
+    keyword="",
+    fetch_mode="selenium",
+    politeness_delay=POLITENESS_DELAY,
+    db_name=None,
+    on_progress=None,
+):
+    """
+    複数の都道府県を並列にクロールする
+
+    Args:
+        prefectures: 都道府県名のリスト
+        workers: 同時に実行する都道府県数
+        max_pages: 都道府県ごとの取得ページ数
+        force: Trueの場合、重複チェックをスキップして強制保存
+        keyword: 検索キーワード
+        fetch_mode: "selenium"（ヘッドレスブラウザ）または "http"
+        politeness_delay: 同じホストへのアクセスの最小間隔（秒、全ワーカーで共有）
+        db_name: データベースファイル名（省略時はDB_NAME）
+        on_progress: 進捗が変わるたびに都道府県ごとの状態の辞書を受け取るコールバック
+
+    Returns:
+        {"success": すべて成功したか, "count": 保存件数, "prefectures": 都道府県ごとの状態,
+         "elapsed_seconds": 所要時間}
+    """
+    progress = RegionProgress(prefectures, on_change=on_progress)
+    host = urlparse(crawler.HELLOWORK_BASE_URL).netloc
+    rate_limiter = host_rate_limiter(host, politeness_delay)
+    start = time.perf_counter()
+
+    def crawl_one(prefecture):
+        progress.update(prefecture, status="running")
+        try:
+            result = crawler.run_crawler(
+                prefecture=prefecture,
+                max_pages=max_pages,
+                headless=True,
+                force=force,
+                keyword=keyword,
+                fetch_mode=fetch_mode,
+                politeness_delay=politeness_delay,
+                writer=writer,
+                rate_limiter=rate_limiter,
+                dedup_cache=dedup_cache,
+                on_page=lambda page, saved: progress.add_page(
+                    prefecture, saved["inserted"]
+                ),
+            )
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+
+        if result.get("success"):
+            progress.update(prefecture, status="done")
+        else:
+            progress.update(prefecture, status="failed", error=result.get("error"))
+
+    # 保存済みの求人は全都道府県で共有する1つのキャッシュで判定する
+    dedup_cache = None if force else DedupCache.load(db_name)
+    with JobWriter(db_name) as writer:
+        with ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="region-crawl"
+        ) as executor:
+            list(executor.map(crawl_one, prefectures))
+
+    states = progress.snapshot()
+    return {
+        "success": all(state["status"] == "done" for state in states.values()),
+        "count": sum(state["count"] for state in states.values()),
+        "prefectures": states,
+        "elapsed_seconds": round(time.perf_counter() - start, 3),
+    }
@@ -0,0 +1,72 @@
+# backend/response_cache.py
+"""
+APIレスポンスのキャッシュ
+件数上限（LRUで追い出し）と有効期限（TTL）を持ち、
+データ更新の連番（data_version）が変わったエントリは使わない
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class CachedResponse:
+    """キャッシュしたレスポンス本文とETag"""
+
+    def __init__(self, version, body, mimetype, expires_at):
+        self.version = version
+        self.body = body
+        self.mimetype = mimetype
+        self.expires_at = expires_at
+        # 内容が同じならdata_versionが変わっても同じETagになる
+        self.etag = hashlib.sha1(body).hexdigest()
+
+
+class ResponseCache:
+    """
+    スレッドセーフなLRU + TTLキャッシュ
+
+    Args:
+        max_entries: 保持するエントリ数の上限
+        ttl: エントリの有効期限（秒）
+    """
+
+    def __init__(self, max_entries=64, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        """
+        有効なエントリを取得する
+
+        Returns:
+            CachedResponse、期限切れ・data_version不一致・未登録の場合はNone
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != version or entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key, version, body, mimetype):
+        """エントリを登録し、上限を超えた分を古い順に追い出す"""
+        entry = CachedResponse(version, body, mimetype, time.monotonic() + self.ttl)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -1,6 +1,8 @@
-from flask import Blueprint, jsonify
+import functools
+from flask import Blueprint, Response, jsonify, make_response, request
 from database import (
     get_all_jobs,
+    get_data_version,
     calculate_stats,
     get_industry_stats,
     get_location_stats,
@@ -10,12 +12,50 @@ from database import (
     get_industry_comparison,
     get_heatmap_data,
 )
+from response_cache import ResponseCache
 
 analysis_bp = Blueprint("analysis", __name__)
 DB_NAME = "jobs.db"
 
+CACHE_MAX_ENTRIES = 64
+CACHE_TTL_SECONDS = 300
+response_cache = ResponseCache(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS)
+
+
+def cached_response(view):
+    """
+    分析結果のレスポンスをキャッシュする（エンドポイント名とクエリ引数ごと）
+    求人の保存でdata_versionが進むと再計算し、ETagが一致すれば304を返す
+    """
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        version = get_data_version(DB_NAME)
+        if version is None:
+            return view(*args, **kwargs)
+
+        key = (request.endpoint, DB_NAME, tuple(sorted(request.args.items(multi=True))))
+        entry = response_cache.get(key, version)
+        if entry is None:
+            response = make_response(view(*args, **kwargs))
+            # エラーはキャッシュしない
+            if response.status_code != 200:
+                return response
+            entry = response_cache.put(
+                key, version, response.get_data(), response.mimetype
+            )
+
+        response = Response(entry.body, mimetype=entry.mimetype)
+        response.set_etag(entry.etag)
+        # ブラウザには毎回ETagで確認させる（変更がなければ304）
+        response.headers["Cache-Control"] = "no-cache"
+        return response.make_conditional(request)
+
+    return wrapper
+
 
 @analysis_bp.route("/api/stats")
+@cached_response
 def get_stats():
     """統計情報を取得"""
     try:
@@ -27,70 +67,77 @@ def get_stats():
 
 
 @analysis_bp.route("/api/analysis/industry")
+@cached_response
 def get_industry_analysis():
     """業界別統計を取得"""
     try:
-        stats = get_industry_stats()
+        stats = get_industry_stats(DB_NAME)
         return jsonify(stats)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @analysis_bp.route("/api/analysis/location")
+@cached_response
 def get_location_analysis():
     """地域別統計を取得"""
     try:
-        stats = get_location_stats()
+        stats = get_location_stats(DB_NAME)
         return jsonify(stats)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @analysis_bp.route("/api/analysis/ranking")
+@cached_response
 def get_ranking():
     """業界ランキング（求人数・平均賃金）を取得"""
     try:
-        ranking = get_industry_ranking()
+        ranking = get_industry_ranking(DB_NAME)
         return jsonify(ranking)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @analysis_bp.route("/api/analysis/hot")
+@cached_response
 def get_hot():
     """ホット業界ランキングを取得"""
     try:
-        hot = get_hot_industries()
+        hot = get_hot_industries(DB_NAME)
         return jsonify(hot)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @analysis_bp.route("/api/analysis/salary-trend")
+@cached_response
 def salary_trend():
     """給与推移データを取得"""
     try:
-        result = get_salary_trend()
+        result = get_salary_trend(DB_NAME)
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @analysis_bp.route("/api/analysis/industry-comparison")
+@cached_response
 def industry_comparison():
     """業界比較データを取得"""
     try:
-        result = get_industry_comparison()
+        result = get_industry_comparison(DB_NAME)
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @analysis_bp.route("/api/analysis/heatmap")
+@cached_response
 def heatmap():
     """ヒートマップデータを取得"""
     try:
-        result = get_heatmap_data()
+        result = get_heatmap_data(DB_NAME)
         return jsonify(result)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -1,189 +1,161 @@
 from flask import Blueprint, jsonify, request
-import threading
-from shared_state import crawler_status
+from crawl_jobs import (
+    CrawlJobConflict,
+    crawl_queue,
+    submit_indeed_crawl,
+    submit_prefecture_crawl,
+    submit_region_crawl,
+)
 from scheduler import get_schedules, add_schedule, remove_schedule
 
 crawler_bp = Blueprint("crawler", __name__)
 
 
-@crawler_bp.route("/api/crawl", methods=["POST"])
-def run_crawl():
-    """クローラーを実行する"""
-    if crawler_status["is_running"]:
-        return (
-            jsonify({"status": "error", "message": "クローラーは既に実行中です"}),
-            400,
-        )
-
-    data = request.get_json() or {}
-    prefecture = data.get("prefecture", "北海道")
-    max_pages = data.get("max_pages", 10)
-    force = data.get("force", False)  # 強制収集モード
-
-    # バックグラウンドでクローラーを実行
-    def run_crawler_thread():
-        crawler_status["is_running"] = True
-        crawler_status["last_error"] = None
-
-        try:
-            from crawler import run_crawler
-
-            run_crawler(
-                prefecture=prefecture, max_pages=max_pages, headless=False, force=force
-            )
-            crawler_status["last_result"] = {
-                "success": True,
-                "prefecture": prefecture,
-                "max_pages": max_pages,
-                "force": force,
-            }
-        except Exception as e:
-            crawler_status["last_error"] = str(e)
-            crawler_status["last_result"] = {"success": False, "error": str(e)}
-        finally:
-            crawler_status["is_running"] = False
-
-    thread = threading.Thread(target=run_crawler_thread)
-    thread.start()
-
+def _queued_response(job, message, **extra):
+    """ジョブ登録時のレスポンス（状態はstatus_urlで参照する）"""
     return (
         jsonify(
             {
-                "status": "started",
-                "message": f"クローラーを開始しました: {prefecture}, {max_pages}ページ, {'強制モード' if force else '通常モード'}",
+                "status": "queued",
+                "job_id": job.id,
+                "status_url": f"/api/crawl/status/{job.id}",
+                "message": message,
+                **extra,
             }
         ),
         202,
     )
 
 
-@crawler_bp.route("/api/crawl/indeed", methods=["POST"])
-def run_crawl_indeed():
-    """Indeedから求人を収集"""
-    if crawler_status["is_running"]:
+@crawler_bp.route("/api/crawl", methods=["POST"])
+def run_crawl():
+    """クローラーを実行する（ジョブとして登録し、順番に実行）"""
+    data = request.get_json() or {}
+    prefecture = data.get("prefecture", "北海道")
+    max_pages = data.get("max_pages", 10)
+    force = data.get("force", False)  # 強制収集モード
+    fetch_mode = data.get("fetch_mode", "selenium")  # "selenium" または "http"
+    incremental = data.get("incremental", False)  # 差分収集モード
+
+    try:
+        job = submit_prefecture_crawl(
+            prefecture,
+            max_pages=max_pages,
+            headless=False,
+            force=force,
+            fetch_mode=fetch_mode,
+            incremental=incremental,
+        )
+    except CrawlJobConflict as e:
+        # 実行中のジョブの条件は変えられないため、そのジョブを返して登録しない
         return (
-            jsonify({"status": "error", "message": "クローラーは既に実行中です"}),
-            400,
+            jsonify(
+                {
+                    "status": "error",
+                    "message": "同じ都道府県のクロールが別の条件で待機中・実行中です",
+                    "job_id": e.job.id,
+                    "status_url": f"/api/crawl/status/{e.job.id}",
+                    "params": e.job.params,
+                }
+            ),
+            409,
         )
+    # 同じ条件のジョブが待機中・実行中ならそのジョブなので、実行される条件を返す
+    params = job.params
+    return _queued_response(
+        job,
+        f"クローラーを登録しました: {params['prefecture']}, {params['max_pages']}ページ, "
+        f"{'強制モード' if params['force'] else '通常モード'}",
+    )
+
 
+@crawler_bp.route("/api/crawl/indeed", methods=["POST"])
+def run_crawl_indeed():
+    """Indeedから求人を収集"""
     data = request.get_json() or {}
     keyword = data.get("keyword", "")
     location = data.get("location", "東京都")
     max_pages = data.get("max_pages", 3)
-
-    def run_indeed_thread():
-        crawler_status["is_running"] = True
-        crawler_status["last_error"] = None
-
-        try:
-            print("🚀 Indeedクローラースレッド開始...")
-            from indeed_crawler import run_indeed_crawler
-
-            print(f"📦 indeed_crawler インポート成功")
-
-            result = run_indeed_crawler(
-                keyword=keyword, location=location, max_pages=max_pages, headless=False
-            )
-            crawler_status["last_result"] = result
-            print(f"✅ クローラー完了: {result}")
-        except Exception as e:
-            import traceback
-
-            print(f"❌ Indeedクローラーエラー: {e}")
-            traceback.print_exc()
-            crawler_status["last_error"] = str(e)
-            crawler_status["last_result"] = {"success": False, "error": str(e)}
-        finally:
-            crawler_status["is_running"] = False
-
-    thread = threading.Thread(target=run_indeed_thread)
-    thread.start()
-
-    return (
-        jsonify(
-            {
-                "status": "started",
-                "message": f"Indeed検索を開始: {keyword or '全て'} @ {location}",
-            }
-        ),
-        202,
+    incremental = data.get("incremental", False)
+
+    job = submit_indeed_crawl(
+        keyword=keyword,
+        location=location,
+        max_pages=max_pages,
+        headless=False,
+        incremental=incremental,
+    )
+    return _queued_response(
+        job, f"Indeed検索を登録しました: {keyword or '全て'} @ {location}"
     )
 
 
 @crawler_bp.route("/api/crawl/region", methods=["POST"])
 def run_crawl_region():
     """複数都道府県を一括収集"""
-    if crawler_status["is_running"]:
-        return (
-            jsonify({"status": "error", "message": "クローラーは既に実行中です"}),
-            400,
-        )
-
     data = request.get_json() or {}
     region = data.get("region", "kanto")
     max_pages = data.get("max_pages", 3)
     force = data.get("force", False)
     keyword = data.get("keyword", "")
+    fetch_mode = data.get("fetch_mode", "selenium")
+    workers = data.get("workers")  # 同時に収集する都道府県数
 
     from crawler import get_prefectures_by_region
 
     prefectures = get_prefectures_by_region(region)
 
-    def run_region_crawler():
-        crawler_status["is_running"] = True
-        crawler_status["last_error"] = None
-
+    if workers is not None:
         try:
-            from crawler import run_crawler
-
-            total = 0
-            for i, pref in enumerate(prefectures):
-                print(f"\n🌏 [{i+1}/{len(prefectures)}] {pref}を収集中...")
-                run_crawler(
-                    prefecture=pref,
-                    max_pages=max_pages,
-                    headless=True,
-                    force=force,
-                    keyword=keyword,
-                )
-                total += 1
-
-            crawler_status["last_result"] = {
-                "success": True,
-                "region": region,
-                "prefectures_count": total,
-            }
-        except Exception as e:
-            crawler_status["last_error"] = str(e)
-            crawler_status["last_result"] = {"success": False, "error": str(e)}
-        finally:
-            crawler_status["is_running"] = False
-
-    thread = threading.Thread(target=run_region_crawler)
-    thread.start()
-
-    return (
-        jsonify(
-            {
-                "status": "started",
-                "message": f"{len(prefectures)}都道府県の収集を開始しました",
-                "prefectures": prefectures,
-            }
-        ),
-        202,
+            workers = int(workers)
+        except (TypeError, ValueError):
+            return (
+                jsonify(
+                    {"status": "error", "message": "workersは整数で指定してください"}
+                ),
+                400,
+            )
+        # 1〜都道府県数の範囲に収める
+        workers = max(1, min(workers, len(prefectures)))
+
+    job = submit_region_crawl(
+        region,
+        prefectures,
+        max_pages=max_pages,
+        force=force,
+        keyword=keyword,
+        fetch_mode=fetch_mode,
+        workers=workers,
+    )
+    return _queued_response(
+        job,
+        f"{len(prefectures)}都道府県の収集を登録しました",
+        prefectures=prefectures,
     )
 
 
 @crawler_bp.route("/api/crawl/status")
 def get_crawl_status():
-    """クローラーの実行状態を取得"""
-    return jsonify(
-        {
-            "is_running": crawler_status["is_running"],
-            "last_result": crawler_status["last_result"],
-            "last_error": crawler_status["last_error"],
-        }
-    )
+    """クローラー全体の実行状態を取得（待機中・実行中のジョブ数と最後の結果）"""
+    return jsonify(crawl_queue.summary())
+
+
+@crawler_bp.route("/api/crawl/status/<job_id>")
+def get_crawl_job_status(job_id):
+    """クロールジョブの状態・進捗・結果を取得"""
+    job = crawl_queue.get(job_id)
+    if job is None:
+        return (
+            jsonify({"status": "error", "message": "ジョブが見つかりません"}),
+            404,
+        )
+    return jsonify(job.to_dict())
+
+
+@crawler_bp.route("/api/crawl/jobs")
+def get_crawl_jobs():
+    """クロールジョブの一覧を取得（新しい順）"""
+    return jsonify([job.to_dict() for job in reversed(crawl_queue.jobs())])
 
 
 @crawler_bp.route("/api/schedules")
@@ -203,6 +175,7 @@ def add_schedule_api():
         max_pages=data.get("max_pages", 10),
         keyword=data.get("keyword", ""),
         force=data.get("force", False),
+        incremental=data.get("incremental", False),
     )
     return jsonify(result)
 
@@ -1,42 +1,137 @@
-from flask import Blueprint, jsonify, request
-from database import get_all_jobs, init_db, search_jobs
+import csv
+import io
+import json
+import threading
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from database import get_jobs_page, init_db, iter_jobs, job_columns
+from shared_state import reclassify_status
 
 jobs_bp = Blueprint("jobs", __name__)
 DB_NAME = "jobs.db"
 
 
-@jobs_bp.route("/api/jobs")
-def get_jobs():
-    """求人一覧を取得（フィルタリング対応）"""
-    wage_type = request.args.get("wage_type")
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def _paged_jobs_response(**filters):
+    """
+    キーセットページングで求人一覧を返す
+    本文は求人のリスト、ページ情報はレスポンスヘッダーで返す
+    - X-Next-After-Id: 次ページ取得時のafter_id（最終ページでは付与しない）
+    - X-Next-After-Score: 関連度順のキーワード検索で、次ページ取得時のafter_score
+    - X-Total-Estimate: 該当件数の見積もり
+    """
+    after_id = request.args.get("after_id", type=int)
+    after_score = request.args.get("after_score", type=float)
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    fields = request.args.get("fields")
+    fields = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
 
     try:
-        jobs_list = get_all_jobs(DB_NAME, wage_type=wage_type)
-        return jsonify(jobs_list)
+        page = get_jobs_page(
+            after_id=after_id,
+            after_score=after_score,
+            limit=limit,
+            fields=fields,
+            db_name=DB_NAME,
+            **filters,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+    response = jsonify(page["items"])
+    if page["next_after_id"] is not None:
+        response.headers["X-Next-After-Id"] = str(page["next_after_id"])
+    if page["next_after_score"] is not None:
+        # floatのreprは元の値に戻せるので、次ページの条件がずれない
+        response.headers["X-Next-After-Score"] = repr(page["next_after_score"])
+    response.headers["X-Total-Estimate"] = str(page["total_estimate"])
+    return response
+
+
+@jobs_bp.route("/api/jobs")
+def get_jobs():
+    """求人一覧を取得（フィルタリング・ページング対応）"""
+    return _paged_jobs_response(wage_type=request.args.get("wage_type"))
+
 
 @jobs_bp.route("/api/search")
 def search():
-    """求人を検索する"""
-    keyword = request.args.get("keyword")
-    wage_min = request.args.get("wage_min", type=int)
-    wage_max = request.args.get("wage_max", type=int)
-    industry = request.args.get("industry")
-    location = request.args.get("location")  # 都道府県フィルター
+    """求人を検索する（ページング対応、3文字以上のキーワードは関連度順）"""
+    return _paged_jobs_response(
+        keyword=request.args.get("keyword"),
+        wage_min=request.args.get("wage_min", type=int),
+        wage_max=request.args.get("wage_max", type=int),
+        monthly_wage_min=request.args.get("monthly_wage_min", type=int),
+        monthly_wage_max=request.args.get("monthly_wage_max", type=int),
+        industry=request.args.get("industry"),
+        location=request.args.get("location"),  # 都道府県フィルター
+    )
+
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+@jobs_bp.route("/api/export")
+def export_jobs():
+    """
+    求人データをストリーミングでエクスポートする
+    format=ndjson|csv、絞り込み条件は/api/searchと同じ（wage_type・fieldsも指定可能）
+    """
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": f"未対応の形式です: {export_format}"}), 400
 
+    fields = request.args.get("fields")
+    fields = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
     try:
-        results = search_jobs(
-            keyword=keyword,
-            wage_min=wage_min,
-            wage_max=wage_max,
-            industry=industry,
-            location=location,
-        )
-        return jsonify(results)
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+        columns = job_columns(fields)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    rows = iter_jobs(
+        fields=columns,
+        keyword=request.args.get("keyword"),
+        wage_min=request.args.get("wage_min", type=int),
+        wage_max=request.args.get("wage_max", type=int),
+        monthly_wage_min=request.args.get("monthly_wage_min", type=int),
+        monthly_wage_max=request.args.get("monthly_wage_max", type=int),
+        industry=request.args.get("industry"),
+        location=request.args.get("location"),
+        wage_type=request.args.get("wage_type"),
+        db_name=DB_NAME,
+    )
+
+    def generate_ndjson():
+        for row in rows:
+            yield json.dumps(row, ensure_ascii=False) + "\n"
+
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for i, row in enumerate(rows, 1):
+            writer.writerow([row[col] for col in columns])
+            # 一定件数ごとに書き出してバッファを空にする
+            if i % 500 == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    generate = generate_csv if export_format == "csv" else generate_ndjson
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f"attachment; filename=jobs.{export_format}"},
+    )
 
 
 @jobs_bp.route("/api/init", methods=["POST"])
@@ -57,6 +152,60 @@ def init_database():
         return jsonify({"error": str(e)}), 500
 
 
+@jobs_bp.route("/api/reclassify", methods=["POST"])
+def run_reclassify():
+    """保存済み求人の業界を最新の分類ルールで付け直す（バックグラウンド実行）"""
+    if reclassify_status["is_running"]:
+        return (
+            jsonify({"status": "error", "message": "再分類は既に実行中です"}),
+            400,
+        )
+
+    data = request.get_json() or {}
+    restart = data.get("restart", False)
+    db_name = DB_NAME
+
+    def run_reclassify_thread():
+        reclassify_status["last_error"] = None
+        reclassify_status["progress"] = None
+
+        try:
+            from reclassify import reclassify_industries
+
+            def update_progress(progress):
+                reclassify_status["progress"] = progress
+
+            result = reclassify_industries(
+                db_name=db_name, restart=restart, on_batch=update_progress
+            )
+            reclassify_status["last_result"] = {"success": True, **result}
+        except Exception as e:
+            reclassify_status["last_error"] = str(e)
+            reclassify_status["last_result"] = {"success": False, "error": str(e)}
+        finally:
+            reclassify_status["is_running"] = False
+
+    reclassify_status["is_running"] = True
+    thread = threading.Thread(target=run_reclassify_thread)
+    thread.start()
+
+    return (
+        jsonify(
+            {
+                "status": "started",
+                "message": f"業界の再分類を開始しました（{'先頭から' if restart else '続きから'}）",
+            }
+        ),
+        202,
+    )
+
+
+@jobs_bp.route("/api/reclassify/status")
+def get_reclassify_status():
+    """再分類の実行状態を取得"""
+    return jsonify(reclassify_status)
+
+
 @jobs_bp.route("/api/industries")
 def get_industries():
     """業界リストを取得"""
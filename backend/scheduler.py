@@ -38,7 +38,13 @@ def get_schedules():
 
 
 def add_schedule(
-    name, prefecture, interval_hours=24, max_pages=10, keyword="", force=False
+    name,
+    prefecture,
+    interval_hours=24,
+    max_pages=10,
+    keyword="",
+    force=False,
+    incremental=False,
 ):
     """
     スケジュールを追加
@@ -50,6 +56,7 @@ def add_schedule(
         max_pages: 最大ページ数
         keyword: 検索キーワード
         force: 強制収集モード
+        incremental: 差分収集（保存済みの求人だけのページに達したら打ち切る）
     """
     schedules = load_schedules()
 
@@ -63,6 +70,7 @@ def add_schedule(
         "max_pages": max_pages,
         "keyword": keyword,
         "force": force,
+        "incremental": incremental,
         "created_at": datetime.datetime.now().isoformat(),
         "last_run": None,
     }
@@ -96,15 +104,24 @@ def _add_job(schedule):
     global scheduler_started
 
     def job_func():
-        from crawler import run_crawler
-
-        run_crawler(
-            prefecture=schedule["prefecture"],
-            max_pages=schedule["max_pages"],
-            headless=True,
-            force=schedule.get("force", False),
-            keyword=schedule.get("keyword", ""),
-        )
+        from crawl_jobs import CrawlJobConflict, submit_prefecture_crawl
+
+        # APIからのクロールと同じキューに登録して同時実行数を揃える
+        try:
+            job = submit_prefecture_crawl(
+                schedule["prefecture"],
+                max_pages=schedule["max_pages"],
+                headless=True,
+                force=schedule.get("force", False),
+                keyword=schedule.get("keyword", ""),
+                # 差分収集は指定したスケジュールだけ（以前のスケジュールは全ページ取得）
+                incremental=schedule.get("incremental", False),
+            )
+        except CrawlJobConflict as e:
+            # 同じ検索条件のクロールが別の条件で実行中なら今回は見送る（次の実行で収集する）
+            print(f"⏭ スケジュール {schedule['name']} を見送りました: {e}")
+            return
+        job.wait()
         # 最終実行時間を更新
         schedules = load_schedules()
         for s in schedules:
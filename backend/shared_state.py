@@ -1,2 +1,9 @@
-# Shared state for crawler status
-crawler_status = {"is_running": False, "last_result": None, "last_error": None}
+# クロールの実行状態は crawl_jobs.crawl_queue で管理する
+
+# Shared state for industry reclassification
+reclassify_status = {
+    "is_running": False,
+    "progress": None,
+    "last_result": None,
+    "last_error": None,
+}
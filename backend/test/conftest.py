@@ -0,0 +1,99 @@
+# backend/test/conftest.py
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "hellowork")
+
+
+def _read_fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), "rb") as f:
+        return f.read()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """記録したページを返すハローワークの代役サーバー
+
+    応答はサーバーの属性で切り替える:
+    search_form（検索フォームのHTML）、latency（応答までの秒数）、
+    down（検索フォームを404にする）、fail_next（次のページ送りを1回だけ400にする）、
+    rewrite_page（返す前に結果ページを書き換える関数）
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, body):
+        # 実際のサイトの応答時間の代わり（同時アクセス数も記録する）
+        with self.server.lock:
+            self.server.active += 1
+            self.server.max_active = max(self.server.max_active, self.server.active)
+        time.sleep(self.server.latency)
+        with self.server.lock:
+            self.server.active -= 1
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        if query.get("action") == ["initDisp"] and not self.server.down:
+            self._send(self.server.search_form)
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        form = parse_qs(self.rfile.read(length).decode("utf-8"), keep_blank_values=True)
+        self.server.posted.append(form)
+
+        if "searchBtn" in form:
+            page = _read_fixture("result_page1.html")
+        elif form.get("fwListNowPage") == ["1"] and (
+            "fwListNaviBtnNext" in form or "fwListNaviBtnPageNo2" in form
+        ):
+            if self.server.fail_next:
+                self.server.fail_next = False
+                self.send_error(400)
+                return
+            page = _read_fixture("result_page2.html")
+        else:
+            self.send_error(400)
+            return
+
+        if self.server.rewrite_page:
+            page = self.server.rewrite_page(page, form)
+        self._send(page)
+
+
+@pytest.fixture
+def read_fixture():
+    """記録したハローワークのページ（bytes）を読む関数"""
+    return _read_fixture
+
+
+@pytest.fixture
+def stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    server.posted = []
+    server.search_form = _read_fixture("search_form.html")
+    server.latency = 0
+    server.down = False
+    server.fail_next = False
+    server.rewrite_page = None
+    server.lock = threading.Lock()
+    server.active = 0
+    server.max_active = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -78,3 +78,291 @@ class TestHeatmapData:
         assert isinstance(result["prefectures"], list)
         assert isinstance(result["industries"], list)
         assert isinstance(result["data"], list)
+
+    def test_heatmap_counts_by_prefecture_and_industry(self, tmp_path):
+        """都道府県×業界の件数が1回の集計で正しく求まること"""
+        from database import init_db_with_path, save_job_to_db, get_heatmap_data
+
+        db_path = str(tmp_path / "heatmap.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        for job in [
+            ("看護師", 250000, 0, "monthly", "A病院", "東京都新宿区", "", "医療・介護"),
+            ("介護職", 220000, 0, "monthly", "B施設", "東京都港区", "", "医療・介護"),
+            ("SE", 300000, 0, "monthly", "C社", "沖縄県那覇市", "", "IT・エンジニア"),
+            ("営業", 200000, 0, "monthly", "D社", "青森県青森市", "", "営業・事務"),
+        ]:
+            save_job_to_db(conn, job)
+        conn.close()
+
+        result = get_heatmap_data(db_path)
+
+        assert len(result["prefectures"]) == 47
+        assert result["industries"][0] == "医療・介護"
+        matrix = {
+            (pref, ind): result["data"][i][j]
+            for i, pref in enumerate(result["prefectures"])
+            for j, ind in enumerate(result["industries"])
+        }
+        assert matrix[("東京都", "医療・介護")] == 2
+        assert matrix[("沖縄県", "IT・エンジニア")] == 1
+        assert matrix[("青森県", "営業・事務")] == 1
+        assert matrix[("京都府", "医療・介護")] == 0
+
+
+class TestJobAggregates:
+    """集計テーブル（job_aggregates）のテスト"""
+
+    HELPERS = [
+        "get_industry_stats",
+        "get_location_stats",
+        "get_industry_ranking",
+        "get_hot_industries",
+        "get_salary_trend",
+        "get_industry_comparison",
+        "get_heatmap_data",
+    ]
+
+    def teardown_method(self):
+        from database import close_pools
+
+        close_pools()
+
+    def _results(self, db_path):
+        import database
+
+        return {name: getattr(database, name)(db_path) for name in self.HELPERS}
+
+    def test_incremental_updates_match_rebuild(self, tmp_path):
+        """追加・更新・削除を差分反映した集計が、全件から作り直した集計と一致すること"""
+        from database import (
+            init_db_with_path,
+            rebuild_job_aggregates,
+            save_jobs_bulk,
+        )
+
+        db_path = str(tmp_path / "aggregates.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        save_jobs_bulk(
+            conn,
+            [
+                (
+                    "看護師",
+                    250000,
+                    0,
+                    "monthly",
+                    "A病院",
+                    "東京都新宿区",
+                    "",
+                    "医療・介護",
+                ),
+                (
+                    "介護職",
+                    220000,
+                    0,
+                    "monthly",
+                    "B施設",
+                    "東京都港区",
+                    "",
+                    "医療・介護",
+                ),
+                (
+                    "看護助手",
+                    1300,
+                    0,
+                    "hourly",
+                    "C病院",
+                    "大阪府大阪市",
+                    "",
+                    "医療・介護",
+                ),
+                (
+                    "SE",
+                    4800000,
+                    0,
+                    "annual",
+                    "D社",
+                    "沖縄県那覇市",
+                    "",
+                    "IT・エンジニア",
+                ),
+                ("営業", 0, 0, "monthly", "E社", "青森県青森市", "", "営業・事務"),
+                ("事務", None, None, "monthly", "F社", "", "", None),
+            ],
+        )
+        conn.execute("UPDATE jobs SET created_at = '2024-01-15' WHERE title = 'SE'")
+        # 強制保存で給与が変わる（最大値を持つ行の更新）
+        save_jobs_bulk(
+            conn,
+            [
+                (
+                    "看護師",
+                    230000,
+                    0,
+                    "monthly",
+                    "A病院",
+                    "東京都新宿区",
+                    "",
+                    "医療・介護",
+                )
+            ],
+            dedupe=False,
+        )
+        conn.execute("DELETE FROM jobs WHERE title = '看護助手'")
+        conn.execute("UPDATE jobs SET industry = 'その他' WHERE title = '営業'")
+        conn.commit()
+        conn.close()
+
+        incremental = self._results(db_path)
+
+        conn = sqlite3.connect(db_path)
+        rebuild_job_aggregates(conn)
+        conn.close()
+
+        assert incremental == self._results(db_path)
+
+        comparison = {
+            row["industry"]: row for row in incremental["get_industry_comparison"]
+        }
+        assert comparison["医療・介護"]["max_wage"] == 230000
+        assert comparison["医療・介護"]["job_count"] == 2
+        assert comparison["IT・エンジニア"]["avg_wage"] == 400000
+        assert "その他" not in comparison
+        assert {row["month"] for row in incremental["get_salary_trend"]} >= {"2024-01"}
+
+    def test_stale_extremes_are_recalculated(self, tmp_path):
+        """最大・最小値を持つ行を削除すると、書き込み側の再計算で反映されること"""
+        from database import (
+            get_industry_ranking,
+            init_db_with_path,
+            refresh_job_aggregates,
+            save_jobs_bulk,
+        )
+
+        db_path = str(tmp_path / "aggregates.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        save_jobs_bulk(
+            conn,
+            [
+                ("求人A", 200000, 0, "monthly", "A社", "東京都", "", "営業・事務"),
+                ("求人B", 300000, 0, "monthly", "B社", "東京都", "", "営業・事務"),
+                ("求人C", 250000, 0, "monthly", "C社", "東京都", "", "営業・事務"),
+            ],
+        )
+        conn.execute("DELETE FROM jobs WHERE wage_min IN (200000, 300000)")
+        conn.commit()
+        stale = conn.execute(
+            "SELECT COUNT(*) FROM job_aggregates WHERE stale"
+        ).fetchone()
+        assert stale[0] == 1
+
+        # 読み込みでは書き込まない
+        get_industry_ranking(db_path)
+        stale = conn.execute(
+            "SELECT COUNT(*) FROM job_aggregates WHERE stale"
+        ).fetchone()
+        assert stale[0] == 1
+
+        assert refresh_job_aggregates(conn) == 1
+        conn.close()
+        ranking = get_industry_ranking(db_path)
+
+        assert ranking == [
+            {
+                "industry": "営業・事務",
+                "job_count": 1,
+                "avg_monthly": 250000.0,
+                "avg_hourly": None,
+                "max_monthly": 250000,
+                "min_monthly": 250000,
+            }
+        ]
+
+    def test_force_save_recalculates_extremes(self, tmp_path):
+        """強制保存で最大値を持つ行の給与が下がると、同じ書き込みで再計算されること"""
+        from database import get_industry_comparison, init_db_with_path, save_jobs_bulk
+
+        db_path = str(tmp_path / "aggregates.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        save_jobs_bulk(
+            conn,
+            [
+                ("求人A", 200000, 0, "monthly", "A社", "東京都", "", "営業・事務"),
+                ("求人B", 300000, 0, "monthly", "B社", "東京都", "", "営業・事務"),
+            ],
+        )
+        save_jobs_bulk(
+            conn,
+            [("求人B", 220000, 0, "monthly", "B社", "東京都", "", "営業・事務")],
+            dedupe=False,
+        )
+        stale = conn.execute(
+            "SELECT COUNT(*) FROM job_aggregates WHERE stale"
+        ).fetchone()
+        conn.close()
+
+        assert stale[0] == 0
+        assert get_industry_comparison(db_path)[0]["max_wage"] == 220000
+
+    def test_analysis_reads_do_not_wait_for_writer(self, tmp_path):
+        """クロールが書き込みロックを持っていても分析の読み込みは待たないこと"""
+        import time
+
+        from database import (
+            close_pools,
+            get_industry_comparison,
+            get_industry_ranking,
+            init_db_with_path,
+            save_jobs_bulk,
+        )
+
+        db_path = str(tmp_path / "aggregates.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        save_jobs_bulk(
+            conn,
+            [
+                ("求人A", 200000, 0, "monthly", "A社", "東京都", "", "営業・事務"),
+                ("求人B", 300000, 0, "monthly", "B社", "東京都", "", "営業・事務"),
+            ],
+        )
+        conn.execute("DELETE FROM jobs WHERE wage_min = 300000")
+        conn.commit()
+
+        writer = sqlite3.connect(db_path)
+        writer.execute("BEGIN IMMEDIATE")
+        try:
+            start = time.perf_counter()
+            get_industry_ranking(db_path)
+            get_industry_comparison(db_path)
+            elapsed = time.perf_counter() - start
+        finally:
+            writer.rollback()
+            writer.close()
+            conn.close()
+            close_pools(db_path)
+
+        assert elapsed < 1
+
+    def test_migration_builds_aggregates_from_existing_rows(self, tmp_path):
+        """既存DBには移行時に集計テーブルが作られること"""
+        from database import get_industry_stats, init_db_with_path, save_jobs_bulk
+
+        db_path = str(tmp_path / "aggregates.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        save_jobs_bulk(
+            conn, [("求人A", 200000, 0, "monthly", "A社", "東京都", "", "営業・事務")]
+        )
+        conn.execute("DROP TABLE job_aggregates")
+        conn.commit()
+        conn.close()
+
+        init_db_with_path(db_path, reset=False)
+
+        assert get_industry_stats(db_path) == [
+            {"industry": "営業・事務", "count": 1, "avg_wage": 200000.0}
+        ]
@@ -51,6 +51,23 @@ class TestCrawlAPI:
         app.config["TESTING"] = True
         self.client = app.test_client()
 
+    @pytest.fixture(autouse=True)
+    def crawl_queue(self, monkeypatch):
+        """テストごとの専用キューで、実際のクロールの代わりに即座に終わる関数を実行する"""
+        import crawl_jobs
+        import crawler
+        import routes.crawler
+        from crawl_jobs import CrawlQueue
+
+        queue = CrawlQueue()
+        monkeypatch.setattr(crawl_jobs, "crawl_queue", queue)
+        monkeypatch.setattr(routes.crawler, "crawl_queue", queue)
+        monkeypatch.setattr(
+            crawler, "run_crawler", lambda **kwargs: {"success": True, "count": 0}
+        )
+        yield queue
+        queue.shutdown()
+
     def test_crawl_endpoint_exists(self):
         """POST /api/crawl エンドポイントが存在する"""
         response = self.client.post(
@@ -64,3 +81,287 @@ class TestCrawlAPI:
         response = self.client.post("/api/crawl", json={})
         # パラメータ不足でもデフォルト値で動作するか確認
         assert response.status_code in [200, 202, 400]
+
+
+class TestJobsPagination:
+    """求人一覧のキーセットページングのテスト"""
+
+    def setup_method(self):
+        app.config["TESTING"] = True
+        self.client = app.test_client()
+
+    def _make_db(self, tmp_path, monkeypatch, count):
+        import routes.jobs
+        from database import init_db_with_path, save_jobs_bulk, get_connection
+
+        db_path = str(tmp_path / "paging.db")
+        init_db_with_path(db_path)
+        conn = get_connection(db_path)
+        save_jobs_bulk(
+            conn,
+            [
+                (f"求人{i}", 200000 + i, 0, "monthly", f"会社{i}", "東京都", "")
+                for i in range(count)
+            ],
+        )
+        conn.close()
+        monkeypatch.setattr(routes.jobs, "DB_NAME", db_path)
+
+    def test_pages_follow_cursor(self, tmp_path, monkeypatch):
+        """after_idを辿ると重複なく全件を取得できる"""
+        self._make_db(tmp_path, monkeypatch, 25)
+
+        seen = []
+        url = "/api/jobs?limit=10"
+        while True:
+            response = self.client.get(url)
+            assert response.status_code == 200
+            page = json.loads(response.data)
+            seen.extend(job["id"] for job in page)
+            next_after_id = response.headers.get("X-Next-After-Id")
+            if not next_after_id:
+                break
+            url = f"/api/jobs?limit=10&after_id={next_after_id}"
+
+        assert len(seen) == 25
+        assert seen == sorted(seen, reverse=True)
+        assert response.headers["X-Total-Estimate"] == "25"
+
+    def test_keyword_search_pages_by_relevance(self, tmp_path, monkeypatch):
+        """全文検索のキーワード検索は関連度順で、after_id・after_scoreを辿ると重複なく全件を取得できる"""
+        import routes.jobs
+        from database import init_db_with_path, save_jobs_bulk, get_connection
+
+        db_path = str(tmp_path / "ranked.db")
+        init_db_with_path(db_path)
+        conn = get_connection(db_path)
+        # タイトルの一致を先に保存する（id降順では後ろになるが、関連度順では上位）
+        rows = [
+            (f"介護スタッフ{i}", 200000, 0, "monthly", f"会社{i}", "東京都", "")
+            for i in range(6)
+        ] + [
+            (f"事務員{i}", 200000, 0, "monthly", "介護スタッフ派遣社", "東京都", "")
+            for i in range(6)
+        ]
+        save_jobs_bulk(conn, rows)
+        conn.close()
+        monkeypatch.setattr(routes.jobs, "DB_NAME", db_path)
+
+        titles = []
+        url = "/api/search?keyword=介護スタッフ&limit=4"
+        while True:
+            response = self.client.get(url)
+            assert response.status_code == 200
+            titles.extend(job["title"] for job in json.loads(response.data))
+            next_after_id = response.headers.get("X-Next-After-Id")
+            if not next_after_id:
+                break
+            next_after_score = response.headers["X-Next-After-Score"]
+            url = (
+                "/api/search?keyword=介護スタッフ&limit=4"
+                f"&after_id={next_after_id}&after_score={next_after_score}"
+            )
+
+        assert len(titles) == len(set(titles)) == 12
+        assert all(title.startswith("介護スタッフ") for title in titles[:6])
+        assert all(title.startswith("事務員") for title in titles[6:])
+
+        # 関連度のないカーソルでは次ページの位置が決まらない
+        response = self.client.get("/api/search?keyword=介護スタッフ&after_id=3")
+        assert response.status_code == 400
+
+    def test_fields_projection(self, tmp_path, monkeypatch):
+        """fields=で返却カラムを絞り込める（idは常に含む）"""
+        self._make_db(tmp_path, monkeypatch, 3)
+
+        response = self.client.get("/api/search?keyword=求人&fields=title,wage_min")
+        data = json.loads(response.data)
+
+        assert response.status_code == 200
+        assert len(data) == 3
+        assert set(data[0]) == {"id", "title", "wage_min"}
+
+    def test_unknown_field_is_rejected(self, tmp_path, monkeypatch):
+        """不明なカラムを指定すると400を返す"""
+        self._make_db(tmp_path, monkeypatch, 1)
+
+        response = self.client.get("/api/jobs?fields=title,password")
+
+        assert response.status_code == 400
+
+
+class TestExportAPI:
+    """エクスポートAPIのテスト"""
+
+    def setup_method(self):
+        app.config["TESTING"] = True
+        self.client = app.test_client()
+
+    def _make_db(self, tmp_path, monkeypatch):
+        import routes.jobs
+        from database import init_db_with_path, save_jobs_bulk, get_connection
+
+        db_path = str(tmp_path / "export.db")
+        init_db_with_path(db_path)
+        conn = get_connection(db_path)
+        save_jobs_bulk(
+            conn,
+            [
+                (f"求人{i}", 1000 + i, 0, "hourly", f"会社{i}", "大阪府", "")
+                for i in range(1200)
+            ]
+            + [("月給の求人", 250000, 0, "monthly", "別会社", "東京都", "")],
+        )
+        conn.close()
+        monkeypatch.setattr(routes.jobs, "DB_NAME", db_path)
+
+    def test_export_ndjson_streams_all_rows(self, tmp_path, monkeypatch):
+        """NDJSONで絞り込み条件に合う全件を出力する"""
+        self._make_db(tmp_path, monkeypatch)
+
+        response = self.client.get("/api/export?format=ndjson&wage_type=hourly")
+        lines = response.get_data(as_text=True).splitlines()
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        assert len(lines) == 1200
+        assert json.loads(lines[0])["title"] == "求人1199"
+
+    def test_export_csv_with_fields(self, tmp_path, monkeypatch):
+        """CSVではヘッダー行と指定カラムを出力する"""
+        import csv
+        import io
+
+        self._make_db(tmp_path, monkeypatch)
+
+        response = self.client.get("/api/export?format=csv&location=東京&fields=title")
+        rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+
+        assert response.status_code == 200
+        assert rows[0] == ["id", "title"]
+        assert rows[1][1] == "月給の求人"
+        assert len(rows) == 2
+
+    def test_export_rejects_unknown_format(self):
+        """未対応の形式は400を返す"""
+        response = self.client.get("/api/export?format=xml")
+
+        assert response.status_code == 400
+
+
+class TestAnalysisCache:
+    """分析APIのレスポンスキャッシュのテスト"""
+
+    def setup_method(self):
+        from routes.analysis import response_cache
+
+        app.config["TESTING"] = True
+        self.client = app.test_client()
+        response_cache.clear()
+
+    def teardown_method(self):
+        from database import close_pools
+        from routes.analysis import response_cache
+
+        response_cache.clear()
+        close_pools()
+
+    def _make_db(self, tmp_path, monkeypatch):
+        import routes.analysis
+        from database import init_db_with_path
+
+        db_path = str(tmp_path / "analysis.db")
+        init_db_with_path(db_path)
+        monkeypatch.setattr(routes.analysis, "DB_NAME", db_path)
+        return db_path
+
+    def _save(self, db_path, title):
+        from database import get_connection, save_jobs_bulk
+
+        conn = get_connection(db_path)
+        save_jobs_bulk(
+            conn, [(title, 200000, 0, "monthly", "A社", "東京都", "", "営業・事務")]
+        )
+        conn.close()
+
+    def test_cached_until_data_changes(self, tmp_path, monkeypatch):
+        """同じリクエストは再計算せず、求人が保存されると再計算する"""
+        import routes.analysis
+
+        db_path = self._make_db(tmp_path, monkeypatch)
+        calls = []
+        original = routes.analysis.get_industry_stats
+
+        def counting(db_name=None):
+            calls.append(db_name)
+            return original(db_name)
+
+        monkeypatch.setattr(routes.analysis, "get_industry_stats", counting)
+
+        self._save(db_path, "求人1")
+        first = self.client.get("/api/analysis/industry")
+        second = self.client.get("/api/analysis/industry")
+        assert len(calls) == 1
+        assert first.data == second.data
+        assert json.loads(first.data)[0]["count"] == 1
+
+        self._save(db_path, "求人2")
+        third = self.client.get("/api/analysis/industry")
+        assert len(calls) == 2
+        assert json.loads(third.data)[0]["count"] == 2
+
+    def test_etag_returns_not_modified(self, tmp_path, monkeypatch):
+        """If-None-MatchがETagと一致すれば304を返す"""
+        db_path = self._make_db(tmp_path, monkeypatch)
+        self._save(db_path, "求人1")
+
+        response = self.client.get("/api/analysis/heatmap")
+        etag = response.headers["ETag"]
+        assert response.status_code == 200
+
+        response = self.client.get(
+            "/api/analysis/heatmap", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert response.data == b""
+
+        self._save(db_path, "求人2")
+        response = self.client.get(
+            "/api/analysis/heatmap", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+
+class TestResponseCache:
+    """ResponseCache（LRU + TTL）のテスト"""
+
+    def test_evicts_least_recently_used(self):
+        """上限を超えると最も長く使われていないエントリを追い出す"""
+        from response_cache import ResponseCache
+
+        cache = ResponseCache(max_entries=2, ttl=60)
+        cache.put("a", 1, b"a", "application/json")
+        cache.put("b", 1, b"b", "application/json")
+        assert cache.get("a", 1) is not None
+        cache.put("c", 1, b"c", "application/json")
+
+        assert len(cache) == 2
+        assert cache.get("b", 1) is None
+        assert cache.get("a", 1).body == b"a"
+
+    def test_expired_or_old_version_is_ignored(self, monkeypatch):
+        """有効期限切れ・data_versionが異なるエントリは使わない"""
+        import response_cache
+        from response_cache import ResponseCache
+
+        now = [1000.0]
+        monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+        cache = ResponseCache(max_entries=4, ttl=10)
+        cache.put("a", 1, b"a", "application/json")
+
+        assert cache.get("a", 2) is None
+        cache.put("a", 1, b"a", "application/json")
+        now[0] += 11
+        assert cache.get("a", 1) is None
+        assert len(cache) == 0
@@ -0,0 +1,217 @@
+# backend/test/test_crawl_checkpoints.py
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def stand_in_server(stand_in_server):
+    """1ページ目の先頭の求人番号とページ番号のボタンを切り替えられる代役サーバー"""
+    stand_in_server.page_buttons = False
+    stand_in_server.first_job_no = b"13010-00001"
+
+    def rewrite_page(page, form):
+        if "searchBtn" not in form:
+            return page
+        # 新着求人で1ページ目の並びが変わった状態
+        page = page.replace(b"13010-00001", stand_in_server.first_job_no)
+        if stand_in_server.page_buttons:
+            page = page.replace(
+                b'<input type="submit" name="fwListNaviBtnNext"',
+                b'<input type="submit" name="fwListNaviBtnPageNo2" value="2">\n'
+                b'  <input type="submit" name="fwListNaviBtnNext"',
+            )
+        return page
+
+    stand_in_server.rewrite_page = rewrite_page
+    return stand_in_server
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    import database
+    from database import init_db_with_path
+
+    path = str(tmp_path / "checkpoints.db")
+    init_db_with_path(path)
+    monkeypatch.setattr(database, "DB_NAME", path)
+    return path
+
+
+class TestCrawlCheckpoint:
+    """チェックポイントの記録のテスト"""
+
+    def teardown_method(self):
+        from database import close_pools
+
+        close_pools()
+
+    def test_resumes_with_same_fingerprint(self, db_path):
+        """同じ検索結果なら最後に完了したページを返す"""
+        from crawl_checkpoints import CrawlCheckpoint, list_checkpoints
+
+        checkpoint = CrawlCheckpoint("hellowork", "北海道", db_name=db_path)
+        assert checkpoint.start("abc") == 0
+        checkpoint.page_done(1)
+        checkpoint.page_done(2)
+
+        restarted = CrawlCheckpoint("hellowork", "北海道", db_name=db_path)
+        assert restarted.start("abc") == 2
+        assert [c["last_page"] for c in list_checkpoints(db_path)] == [2]
+
+    def test_restarts_when_fingerprint_changes(self, db_path):
+        """検索結果の並びが変わっていれば先頭から"""
+        from crawl_checkpoints import CrawlCheckpoint
+
+        checkpoint = CrawlCheckpoint("hellowork", "北海道", db_name=db_path)
+        checkpoint.start("abc")
+        checkpoint.page_done(3)
+
+        restarted = CrawlCheckpoint("hellowork", "北海道", db_name=db_path)
+        assert restarted.start("xyz") == 0
+        assert restarted.load() == {"last_page": 0, "fingerprint": "xyz"}
+
+    def test_claim_is_exclusive_per_search(self, db_path):
+        """同じ条件のチェックポイントは同時に1つのクロールだけが使える"""
+        from crawl_checkpoints import CrawlCheckpoint
+
+        first = CrawlCheckpoint("hellowork", "北海道", db_name=db_path)
+        second = CrawlCheckpoint("hellowork", "北海道", db_name=db_path)
+        other = CrawlCheckpoint("hellowork", "青森県", db_name=db_path)
+
+        assert first.claim()
+        try:
+            assert not second.claim()
+            assert other.claim()
+            other.release()
+        finally:
+            first.release()
+        assert second.claim()
+        second.release()
+
+    def test_writes_through_job_writer(self, db_path, monkeypatch):
+        """JobWriterを渡した場合は記録の書き込みをライターのスレッドで行う"""
+        import crawl_checkpoints
+        from crawl_checkpoints import CrawlCheckpoint
+        from job_writer import JobWriter
+
+        threads = []
+        for name in ("_upsert_checkpoint", "_delete_checkpoint"):
+            original = getattr(crawl_checkpoints, name)
+
+            def record(conn, *args, original=original):
+                threads.append(threading.current_thread().name)
+                return original(conn, *args)
+
+            monkeypatch.setattr(crawl_checkpoints, name, record)
+
+        with JobWriter(db_path) as writer:
+            checkpoint = CrawlCheckpoint("hellowork", "北海道", writer=writer)
+            checkpoint.start("abc")
+            checkpoint.page_done(1)
+            assert checkpoint.load()["last_page"] == 1
+            checkpoint.complete()
+
+        assert checkpoint.load() is None
+        assert threads == ["job-writer"] * 3
+
+    def test_separates_keywords_and_clears_on_complete(self, db_path):
+        """キーワードごとに記録し、完了したら消す"""
+        from crawl_checkpoints import CrawlCheckpoint
+
+        nurse = CrawlCheckpoint("hellowork", "北海道", "看護", db_name=db_path)
+        other = CrawlCheckpoint("hellowork", "北海道", db_name=db_path)
+        nurse.start("abc")
+        nurse.page_done(4)
+        other.start("abc")
+
+        assert other.load()["last_page"] == 0
+        nurse.complete()
+        assert nurse.load() is None
+        assert other.load() is not None
+
+
+class TestResumeCrawl:
+    """中断したクロールの再開のテスト"""
+
+    def teardown_method(self):
+        from database import close_pools
+
+        close_pools()
+
+    def _crawl(self, server):
+        from crawler import run_http_crawler
+
+        pages = []
+        result = run_http_crawler(
+            prefecture="東京都",
+            max_pages=5,
+            base_url=server.base_url,
+            politeness_delay=0,
+            on_page=lambda page, saved: pages.append(page),
+        )
+        return result, pages
+
+    def _interrupted_crawl(self, server):
+        """1ページ目を保存した後、ページ送りで失敗させる"""
+        import requests
+
+        server.fail_next = True
+        with pytest.raises(requests.HTTPError):
+            self._crawl(server)
+        server.posted.clear()
+
+    def test_resumes_after_last_completed_page(self, stand_in_server, db_path):
+        """再実行では保存済みのページを解析せずに続きから取得し、完了したら記録を消す"""
+        from crawl_checkpoints import list_checkpoints
+
+        self._interrupted_crawl(stand_in_server)
+        assert [c["last_page"] for c in list_checkpoints()] == [1]
+
+        result, pages = self._crawl(stand_in_server)
+
+        assert pages == [2]
+        assert result["count"] == 1
+        assert [t["page"] for t in result["page_timings"]] == [2]
+        assert list_checkpoints() == []
+
+    def test_jumps_with_page_number_button(self, stand_in_server, db_path):
+        """ページ番号のボタンがあれば直接目的のページへ進む"""
+        stand_in_server.page_buttons = True
+        self._interrupted_crawl(stand_in_server)
+
+        result, pages = self._crawl(stand_in_server)
+
+        assert pages == [2]
+        assert "fwListNaviBtnPageNo2" in stand_in_server.posted[1]
+        assert "fwListNaviBtnNext" not in stand_in_server.posted[1]
+
+    def test_concurrent_crawl_keeps_others_checkpoint(self, stand_in_server, db_path):
+        """同じ条件のクロールが実行中なら、その再開位置を上書き・削除せずに取得する"""
+        from crawl_checkpoints import CrawlCheckpoint, list_checkpoints
+
+        running = CrawlCheckpoint("hellowork", "東京都")
+        assert running.claim()
+        try:
+            running.start("running")
+            running.page_done(3)
+
+            result, pages = self._crawl(stand_in_server)
+        finally:
+            running.release()
+
+        assert pages == [1, 2]
+        assert [c["last_page"] for c in list_checkpoints()] == [3]
+
+    def test_restarts_when_results_changed(self, stand_in_server, db_path):
+        """1ページ目の求人の並びが変わっていれば先頭から取得し直す"""
+        self._interrupted_crawl(stand_in_server)
+        stand_in_server.first_job_no = b"13010-00009"
+
+        result, pages = self._crawl(stand_in_server)
+
+        assert pages == [1, 2]
@@ -0,0 +1,306 @@
+# backend/test/test_crawl_jobs.py
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestCrawlQueue:
+    """クロールジョブのキューのテスト"""
+
+    def setup_method(self):
+        from crawl_jobs import CrawlQueue
+
+        self.queue = CrawlQueue({"hellowork": 2, "indeed": 1})
+
+    def teardown_method(self):
+        self.queue.shutdown()
+
+    def test_runs_job_and_records_result(self):
+        """ジョブを実行し、進捗と結果を記録する"""
+
+        def run(job):
+            job.update_progress(pages=1, count=50)
+            return {"success": True, "count": 50}
+
+        job = self.queue.submit(
+            "hellowork", "prefecture", {"prefecture": "北海道"}, run
+        )
+
+        assert job.wait(timeout=5)
+        status = self.queue.get(job.id).to_dict()
+        assert status["status"] == "succeeded"
+        assert status["progress"] == {"pages": 1, "count": 50}
+        assert status["result"] == {"success": True, "count": 50}
+        assert status["params"] == {"prefecture": "北海道"}
+        assert status["started_at"] and status["finished_at"]
+
+    def test_failed_result_and_exception_mark_job_failed(self):
+        """success=Falseの結果や例外は失敗として記録する"""
+
+        def fail(job):
+            return {"success": False, "error": "タイムアウト"}
+
+        def boom(job):
+            raise RuntimeError("Chromeが起動できません")
+
+        failed = self.queue.submit("hellowork", "prefecture", {}, fail)
+        crashed = self.queue.submit("hellowork", "prefecture", {}, boom)
+        failed.wait(timeout=5)
+        crashed.wait(timeout=5)
+
+        assert failed.to_dict()["status"] == "failed"
+        assert failed.to_dict()["error"] == "タイムアウト"
+        assert crashed.to_dict()["status"] == "failed"
+        assert crashed.to_dict()["error"] == "Chromeが起動できません"
+
+    def test_limits_concurrency_per_source(self):
+        """取得元ごとの同時実行数を超えて実行しない"""
+        lock = threading.Lock()
+        running = {"hellowork": 0, "indeed": 0}
+        peak = {"hellowork": 0, "indeed": 0}
+        release = threading.Event()
+
+        def make_run(source):
+            def run(job):
+                with lock:
+                    running[source] += 1
+                    peak[source] = max(peak[source], running[source])
+                release.wait(timeout=5)
+                with lock:
+                    running[source] -= 1
+                return {"success": True}
+
+            return run
+
+        jobs = [
+            self.queue.submit(source, source, {}, make_run(source))
+            for source in ["hellowork"] * 4 + ["indeed"] * 3
+        ]
+
+        # 同時実行数分だけ実行中になり、残りは待機する
+        for _ in range(100):
+            summary = self.queue.summary()
+            if summary["running"] == 3:
+                break
+            threading.Event().wait(0.01)
+        assert summary["running"] == 3
+        assert summary["queued"] == 4
+        assert summary["is_running"] is True
+
+        release.set()
+        for job in jobs:
+            assert job.wait(timeout=5)
+
+        assert peak == {"hellowork": 2, "indeed": 1}
+        assert self.queue.summary()["is_running"] is False
+
+    def test_same_search_is_not_run_twice(self, monkeypatch):
+        """同じ都道府県・キーワードのクロールが待機中・実行中なら、そのジョブを返す"""
+        import crawler
+        from crawl_jobs import CrawlJobConflict, submit_prefecture_crawl
+
+        release = threading.Event()
+
+        def slow_run_crawler(**kwargs):
+            release.wait(timeout=5)
+            return {"success": True, "count": 0}
+
+        monkeypatch.setattr(crawler, "run_crawler", slow_run_crawler)
+
+        first = submit_prefecture_crawl("北海道", queue=self.queue)
+        again = submit_prefecture_crawl("北海道", queue=self.queue)
+        other = submit_prefecture_crawl("北海道", keyword="看護", queue=self.queue)
+
+        assert again is first
+        assert other is not first
+        # 条件が異なる場合は黙って既存のジョブを返さない
+        with pytest.raises(CrawlJobConflict) as conflict:
+            submit_prefecture_crawl("北海道", max_pages=3, queue=self.queue)
+        assert conflict.value.job is first
+
+        release.set()
+        assert first.wait(timeout=5) and other.wait(timeout=5)
+        # 終了後は新しいジョブとして登録する
+        assert submit_prefecture_crawl("北海道", queue=self.queue) is not first
+
+    def test_summary_includes_region_progress(self):
+        """全体の状態に地域一括収集の都道府県ごとの進捗を含める（従来の形式）"""
+        assert self.queue.summary()["progress"] is None
+        states = {"北海道": {"status": "done", "pages": 1, "count": 5, "error": None}}
+
+        def run(job):
+            job.update_progress(prefectures=states, done=1, count=5)
+            return {"success": True, "count": 5}
+
+        self.queue.submit("hellowork", "prefecture", {}, lambda j: {}).wait(timeout=5)
+        self.queue.submit("hellowork", "region", {}, run).wait(timeout=5)
+
+        assert self.queue.summary()["progress"] == states
+
+    def test_prunes_old_finished_jobs(self):
+        """終了したジョブは上限件数まで保持する"""
+        from crawl_jobs import CrawlQueue
+
+        queue = CrawlQueue({"hellowork": 1}, max_finished=2)
+        try:
+            jobs = []
+            for i in range(4):
+                job = queue.submit("hellowork", "prefecture", {"i": i}, lambda j: {})
+                job.wait(timeout=5)
+                jobs.append(job)
+            queue.submit("hellowork", "prefecture", {}, lambda j: {}).wait(timeout=5)
+
+            remaining = [job.params.get("i") for job in queue.jobs()]
+            # 登録時に、終了済みのジョブを新しい2件まで残す
+            assert remaining == [2, 3, None]
+            assert queue.get(jobs[0].id) is None
+        finally:
+            queue.shutdown()
+
+
+@pytest.fixture
+def crawl_queue(monkeypatch):
+    """テストごとに専用のキューを使う（他のテストのクロールを待たない）"""
+    import crawl_jobs
+    import routes.crawler
+    from crawl_jobs import CrawlQueue
+
+    queue = CrawlQueue()
+    monkeypatch.setattr(crawl_jobs, "crawl_queue", queue)
+    monkeypatch.setattr(routes.crawler, "crawl_queue", queue)
+    yield queue
+    queue.shutdown()
+
+
+class TestCrawlJobAPI:
+    """クロールジョブのAPIのテスト"""
+
+    def test_crawl_returns_job_id_and_status(self, monkeypatch, crawl_queue):
+        """POSTでジョブIDを返し、状態APIで進捗と結果を取得できる"""
+        import crawler
+        from app import app
+
+        def fake_run_crawler(on_page=None, **kwargs):
+            on_page(1, {"inserted": 30})
+            on_page(2, {"inserted": 20})
+            return {"success": True, "count": 50, "page_timings": []}
+
+        monkeypatch.setattr(crawler, "run_crawler", fake_run_crawler)
+        client = app.test_client()
+
+        response = client.post(
+            "/api/crawl", json={"prefecture": "大阪府", "max_pages": 2}
+        )
+        assert response.status_code == 202
+        body = response.get_json()
+        assert body["status"] == "queued"
+
+        crawl_queue.get(body["job_id"]).wait(timeout=5)
+        status = client.get(body["status_url"]).get_json()
+
+        assert status["id"] == body["job_id"]
+        assert status["status"] == "succeeded"
+        assert status["params"]["prefecture"] == "大阪府"
+        assert status["progress"] == {"pages": 2, "count": 50}
+        assert status["result"]["count"] == 50
+
+        jobs = client.get("/api/crawl/jobs").get_json()
+        assert jobs[0]["id"] == body["job_id"]
+
+    def test_multiple_crawls_are_queued(self, monkeypatch, crawl_queue):
+        """実行中でも拒否せずにジョブとして受け付ける"""
+        import crawler
+        from app import app
+
+        release = threading.Event()
+
+        def slow_run_crawler(**kwargs):
+            release.wait(timeout=5)
+            return {"success": True, "count": 0}
+
+        monkeypatch.setattr(crawler, "run_crawler", slow_run_crawler)
+        client = app.test_client()
+
+        responses = [
+            client.post("/api/crawl", json={"prefecture": pref})
+            for pref in ["北海道", "青森県", "岩手県"]
+        ]
+        assert [r.status_code for r in responses] == [202, 202, 202]
+        assert len({r.get_json()["job_id"] for r in responses}) == 3
+        assert client.get("/api/crawl/status").get_json()["is_running"] is True
+
+        release.set()
+        for r in responses:
+            assert crawl_queue.get(r.get_json()["job_id"]).wait(timeout=5)
+
+    def test_conflicting_crawl_returns_409(self, monkeypatch, crawl_queue):
+        """同じ都道府県のクロールが別の条件で実行中なら409で既存のジョブを返す"""
+        import crawler
+        from app import app
+
+        release = threading.Event()
+
+        def slow_run_crawler(**kwargs):
+            release.wait(timeout=5)
+            return {"success": True, "count": 0}
+
+        monkeypatch.setattr(crawler, "run_crawler", slow_run_crawler)
+        client = app.test_client()
+
+        try:
+            first = client.post("/api/crawl", json={"prefecture": "北海道"})
+            same = client.post("/api/crawl", json={"prefecture": "北海道"})
+            forced = client.post(
+                "/api/crawl", json={"prefecture": "北海道", "force": True}
+            )
+        finally:
+            release.set()
+
+        assert same.status_code == 202
+        assert same.get_json()["job_id"] == first.get_json()["job_id"]
+        assert "通常モード" in same.get_json()["message"]
+        assert forced.status_code == 409
+        body = forced.get_json()
+        assert body["job_id"] == first.get_json()["job_id"]
+        assert body["params"]["force"] is False
+        assert crawl_queue.get(body["job_id"]).wait(timeout=5)
+
+    def test_unknown_job_returns_404(self):
+        """存在しないジョブIDは404"""
+        from app import app
+
+        response = app.test_client().get("/api/crawl/status/unknown")
+
+        assert response.status_code == 404
+
+    def test_region_workers_are_validated(self, monkeypatch, crawl_queue):
+        """workersは整数に変換して都道府県数までに収め、不正な値は400"""
+        import region_crawler
+        from app import app
+
+        calls = []
+
+        def fake_crawl_prefectures(prefectures, workers=None, **kwargs):
+            calls.append(workers)
+            return {"success": True, "count": 0}
+
+        monkeypatch.setattr(region_crawler, "crawl_prefectures", fake_crawl_prefectures)
+        client = app.test_client()
+
+        for workers in ["4", 0, -1, 100]:
+            response = client.post(
+                "/api/crawl/region", json={"region": "kanto", "workers": workers}
+            )
+            assert response.status_code == 202
+            crawl_queue.get(response.get_json()["job_id"]).wait(timeout=5)
+        assert calls == [4, 1, 1, len(response.get_json()["prefectures"])]
+
+        for workers in ["many", [2], {"n": 2}]:
+            response = client.post(
+                "/api/crawl/region", json={"region": "kanto", "workers": workers}
+            )
+            assert response.status_code == 400
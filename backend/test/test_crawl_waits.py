@@ -0,0 +1,185 @@
+# backend/test/test_crawl_waits.py
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeClock:
+    """テスト用の時計（sleepすると時刻が進む）"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestPolitenessDelay:
+    """アクセス間隔の制御のテスト"""
+
+    def test_first_access_does_not_wait(self):
+        """最初のアクセスは待たない"""
+        from crawl_waits import PolitenessDelay
+
+        clock = FakeClock()
+        delay = PolitenessDelay(2.0, clock=clock, sleep=clock.sleep)
+
+        delay.wait()
+
+        assert clock.slept == []
+
+    def test_waits_only_remaining_interval(self):
+        """前回から経過した分を差し引いて待つ"""
+        from crawl_waits import PolitenessDelay
+
+        clock = FakeClock()
+        delay = PolitenessDelay(2.0, clock=clock, sleep=clock.sleep)
+
+        delay.wait()
+        clock.now += 0.5  # ページの読み込み・解析に0.5秒
+        delay.wait()
+        clock.now += 3.0  # 最小間隔より長くかかった場合は待たない
+        delay.wait()
+
+        assert clock.slept == [pytest.approx(1.5)]
+
+    def test_zero_interval_never_waits(self):
+        """最小間隔0なら待たない"""
+        from crawl_waits import PolitenessDelay
+
+        clock = FakeClock()
+        delay = PolitenessDelay(0, clock=clock, sleep=clock.sleep)
+
+        delay.wait()
+        delay.wait()
+
+        assert clock.slept == []
+
+
+class TestPageTimer:
+    """ページごとの所要時間の記録のテスト"""
+
+    def test_records_load_and_process_time(self):
+        """読み込み待ちと解析・保存の時間を分けて記録する"""
+        from crawl_waits import PageTimer
+
+        clock = FakeClock()
+        timer = PageTimer(clock=clock)
+
+        for page, (load, process) in enumerate([(1.5, 0.25), (0.75, 0.5)], start=1):
+            timer.start_page(page)
+            clock.now += load
+            timer.loaded()
+            clock.now += process
+            timer.finish_page()
+
+        assert timer.pages == [
+            {
+                "page": 1,
+                "load_seconds": 1.5,
+                "process_seconds": 0.25,
+                "total_seconds": 1.75,
+            },
+            {
+                "page": 2,
+                "load_seconds": 0.75,
+                "process_seconds": 0.5,
+                "total_seconds": 1.25,
+            },
+        ]
+        assert timer.summary() == {
+            "pages": 2,
+            "load_seconds": 2.25,
+            "process_seconds": 0.75,
+            "total_seconds": 3.0,
+        }
+
+
+class TestWaitForPageChange:
+    """画面遷移の待機のテスト"""
+
+    def test_returns_once_old_element_is_stale(self):
+        """遷移前の要素が破棄され、読み込みが完了したら戻る"""
+        from selenium.common.exceptions import StaleElementReferenceException
+        from crawl_waits import wait_for_page_change
+
+        class FakeElement:
+            checks = 0
+
+            def is_enabled(self):
+                FakeElement.checks += 1
+                if FakeElement.checks >= 3:
+                    raise StaleElementReferenceException()
+                return True
+
+        class FakeDriver:
+            def execute_script(self, script):
+                return "complete"
+
+        wait_for_page_change(FakeDriver(), FakeElement(), timeout=5)
+
+        assert FakeElement.checks == 3
+
+    def test_times_out_when_page_does_not_change(self):
+        """遷移しなければタイムアウトする"""
+        from selenium.common.exceptions import TimeoutException
+        from crawl_waits import wait_for_page_change
+
+        class FakeElement:
+            def is_enabled(self):
+                return True
+
+        class FakeDriver:
+            def execute_script(self, script):
+                return "complete"
+
+        with pytest.raises(TimeoutException):
+            wait_for_page_change(FakeDriver(), FakeElement(), timeout=0.3)
+
+
+class TestWaitForCountToSettle:
+    """遅延読み込みの待機のテスト"""
+
+    def test_waits_until_count_stops_growing(self):
+        """要素の数が増えている間は待ち、増えなくなったらその数を返す"""
+        from crawl_waits import wait_for_count_to_settle
+
+        class FakeDriver:
+            counts = [10, 10, 15, 20]
+            calls = 0
+
+            def find_elements(self, by, value):
+                FakeDriver.calls += 1
+                return [None] * self.counts[min(FakeDriver.calls, 4) - 1]
+
+        count = wait_for_count_to_settle(
+            FakeDriver(), ("css selector", ".card"), settle=0.1, timeout=5, poll=0.01
+        )
+
+        assert count == 20
+        assert FakeDriver.calls > 4
+
+    def test_keeps_loaded_cards_on_timeout(self):
+        """タイムアウトまで増え続けても例外にせず、最後に数えた数を返す"""
+        from crawl_waits import wait_for_count_to_settle
+
+        class FakeDriver:
+            calls = 0
+
+            def find_elements(self, by, value):
+                FakeDriver.calls += 1
+                return [None] * FakeDriver.calls
+
+        count = wait_for_count_to_settle(
+            FakeDriver(), ("css selector", ".card"), settle=0.1, timeout=0.3, poll=0.01
+        )
+
+        assert count == FakeDriver.calls
@@ -81,6 +81,680 @@ class TestDatabaseAccumulation:
         conn.close()
 
 
+class TestPrefectureColumn:
+    """都道府県カラム（取り込み時の正規化）のテスト"""
+
+    def setup_method(self):
+        self.test_db = "test_prefecture.db"
+        if os.path.exists(self.test_db):
+            os.remove(self.test_db)
+
+    def teardown_method(self):
+        from database import close_pools
+
+        close_pools()
+        if os.path.exists(self.test_db):
+            os.remove(self.test_db)
+
+    def test_save_job_fills_prefecture(self):
+        """保存時にlocationから都道府県とコードが埋まる"""
+        from database import init_db_with_path, save_job_to_db
+
+        init_db_with_path(self.test_db)
+        conn = sqlite3.connect(self.test_db)
+        save_job_to_db(
+            conn, ("職種", 200000, 0, "monthly", "会社", "大阪市北区", "", "その他")
+        )
+        row = conn.execute("SELECT prefecture, prefecture_code FROM jobs").fetchone()
+        conn.close()
+
+        assert row == ("大阪府", "27")
+
+    def test_migration_backfills_existing_rows(self):
+        """旧スキーマのDBは蓄積モードの初期化でバックフィルされる"""
+        from database import init_db_with_path, search_jobs, get_location_stats
+
+        conn = sqlite3.connect(self.test_db)
+        conn.execute(
+            """
+            CREATE TABLE jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT, wage_min INTEGER, wage_max INTEGER, wage_type TEXT,
+                company TEXT, location TEXT, url TEXT, industry TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+        conn.executemany(
+            "INSERT INTO jobs (title, company, location) VALUES (?, ?, ?)",
+            [
+                ("A", "a社", "東京都渋谷区"),
+                ("B", "b社", "東京都港区"),
+                ("C", "c社", "京都市中京区"),
+                ("D", "d社", "不明"),
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        init_db_with_path(self.test_db, reset=False)
+
+        conn = sqlite3.connect(self.test_db)
+        rows = conn.execute("SELECT prefecture FROM jobs ORDER BY id").fetchall()
+        indexes = [row[1] for row in conn.execute("PRAGMA index_list(jobs)")]
+        conn.close()
+
+        assert [r[0] for r in rows] == ["東京都", "東京都", "京都府", None]
+        assert "idx_jobs_prefecture_industry" in indexes
+        assert len(search_jobs(location="東京", db_name=self.test_db)) == 2
+        assert len(search_jobs(location="京都府", db_name=self.test_db)) == 1
+        assert get_location_stats(self.test_db)[0] == {"location": "東京都", "count": 2}
+
+    def test_backfill_bumps_data_version(self):
+        """都道府県を埋めた行があれば分析結果のキャッシュが古くなるよう連番を進める"""
+        from database import backfill_prefectures, get_data_version, init_db_with_path
+
+        init_db_with_path(self.test_db)
+        conn = sqlite3.connect(self.test_db)
+        conn.execute(
+            "INSERT INTO jobs (title, company, location) VALUES ('A', 'a社', '大阪市北区')"
+        )
+        conn.commit()
+        version = get_data_version(self.test_db)
+
+        assert backfill_prefectures(conn) == 1
+        assert get_data_version(self.test_db) == version + 1
+        assert backfill_prefectures(conn) == 0
+        assert get_data_version(self.test_db) == version + 1
+        conn.close()
+
+
+class TestBulkInsert:
+    """一括保存（save_jobs_bulk）のテスト"""
+
+    def teardown_method(self):
+        from database import close_pools
+
+        close_pools()
+
+    def test_bulk_insert_counts_and_dedupes(self, tmp_path):
+        """DB内・バッチ内の重複をスキップして件数を返す"""
+        from database import init_db_with_path, save_job_to_db, save_jobs_bulk
+
+        db_path = str(tmp_path / "bulk.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        save_job_to_db(conn, ("既存", 200000, 0, "monthly", "A社", "東京都", ""))
+
+        rows = [
+            ("既存", 210000, 0, "monthly", "A社", "東京都", "", "その他"),
+            ("新規1", 220000, 0, "monthly", "B社", "大阪府", "", "その他"),
+            ("新規1", 220000, 0, "monthly", "B社", "大阪府", "", "その他"),
+            ("新規2", 1200, 0, "hourly", "C社", "札幌市", "", "その他", "北海道"),
+        ]
+        result = save_jobs_bulk(conn, rows)
+
+        assert result == {"inserted": 2, "skipped": 2, "updated": 0}
+        saved = conn.execute(
+            "SELECT title, prefecture FROM jobs ORDER BY id"
+        ).fetchall()
+        conn.close()
+        assert saved == [("既存", "東京都"), ("新規1", "大阪府"), ("新規2", "北海道")]
+
+    def test_bulk_insert_without_dedupe_updates_existing(self, tmp_path):
+        """dedupe=Falseでは重複行を最新の内容で更新する"""
+        from database import init_db_with_path, save_jobs_bulk
+
+        db_path = str(tmp_path / "bulk.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        save_jobs_bulk(conn, [("同じ", 200000, 0, "monthly", "A社", "東京都", "")])
+
+        result = save_jobs_bulk(
+            conn,
+            [
+                ("同じ", 250000, 0, "monthly", "A社", "東京都", ""),
+                ("新規", 300000, 0, "monthly", "B社", "東京都", ""),
+            ],
+            dedupe=False,
+        )
+        rows = conn.execute("SELECT title, wage_min FROM jobs ORDER BY id").fetchall()
+        conn.close()
+
+        assert result == {"inserted": 1, "skipped": 0, "updated": 1}
+        assert rows == [("同じ", 250000), ("新規", 300000)]
+
+    def test_bulk_insert_empty(self, tmp_path):
+        """空リストでもエラーにならない"""
+        from database import init_db_with_path, save_jobs_bulk
+
+        db_path = str(tmp_path / "bulk.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+
+        assert save_jobs_bulk(conn, []) == {"inserted": 0, "skipped": 0, "updated": 0}
+        conn.close()
+
+
+class TestDedupKey:
+    """重複判定キー（dedup_key）のテスト"""
+
+    def test_dedup_key_normalizes_text(self):
+        """全角半角・大文字小文字・空白の揺れは同じキーになる"""
+        from database import make_dedup_key
+
+        assert make_dedup_key("ＳＥ　募集", "ABC株式会社") == make_dedup_key(
+            "se 募集", " abc株式会社 "
+        )
+        assert make_dedup_key("SE", "A社") != make_dedup_key("SE", "B社")
+
+    def test_save_if_not_duplicate_uses_unique_key(self, tmp_path):
+        """正規化後に同じ求人は2件目が保存されない"""
+        from database import init_db_with_path, save_job_if_not_duplicate
+
+        db_path = str(tmp_path / "dedup.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+
+        assert save_job_if_not_duplicate(
+            conn, ("ＳＥ", 200000, 0, "monthly", "A社", "東京都", "")
+        )
+        assert not save_job_if_not_duplicate(
+            conn, ("SE", 200000, 0, "monthly", "A社", "東京都", "")
+        )
+        count = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        conn.close()
+
+        assert count == 1
+
+    def test_migration_folds_existing_duplicates(self, tmp_path):
+        """既存DBの重複行は最も古い1件に統合され、ユニークインデックスが作られる"""
+        from database import init_db_with_path
+
+        db_path = str(tmp_path / "dedup.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            """
+            CREATE TABLE jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT, wage_min INTEGER, wage_max INTEGER, wage_type TEXT,
+                company TEXT, location TEXT, url TEXT, industry TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+        conn.executemany(
+            "INSERT INTO jobs (title, company, wage_min) VALUES (?, ?, ?)",
+            [("SE", "A社", 1), ("SE", "A社", 2), ("ＳＥ", "A社", 3), ("PG", "A社", 4)],
+        )
+        conn.commit()
+        conn.close()
+
+        init_db_with_path(db_path, reset=False)
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT title, wage_min FROM jobs ORDER BY id").fetchall()
+        unique = [
+            row[2]
+            for row in conn.execute("PRAGMA index_list(jobs)")
+            if row[1] == "idx_jobs_dedup_key"
+        ]
+        conn.close()
+
+        assert rows == [("SE", 1), ("PG", 4)]
+        assert unique == [1]
+
+    def test_folding_duplicates_bumps_data_version(self, tmp_path):
+        """重複の統合で行を削除したら分析結果のキャッシュが古くなるよう連番を進める"""
+        from database import fold_duplicate_jobs, get_data_version, init_db_with_path
+
+        db_path = str(tmp_path / "fold.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP INDEX idx_jobs_dedup_key")
+        conn.executemany(
+            "INSERT INTO jobs (title, company, dedup_key) VALUES (?, ?, ?)",
+            [("SE", "A社", "k1"), ("SE", "A社", "k1"), ("PG", "A社", "k2")],
+        )
+        conn.commit()
+        version = get_data_version(db_path)
+
+        assert fold_duplicate_jobs(conn) == 1
+        assert get_data_version(db_path) == version + 1
+        assert fold_duplicate_jobs(conn) == 0
+        assert get_data_version(db_path) == version + 1
+        conn.close()
+
+
+class TestWageMonthlyEquiv:
+    """月給換算の給与（wage_monthly_equiv）のテスト"""
+
+    def setup_method(self):
+        import database
+
+        self.saved_factors = dict(database.WAGE_MONTHLY_FACTORS)
+
+    def teardown_method(self):
+        import database
+
+        database.WAGE_MONTHLY_FACTORS.clear()
+        database.WAGE_MONTHLY_FACTORS.update(self.saved_factors)
+        database.close_pools()
+
+    def _equivs(self, db_path):
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute(
+            "SELECT title, wage_monthly_equiv FROM jobs ORDER BY id"
+        ).fetchall()
+        conn.close()
+        return rows
+
+    def test_saved_with_monthly_equivalent(self, tmp_path):
+        """保存時に時給・日給・年収を月給に換算して保存する"""
+        from database import init_db_with_path, save_jobs_bulk, search_jobs
+
+        db_path = str(tmp_path / "wage.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        save_jobs_bulk(
+            conn,
+            [
+                ("月給", 250000, 0, "monthly", "A社", "東京都", ""),
+                ("時給", 1200, 0, "hourly", "B社", "東京都", ""),
+                ("日給", 10000, 0, "daily", "C社", "東京都", ""),
+                ("年収", 4800000, 0, "annual", "D社", "東京都", ""),
+                ("不明", None, None, "monthly", "E社", "東京都", ""),
+            ],
+        )
+        conn.close()
+
+        assert self._equivs(db_path) == [
+            ("月給", 250000),
+            ("時給", 192000),
+            ("日給", 200000),
+            ("年収", 400000),
+            ("不明", None),
+        ]
+        jobs = search_jobs(
+            monthly_wage_min=200000, monthly_wage_max=300000, db_name=db_path
+        )
+        assert {job["title"] for job in jobs} == {"月給", "日給"}
+
+    def test_migration_and_factor_change(self, tmp_path):
+        """既存DBは移行時に埋め、倍率を変えたら計算し直して集計にも反映する"""
+        import database
+
+        db_path = str(tmp_path / "wage.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            """
+            CREATE TABLE jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT, wage_min INTEGER, wage_max INTEGER, wage_type TEXT,
+                company TEXT, location TEXT, url TEXT, industry TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+        conn.execute(
+            "INSERT INTO jobs (title, company, wage_min, wage_type, industry) "
+            "VALUES ('日給', 'A社', 10000, 'daily', '建設・工事')"
+        )
+        conn.commit()
+        conn.close()
+
+        database.init_db_with_path(db_path, reset=False)
+        assert self._equivs(db_path) == [("日給", 200000)]
+
+        database.WAGE_MONTHLY_FACTORS["daily"] = 22
+        conn = sqlite3.connect(db_path)
+        assert database.backfill_wage_monthly_equiv(conn) == 1
+        conn.close()
+
+        assert self._equivs(db_path) == [("日給", 220000)]
+        comparison = database.get_industry_comparison(db_path)
+        assert comparison[0]["avg_wage"] == 220000
+
+
+class TestConnectionPool:
+    """接続プールのテスト"""
+
+    def setup_method(self):
+        import database
+
+        self.saved_settings = (database.POOL_SIZE, dict(database.PRAGMAS))
+
+    def teardown_method(self):
+        from database import configure_pool
+
+        size, pragmas = self.saved_settings
+        configure_pool(size=size, pragmas=pragmas)
+
+    def test_same_thread_reuses_connection(self, tmp_path):
+        """返却した接続は次の取得で再利用される"""
+        from database import get_connection
+
+        db_path = str(tmp_path / "pool.db")
+        conn1 = get_connection(db_path)
+        conn1.close()
+        conn2 = get_connection(db_path)
+        conn2.close()
+
+        assert conn1 is conn2
+
+    def test_nested_acquire_returns_leased_connection(self, tmp_path):
+        """同じスレッドで貸出中なら同じ接続を返す"""
+        from database import get_connection
+
+        db_path = str(tmp_path / "pool.db")
+        outer = get_connection(db_path)
+        inner = get_connection(db_path)
+        inner.close()
+
+        assert inner is outer
+        # 外側の接続はまだ使える
+        assert outer.execute("SELECT 1").fetchone()[0] == 1
+        outer.close()
+
+    def test_threads_get_separate_connections(self, tmp_path):
+        """別スレッドで同時に使う場合は別の接続になる"""
+        import threading
+        from database import get_connection
+
+        db_path = str(tmp_path / "pool.db")
+        main_conn = get_connection(db_path)
+        other = {}
+
+        def worker():
+            conn = get_connection(db_path)
+            other["conn"] = conn
+            conn.close()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        main_conn.close()
+
+        assert other["conn"] is not main_conn
+
+    def test_pool_size_and_pragmas_are_configurable(self, tmp_path):
+        """プールサイズとPRAGMAを設定できる"""
+        from database import configure_pool, get_connection, get_pool
+
+        configure_pool(size=0, pragmas={"cache_size": -4000})
+        db_path = str(tmp_path / "pool.db")
+        conn = get_connection(db_path)
+        cache_size = conn.execute("PRAGMA cache_size").fetchone()[0]
+        conn.close()
+
+        assert cache_size == -4000
+        # サイズ0ではアイドル接続を保持しない
+        assert get_pool(db_path)._idle == []
+
+
+class TestConcurrentAccess:
+    """WALモードでの同時読み書きのテスト"""
+
+    def teardown_method(self):
+        from database import close_pools
+
+        close_pools()
+
+    def test_init_db_enables_wal(self, tmp_path):
+        """初期化でWALモードになる"""
+        from database import init_db_with_path, get_connection
+
+        db_path = str(tmp_path / "wal.db")
+        init_db_with_path(db_path)
+        conn = get_connection(db_path)
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+
+        assert mode == "wal"
+
+    def test_readers_do_not_wait_for_writer(self, tmp_path):
+        """書き込みトランザクション中でも読み取りはロック待ちにならない"""
+        import threading
+        from database import (
+            init_db_with_path,
+            get_connection,
+            save_job_to_db,
+            search_jobs,
+            get_industry_stats,
+        )
+
+        db_path = str(tmp_path / "wal.db")
+        init_db_with_path(db_path)
+        conn = get_connection(db_path)
+        save_job_to_db(
+            conn, ("既存", 200000, 0, "monthly", "会社", "東京都", "", "その他")
+        )
+        conn.close()
+
+        writer_in_txn = threading.Event()
+        readers_done = threading.Event()
+        errors = []
+        reader_counts = []
+
+        def writer():
+            conn = get_connection(db_path)
+            try:
+                conn.execute("BEGIN EXCLUSIVE")
+                for i in range(200):
+                    conn.execute(
+                        "INSERT INTO jobs (title, company) VALUES (?, ?)",
+                        (f"新規{i}", "会社"),
+                    )
+                writer_in_txn.set()
+                # 読み取り側が終わるまでトランザクションを保持し続ける
+                readers_done.wait(timeout=10)
+                conn.commit()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                conn.close()
+
+        def reader():
+            try:
+                writer_in_txn.wait(timeout=10)
+                for _ in range(20):
+                    reader_counts.append(len(search_jobs(db_name=db_path)))
+                    get_industry_stats(db_path)
+            except Exception as e:
+                errors.append(e)
+
+        writer_thread = threading.Thread(target=writer)
+        reader_threads = [threading.Thread(target=reader) for _ in range(4)]
+        writer_thread.start()
+        for thread in reader_threads:
+            thread.start()
+        for thread in reader_threads:
+            thread.join(timeout=10)
+        readers_done.set()
+        writer_thread.join(timeout=10)
+
+        assert errors == []
+        # 読み取り側はコミット前のスナップショットを見る
+        assert reader_counts and set(reader_counts) == {1}
+        assert len(search_jobs(db_name=db_path)) == 201
+
+
+class TestFullTextSearch:
+    """全文検索インデックス（jobs_fts）のテスト"""
+
+    def teardown_method(self):
+        from database import close_pools
+
+        close_pools()
+
+    def _setup_db(self, tmp_path):
+        from database import init_db_with_path, save_jobs_bulk
+
+        db_path = str(tmp_path / "fts.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        save_jobs_bulk(
+            conn,
+            [
+                ("介護スタッフ", 200000, 0, "monthly", "ケア株式会社", "東京都", ""),
+                ("事務員", 210000, 0, "monthly", "介護スタッフ派遣社", "東京都", ""),
+                ("倉庫作業", 1200, 0, "hourly", "物流会社", "大阪府", ""),
+            ],
+        )
+        conn.close()
+        return db_path
+
+    def test_keyword_search_uses_fts_and_ranks_title_first(self, tmp_path):
+        """3文字以上のキーワードは全文検索で探し、タイトル一致を上位にする"""
+        from database import search_jobs
+
+        db_path = self._setup_db(tmp_path)
+
+        jobs = search_jobs(keyword="介護スタッフ", db_name=db_path)
+        assert [job["title"] for job in jobs] == ["介護スタッフ", "事務員"]
+
+        jobs = search_jobs(keyword="介護スタ", location="大阪府", db_name=db_path)
+        assert jobs == []
+
+    def test_short_keyword_falls_back_to_like(self, tmp_path):
+        """2文字以下のキーワードは部分一致検索で探す"""
+        from database import search_jobs
+
+        db_path = self._setup_db(tmp_path)
+
+        jobs = search_jobs(keyword="倉庫", db_name=db_path)
+        assert [job["title"] for job in jobs] == ["倉庫作業"]
+
+    def test_index_follows_updates_and_deletes(self, tmp_path):
+        """求人の更新・削除がトリガーでインデックスに反映される"""
+        from database import get_jobs_page, save_jobs_bulk, search_jobs
+
+        db_path = self._setup_db(tmp_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE jobs SET company = '運送会社' WHERE title = '倉庫作業'")
+        conn.execute("DELETE FROM jobs WHERE title = '事務員'")
+        conn.commit()
+        save_jobs_bulk(
+            conn,
+            [("介護スタッフ", 230000, 0, "monthly", "ケア株式会社", "東京都", "")],
+            dedupe=False,
+        )
+        conn.close()
+
+        assert search_jobs(keyword="物流会社", db_name=db_path) == []
+        assert len(search_jobs(keyword="運送会社", db_name=db_path)) == 1
+        page = get_jobs_page(keyword="介護スタッフ", db_name=db_path)
+        assert [job["wage_min"] for job in page["items"]] == [230000]
+
+    def test_migration_builds_index_for_existing_rows(self, tmp_path):
+        """既存DBにも移行時に索引が作られる"""
+        from database import init_db_with_path, search_jobs
+
+        db_path = self._setup_db(tmp_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE jobs_fts")
+        conn.commit()
+        conn.close()
+
+        init_db_with_path(db_path, reset=False)
+
+        assert len(search_jobs(keyword="倉庫作業", db_name=db_path)) == 1
+
+
+class TestQueryPlans:
+    """分析・検索クエリがテーブルの全件走査にならないことを確認する"""
+
+    def teardown_method(self):
+        from database import close_pools
+
+        close_pools()
+
+    def _full_scans(self, db_path, helper, *args, **kwargs):
+        """helperが発行したSELECTのうち、インデックスを使わずにjobsを走査するものを返す"""
+        from database import get_connection
+
+        # 同じスレッドで借りている接続はhelperの中でもそのまま使われる
+        conn = get_connection(db_path)
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            helper(*args, **kwargs)
+        finally:
+            conn.set_trace_callback(None)
+
+        scans = []
+        selects = [
+            sql for sql in statements if sql.lstrip().upper().startswith("SELECT")
+        ]
+        for sql in selects:
+            for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+                if row[3].startswith("SCAN jobs") and "INDEX" not in row[3]:
+                    scans.append((sql, row[3]))
+        conn.close()
+        assert selects, f"{helper.__name__} がSELECTを発行していません"
+        return scans
+
+    def test_analysis_queries_use_indexes(self, tmp_path):
+        """分析用の関数はすべてインデックスを使う"""
+        import database
+
+        db_path = str(tmp_path / "plan.db")
+        database.init_db_with_path(db_path)
+
+        helpers = [
+            database.get_industry_stats,
+            database.get_location_stats,
+            database.get_industry_ranking,
+            database.get_hot_industries,
+            database.get_salary_trend,
+            database.get_industry_comparison,
+            database.get_heatmap_data,
+        ]
+        for helper in helpers:
+            assert self._full_scans(db_path, helper, db_path) == []
+
+    def test_filters_use_indexes(self, tmp_path):
+        """給与形態・業界・都道府県の絞り込みはインデックスを使う"""
+        from database import get_all_jobs, init_db_with_path, search_jobs
+
+        db_path = str(tmp_path / "plan.db")
+        init_db_with_path(db_path)
+
+        assert self._full_scans(db_path, get_all_jobs, db_path, "hourly") == []
+        for filters in [
+            {"industry": "介護・福祉"},
+            {"location": "東京都"},
+        ]:
+            assert (
+                self._full_scans(db_path, search_jobs, db_name=db_path, **filters) == []
+            )
+
+    def test_migration_replaces_prefecture_index(self, tmp_path):
+        """既存DBには管理対象のインデックスが揃い、古いインデックスは削除される"""
+        from database import JOB_INDEXES, init_db_with_path
+
+        db_path = str(tmp_path / "plan.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP INDEX idx_jobs_industry_wage")
+        conn.execute("CREATE INDEX idx_jobs_prefecture ON jobs(prefecture)")
+        conn.commit()
+        conn.close()
+
+        init_db_with_path(db_path, reset=False)
+
+        conn = sqlite3.connect(db_path)
+        indexes = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'jobs'"
+            )
+        }
+        conn.close()
+        assert set(JOB_INDEXES) <= indexes
+        assert "idx_jobs_prefecture" not in indexes
+
+
 class TestStatsAPI:
     """統計情報APIのテスト"""
 
@@ -0,0 +1,97 @@
+# backend/test/test_dedup_cache.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _row(title, company):
+    return (title, 200000, 300000, "monthly", company, "東京都", "", "その他", "東京都")
+
+
+class TestDedupCache:
+    """重複判定キャッシュのテスト"""
+
+    def teardown_method(self):
+        from database import close_pools
+
+        close_pools()
+
+    def test_loads_saved_keys(self, tmp_path):
+        """DBの保存済み求人を読み込み、正規化後に同じ求人を保存済みと判定する"""
+        from database import (
+            get_connection,
+            init_db_with_path,
+            make_dedup_key,
+            save_jobs_bulk,
+        )
+        from dedup_cache import DedupCache
+
+        db_path = str(tmp_path / "dedup.db")
+        init_db_with_path(db_path)
+        conn = get_connection(db_path)
+        save_jobs_bulk(
+            conn, [_row("看護師", "医療法人A"), _row("一般事務", "株式会社B")]
+        )
+        conn.close()
+
+        cache = DedupCache.load(db_path)
+
+        assert len(cache) == 2
+        assert list(
+            cache.contains(
+                [
+                    make_dedup_key("看護師 ", "医療法人Ａ"),
+                    make_dedup_key("一般事務", "株式会社C"),
+                ]
+            )
+        ) == [True, False]
+
+    def test_filter_new_and_add(self, monkeypatch):
+        """保存済みを除いた行を返し、追加したキーは次から保存済みになる"""
+        import dedup_cache
+        from dedup_cache import DedupCache
+
+        monkeypatch.setattr(dedup_cache, "MERGE_THRESHOLD", 2)
+        cache = DedupCache()
+        rows = [_row("看護師", "A"), _row("事務", "B"), _row("倉庫", "C")]
+
+        new_rows, new_keys, known = cache.filter_new(rows[:1])
+        assert (new_rows, known) == (rows[:1], 0)
+        cache.add(new_keys)
+
+        new_rows, new_keys, known = cache.filter_new(rows)
+        assert (new_rows, known) == (rows[1:], 1)
+
+        # 件数が閾値に達したら整列済み配列に統合しても判定は変わらない
+        cache.add(new_keys)
+        assert len(cache) == 3
+        assert cache.filter_new(rows) == ([], [], 3)
+
+    def test_crawler_skips_known_jobs_without_writing(self, tmp_path, monkeypatch):
+        """保存済みだけのページはDBに書き込まずにスキップする"""
+        import database
+        from crawler import save_job_page
+        from database import get_connection, get_data_version, init_db_with_path
+        from dedup_cache import DedupCache
+
+        db_path = str(tmp_path / "crawl.db")
+        init_db_with_path(db_path)
+        monkeypatch.setattr(database, "DB_NAME", db_path)
+        with open(
+            os.path.join(
+                os.path.dirname(__file__), "fixtures", "hellowork", "result_page1.html"
+            ),
+            "rb",
+        ) as f:
+            html = f.read()
+
+        conn = get_connection()
+        first = save_job_page(conn, html, "東京都", dedup_cache=DedupCache.load())
+        version = get_data_version()
+        second = save_job_page(conn, html, "東京都", dedup_cache=DedupCache.load())
+        conn.close()
+
+        assert first["inserted"] == 2
+        assert second == {"inserted": 0, "skipped": 2, "updated": 0}
+        assert get_data_version() == version
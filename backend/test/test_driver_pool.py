@@ -0,0 +1,188 @@
+# backend/test/test_driver_pool.py
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeDriver:
+    """テスト用のドライバー（Chromeを起動しない）"""
+
+    def __init__(self, headless):
+        self.headless = headless
+        self.healthy = True
+        self.quit_called = False
+        self.cookies_cleared = 0
+        self.window_handles = ["main"]
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise RuntimeError("no such window")
+        return 1
+
+    def delete_all_cookies(self):
+        self.cookies_cleared += 1
+
+    def quit(self):
+        self.quit_called = True
+
+
+def make_pool(**kwargs):
+    from driver_pool import DriverPool
+
+    created = []
+
+    def factory(headless):
+        driver = FakeDriver(headless)
+        created.append(driver)
+        return driver
+
+    pool = DriverPool(factory=factory, **kwargs)
+    return pool, created
+
+
+class TestDriverPool:
+    """ドライバープールのテスト"""
+
+    def test_reuses_released_driver(self):
+        """返却したドライバーを次の貸し出しで使い回す"""
+        pool, created = make_pool()
+
+        with pool.lease() as lease:
+            first = lease.driver
+            lease.page_done()
+        with pool.lease() as lease:
+            second = lease.driver
+
+        assert first is second
+        assert len(created) == 1
+        assert not first.quit_called
+        assert first.cookies_cleared == 2
+        assert pool.stats["created"] == 1
+        assert pool.stats["reused"] == 1
+
+    def test_recycles_after_max_pages(self):
+        """上限ページ数に達したドライバーは終了して作り直す"""
+        pool, created = make_pool(max_pages=3)
+
+        with pool.lease() as lease:
+            lease.page_done(3)
+        with pool.lease() as lease:
+            pass
+
+        assert len(created) == 2
+        assert created[0].quit_called
+        assert pool.stats["recycled"] == 1
+
+    def test_replaces_unhealthy_driver(self):
+        """応答しないドライバーは貸し出さずに作り直す"""
+        pool, created = make_pool()
+
+        with pool.lease() as lease:
+            pass
+        created[0].healthy = False
+        with pool.lease() as lease:
+            driver = lease.driver
+
+        assert driver is created[1]
+        assert created[0].quit_called
+        assert pool.stats["unhealthy"] == 1
+
+    def test_discards_driver_on_error(self):
+        """例外が起きたドライバーは再利用しない"""
+        pool, created = make_pool()
+
+        with pytest.raises(ValueError):
+            with pool.lease():
+                raise ValueError("crawl failed")
+        with pool.lease() as lease:
+            pass
+
+        assert len(created) == 2
+        assert created[0].quit_called
+
+    def test_separates_headless_and_visible(self):
+        """表示モードが違うドライバーは使い回さない"""
+        pool, created = make_pool()
+
+        with pool.lease(headless=True):
+            pass
+        with pool.lease(headless=False) as lease:
+            assert lease.driver.headless is False
+
+        assert len(created) == 2
+
+    def test_blocks_when_pool_is_full(self):
+        """上限まで貸し出し中なら返却を待つ"""
+        pool, created = make_pool(max_size=1)
+        lease = pool.acquire()
+        acquired = []
+
+        def borrow():
+            with pool.lease() as other:
+                acquired.append(other.driver)
+
+        thread = threading.Thread(target=borrow)
+        thread.start()
+        time.sleep(0.1)
+        assert acquired == []
+
+        pool.release(lease)
+        thread.join(timeout=2)
+
+        assert acquired == [created[0]]
+        with pytest.raises(TimeoutError):
+            held = pool.acquire()
+            try:
+                pool.acquire(timeout=0.05)
+            finally:
+                pool.release(held)
+
+    def test_reaps_idle_drivers(self):
+        """使われていないドライバーを終了する"""
+        pool, created = make_pool(idle_timeout=0)
+
+        with pool.lease():
+            pass
+
+        assert pool.reap_idle() == 1
+        assert created[0].quit_called
+
+    def test_close_quits_idle_drivers(self):
+        """closeで待機中のドライバーを終了する"""
+        pool, created = make_pool()
+
+        with pool.lease():
+            pass
+        pool.close()
+
+        assert created[0].quit_called
+
+
+class TestResolveChromedriverPath:
+    """ドライバーのバイナリ解決のテスト"""
+
+    def test_resolves_once_per_process(self, monkeypatch):
+        """ChromeDriverManager().install()は1回だけ呼ぶ"""
+        import driver_pool
+
+        calls = []
+
+        class FakeManager:
+            def install(self):
+                calls.append(1)
+                return "/usr/bin/chromedriver"
+
+        monkeypatch.setattr(driver_pool, "ChromeDriverManager", FakeManager)
+        driver_pool.resolve_chromedriver_path.cache_clear()
+        try:
+            paths = {driver_pool.resolve_chromedriver_path() for _ in range(5)}
+        finally:
+            driver_pool.resolve_chromedriver_path.cache_clear()
+
+        assert paths == {"/usr/bin/chromedriver"}
+        assert len(calls) == 1
@@ -0,0 +1,237 @@
+# backend/test/test_hellowork_http.py
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestFormData:
+    """フォーム送信データの組み立てのテスト"""
+
+    def test_serializes_like_browser(self, read_fixture):
+        """hidden・選択済みの項目と押したボタンだけを送る"""
+        from bs4 import BeautifulSoup
+        from hellowork_http import form_data
+
+        soup = BeautifulSoup(read_fixture("search_form.html"), "html.parser")
+        form = soup.find("form")
+
+        data = form_data(form, submit=soup.find(id="ID_searchBtn"))
+
+        assert data == [
+            ("screenId", "GECA110010"),
+            ("action", ""),
+            ("preCheckFlg", ""),
+            ("kjKbnRadioBtn", "1"),
+            ("ippanCKBox", "1"),
+            ("tDFK1CmbBox", ""),
+            ("sortCmbBox", "1"),
+            ("freeWordInput", ""),
+            ("searchBtn", "検索"),
+        ]
+
+
+class TestHelloWorkHttpFetcher:
+    """HTTPでの検索結果ページ取得のテスト"""
+
+    def test_replays_search_and_pagination(self, stand_in_server):
+        """検索フォームを都道府県付きで送信し、「次へ」で最後のページまで進む"""
+        from hellowork_http import HelloWorkHttpFetcher
+
+        fetcher = HelloWorkHttpFetcher(
+            base_url=stand_in_server.base_url, request_interval=0
+        )
+        pages = list(fetcher.iter_pages("13", max_pages=5))
+        fetcher.close()
+
+        assert len(pages) == 2
+        search, next_page = stand_in_server.posted
+        assert search["tDFK1CmbBox"] == ["13"]
+        assert search["screenId"] == ["GECA110010"]
+        # 差分収集でなければ並び替えは既定のまま
+        assert search["sortCmbBox"] == ["1"]
+        assert "clearBtn" not in search
+        assert next_page["fwListNaviBtnNext"] == ["次へ"]
+        assert "fwListNaviBtnPrev" not in next_page
+
+    def test_stops_at_max_pages(self, stand_in_server):
+        """max_pagesに達したら次のページを取得しない"""
+        from hellowork_http import HelloWorkHttpFetcher
+
+        fetcher = HelloWorkHttpFetcher(
+            base_url=stand_in_server.base_url, request_interval=0
+        )
+        pages = list(fetcher.iter_pages("13", max_pages=1))
+        fetcher.close()
+
+        assert len(pages) == 1
+        assert len(stand_in_server.posted) == 1
+
+    def test_go_to_page_ignores_numeric_hidden_fields(self, stand_in_server):
+        """hiddenの数値項目（都道府県コード13など）をページ番号のボタンとみなさない"""
+        from hellowork_http import HelloWorkHttpFetcher
+
+        fetcher = HelloWorkHttpFetcher(
+            base_url=stand_in_server.base_url, request_interval=0
+        )
+        response = fetcher.search("13")
+        page2 = fetcher.go_to_page(response, 1, 2)
+        last = fetcher.go_to_page(response, 1, 20)
+        fetcher.close()
+
+        assert b"fwListNaviBtnNext" in page2.content
+        assert last is None
+        # 「次へ」で1ページずつ進み、hiddenの項目を押したボタンとして送らない
+        assert len(stand_in_server.posted) == 3
+        for form in stand_in_server.posted[1:]:
+            assert form["fwListNaviBtnNext"] == ["次へ"]
+
+    def test_page_button_xpath_skips_hidden_fields(self, read_fixture):
+        """Selenium用のページ番号ボタンのXPathがhiddenの数値項目に一致しない"""
+        from lxml import html
+        from crawler import PAGE_BUTTON_XPATH
+
+        page = read_fixture("result_page1.html").replace(
+            b'<input type="submit" name="fwListNaviBtnNext"',
+            b'<input type="submit" name="fwListNaviBtnPageNo2" value="2">'
+            b'<input type="submit" name="fwListNaviBtnNext"',
+        )
+
+        buttons = html.fromstring(page).xpath(PAGE_BUTTON_XPATH)
+
+        assert [button.get("name") for button in buttons] == ["fwListNaviBtnPageNo2"]
+
+    def test_newest_first_option_xpath(self, read_fixture):
+        """Selenium用のXPathが並び替えの新着順の選択肢だけに一致する"""
+        from lxml import html
+        from crawler import NEWEST_FIRST_OPTION_XPATH
+
+        options = html.fromstring(read_fixture("search_form.html")).xpath(
+            NEWEST_FIRST_OPTION_XPATH
+        )
+
+        assert [(o.getparent().get("name"), o.get("value")) for o in options] == [
+            ("sortCmbBox", "2")
+        ]
+
+
+class TestRunHttpCrawler:
+    """HTTP取得モードのクローラーのテスト"""
+
+    def teardown_method(self):
+        from database import close_pools
+
+        close_pools()
+
+    def test_saves_jobs_from_recorded_pages(
+        self, stand_in_server, tmp_path, monkeypatch
+    ):
+        """取得したページを解析して保存する（都道府県がなければ検索条件を使う）"""
+        import database
+        from crawler import run_http_crawler
+        from database import init_db_with_path
+
+        db_path = str(tmp_path / "http_crawler.db")
+        init_db_with_path(db_path)
+        monkeypatch.setattr(database, "DB_NAME", db_path)
+
+        result = run_http_crawler(
+            prefecture="東京都",
+            max_pages=3,
+            base_url=stand_in_server.base_url,
+            politeness_delay=0,
+        )
+
+        assert result["count"] == 3
+        assert [timing["page"] for timing in result["page_timings"]] == [1, 2]
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute(
+            "SELECT title, wage_type, wage_min, prefecture, industry FROM jobs ORDER BY id"
+        ).fetchall()
+        conn.close()
+        assert rows == [
+            ("看護師（病棟勤務）", "monthly", 250000, "東京都", "医療・介護"),
+            ("倉庫内軽作業スタッフ", "hourly", 1200, "東京都", "製造・建設"),
+            ("一般事務", "monthly", 200000, "東京都", "営業・事務"),
+        ]
+
+        # 2回目は重複としてスキップされる
+        result = run_http_crawler(
+            prefecture="東京都",
+            max_pages=3,
+            base_url=stand_in_server.base_url,
+            politeness_delay=0,
+        )
+        assert result["count"] == 0
+
+    def test_incremental_stops_at_known_page(
+        self, stand_in_server, tmp_path, monkeypatch
+    ):
+        """差分収集では、すべて保存済みのページで打ち切る"""
+        import database
+        from crawler import run_http_crawler
+        from database import init_db_with_path
+
+        db_path = str(tmp_path / "incremental.db")
+        init_db_with_path(db_path)
+        monkeypatch.setattr(database, "DB_NAME", db_path)
+
+        first = run_http_crawler(
+            prefecture="東京都",
+            max_pages=3,
+            base_url=stand_in_server.base_url,
+            politeness_delay=0,
+            incremental=True,
+        )
+        # 新着があるページは最後まで進む
+        assert [timing["page"] for timing in first["page_timings"]] == [1, 2]
+        stand_in_server.posted.clear()
+
+        second = run_http_crawler(
+            prefecture="東京都",
+            max_pages=3,
+            base_url=stand_in_server.base_url,
+            politeness_delay=0,
+            incremental=True,
+        )
+
+        assert second["count"] == 0
+        assert [timing["page"] for timing in second["page_timings"]] == [1]
+        # 新着順で検索し、次のページは取得しない
+        assert len(stand_in_server.posted) == 1
+        assert stand_in_server.posted[0]["sortCmbBox"] == ["2"]
+
+    def test_incremental_needs_newest_first_sort(
+        self, stand_in_server, tmp_path, monkeypatch
+    ):
+        """新着順に並べ替えられない検索結果では、保存済みのページでも打ち切らない"""
+        import re
+        import database
+        from crawler import run_http_crawler
+        from database import init_db_with_path
+
+        db_path = str(tmp_path / "unsorted.db")
+        init_db_with_path(db_path)
+        monkeypatch.setattr(database, "DB_NAME", db_path)
+        stand_in_server.search_form = re.sub(
+            rb'<select name="sortCmbBox".*?</select>',
+            b"",
+            stand_in_server.search_form,
+            flags=re.S,
+        )
+
+        for _ in range(2):
+            result = run_http_crawler(
+                prefecture="東京都",
+                max_pages=3,
+                base_url=stand_in_server.base_url,
+                politeness_delay=0,
+                incremental=True,
+            )
+
+        assert result["count"] == 0
+        assert [timing["page"] for timing in result["page_timings"]] == [1, 2]
+        assert all("sortCmbBox" not in form for form in stand_in_server.posted)
@@ -33,6 +33,38 @@ class TestIndeedParser:
         soup = BeautifulSoup(html, "html.parser")
         return soup.find("div", class_="job_seen_beacon")
 
+    def test_find_job_elements_matches_full_page_parse(self):
+        """求人カードだけを解析しても、ページ全体を解析した場合と同じ辞書になる"""
+        import re
+        from html_parsing import find_job_elements
+
+        cards = [
+            str(self.get_mock_indeed_card()),
+            str(self.get_mock_indeed_card(salary="時給 1800円")),
+            str(self.get_mock_indeed_card(salary="年収 500万円", location="大阪市")),
+        ]
+        html = (
+            "<html><head><script>var s = '<div>';</script></head><body>"
+            '<nav><a href="/">Indeed</a></nav>'
+            + "".join(cards)
+            + '<div class="cardOutline-extra"><span>広告</span></div></body></html>'
+        )
+
+        full_page = BeautifulSoup(html, "html.parser")
+        expected = [
+            parse_indeed_job(card)
+            for card in full_page.find_all("div", class_="job_seen_beacon")
+        ]
+
+        assert len(expected) == 3
+        for parser in ["lxml", "html.parser"]:
+            cards = find_job_elements(html, "div", "job_seen_beacon", parser=parser)
+            assert [parse_indeed_job(card) for card in cards] == expected
+
+        # クラス名の正規表現でも取り出せる
+        outlines = find_job_elements(html, "div", re.compile("cardOutline"))
+        assert [card.get_text(strip=True) for card in outlines] == ["広告"]
+
     def test_parse_basic_job(self):
         """基本的な求人パースのテスト"""
         card = self.get_mock_indeed_card()
@@ -116,3 +148,148 @@ class TestIndeedCrawlerImport:
         from indeed_crawler import run_indeed_crawler
 
         assert callable(run_indeed_crawler)
+
+
+def _indeed_page(jobs):
+    """求人カードを並べたIndeedの検索結果ページ"""
+    cards = "".join(
+        f"""
+        <div class="job_seen_beacon">
+            <h2 class="jobTitle"><a href="/viewjob?jk={i}">{title}</a></h2>
+            <span data-testid="company-name">{company}</span>
+            <div data-testid="text-location">東京都新宿区</div>
+        </div>
+        """
+        for i, (title, company) in enumerate(jobs)
+    )
+    return f"<html><body>{cards}</body></html>"
+
+
+class FakeIndeedDriver:
+    """startの値に応じたページを返すChromeの代役（lazy_pagesはスクロール後に読み込まれる）"""
+
+    pages = {}
+    lazy_pages = {}
+    visited = []
+
+    def __init__(self, *args, **kwargs):
+        self.page_source = ""
+        self.start = None
+
+    def get(self, url):
+        from urllib.parse import parse_qs, urlparse
+
+        FakeIndeedDriver.visited.append(url)
+        self.start = int(parse_qs(urlparse(url).query)["start"][0])
+        self.page_source = self.pages.get(self.start, "<html></html>")
+
+    def load_lazy_cards(self):
+        if self.start in self.lazy_pages:
+            self.page_source = self.lazy_pages[self.start]
+
+    def execute_script(self, script):
+        pass
+
+    def quit(self):
+        pass
+
+
+class FakeWait:
+    def __init__(self, driver, timeout):
+        pass
+
+    def until(self, condition):
+        return True
+
+
+class TestIncrementalIndeedCrawl:
+    """Indeedの差分収集のテスト"""
+
+    @pytest.fixture
+    def fake_indeed(self, tmp_path, monkeypatch):
+        import database
+        import indeed_crawler
+        from database import get_connection, init_db_with_path, save_jobs_bulk
+
+        db_path = str(tmp_path / "indeed.db")
+        init_db_with_path(db_path)
+        monkeypatch.setattr(database, "DB_NAME", db_path)
+
+        # 2ページ目の求人は前回の収集で保存済み
+        known = [("看護師", "医療法人A"), ("介護職", "社会福祉法人B")]
+        conn = get_connection()
+        save_jobs_bulk(
+            conn,
+            [
+                (title, None, None, None, company, "東京都新宿区", "", "医療・福祉")
+                for title, company in known
+            ],
+        )
+        conn.close()
+
+        monkeypatch.setattr(
+            FakeIndeedDriver,
+            "pages",
+            {
+                0: _indeed_page([("エンジニア", "株式会社C")]),
+                10: _indeed_page(known),
+                20: _indeed_page([("一般事務", "株式会社D")]),
+            },
+        )
+        monkeypatch.setattr(FakeIndeedDriver, "lazy_pages", {})
+        monkeypatch.setattr(FakeIndeedDriver, "visited", [])
+        # カードの数が増えなくなるまでの待機の代わりに、遅延読み込みを完了させる
+        monkeypatch.setattr(
+            indeed_crawler,
+            "wait_for_count_to_settle",
+            lambda driver, locator: driver.load_lazy_cards(),
+        )
+        monkeypatch.setattr(indeed_crawler.uc, "Chrome", FakeIndeedDriver)
+        monkeypatch.setattr(indeed_crawler, "WebDriverWait", FakeWait)
+        yield FakeIndeedDriver
+        database.close_pools()
+
+    def test_stops_at_known_page_sorted_by_date(self, fake_indeed):
+        """新着順で取得し、保存済みの求人だけのページで打ち切る"""
+        from indeed_crawler import run_indeed_crawler
+
+        pages = []
+        result = run_indeed_crawler(
+            location="東京都",
+            max_pages=3,
+            politeness_delay=0,
+            on_page=lambda page, saved: pages.append((page, saved)),
+            incremental=True,
+        )
+
+        assert result["success"]
+        assert result["count"] == 1
+        assert pages == [
+            (1, {"inserted": 1, "skipped": 0}),
+            (2, {"inserted": 0, "skipped": 2}),
+        ]
+        assert all("&sort=date" in url for url in fake_indeed.visited)
+
+    def test_full_crawl_keeps_default_order(self, fake_indeed):
+        """差分収集でなければ並び順を指定せず、最後のページまで取得する"""
+        from indeed_crawler import run_indeed_crawler
+
+        result = run_indeed_crawler(location="東京都", max_pages=3, politeness_delay=0)
+
+        assert result["count"] == 2
+        assert len(fake_indeed.visited) == 3
+        assert not any("sort=" in url for url in fake_indeed.visited)
+
+    def test_saves_cards_loaded_after_scroll(self, fake_indeed, monkeypatch):
+        """スクロールで遅延読み込みされたカードも、読み込みを待ってから保存する"""
+        from indeed_crawler import run_indeed_crawler
+
+        monkeypatch.setattr(
+            fake_indeed,
+            "lazy_pages",
+            {0: _indeed_page([("エンジニア", "株式会社C"), ("薬剤師", "株式会社E")])},
+        )
+
+        result = run_indeed_crawler(location="東京都", max_pages=1, politeness_delay=0)
+
+        assert result["count"] == 2
@@ -60,6 +60,48 @@ class TestIndustryClassification:
         assert classify_industry("会計年度任用職員") == "その他"
         assert classify_industry("ドライバー") == "その他"
 
+    def test_priority_follows_dictionary_order(self):
+        """複数の業界のキーワードを含む場合は辞書で先に定義された業界を返す"""
+        import random
+        from crawler import INDUSTRY_KEYWORDS, classify_industry
+
+        def classify_by_loop(title):
+            # 従来の実装（業界の順・キーワードの順に部分一致を調べる）
+            for industry, keywords in INDUSTRY_KEYWORDS.items():
+                for keyword in keywords:
+                    if keyword.upper() in title.upper():
+                        return industry
+            return "その他"
+
+        words = [k for keywords in INDUSTRY_KEYWORDS.values() for k in keywords]
+        words += ["スタッフ", "正社員", "ドライバー", "se", "ｗｅｂ"]
+        rng = random.Random(0)
+        titles = [
+            "".join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+            for _ in range(2000)
+        ]
+
+        assert classify_industry("医療事務") == "医療・介護"
+        assert classify_industry("設備管理") == "製造・建設"
+        assert [classify_industry(t) for t in titles] == [
+            classify_by_loop(t) for t in titles
+        ]
+
+    def test_classify_industries_batch(self):
+        """まとめて分類しても1件ずつの結果と同じ順序で返す"""
+        from crawler import classify_industries
+
+        titles = ["看護師", "", "営業職", "看護師", None, "ドライバー"]
+
+        assert classify_industries(titles) == [
+            "医療・介護",
+            "その他",
+            "営業・事務",
+            "医療・介護",
+            "その他",
+            "その他",
+        ]
+
 
 class TestSearchAPI:
     """検索APIのテスト"""
@@ -47,6 +47,8 @@ def test_parse_job_html():
     assert result["title"] == "AIアプリ開発エンジニア"
     assert result["company"] == "株式会社テストテック"
     assert result["location"] == "大阪市北区"
+    assert result["prefecture"] == "大阪府"
+    assert result["prefecture_code"] == "27"
     assert result["wage_min"] == 250000
     assert result["wage_max"] == 500000
 
@@ -111,3 +113,40 @@ def test_parse_url():
     row_abs = get_mock_soup_with_url("https://example.com/job/1")
     result_abs = parse_job_html(row_abs)
     assert result_abs["url"] == "https://example.com/job/1"
+
+
+def get_mock_page(cards):
+    """求人カード以外の要素（ヘッダー・フォーム・スクリプト）を含むページ全体のHTML"""
+    return f"""
+    <html>
+    <head><title>求人情報検索</title><script>var x = "<table class='kyujin'>";</script></head>
+    <body>
+        <div id="header"><ul><li><a href="/">トップ</a></li><li>月給で探す</li></ul></div>
+        <form><select name="kiboSuruSKSU1Selected"><option>01</option></select></form>
+        <table class="search_result"><tr><td>検索結果 {len(cards)}件</td></tr></table>
+        {"".join(cards)}
+        <div id="footer">時給・日給 1,000円の表記例</div>
+    </body>
+    </html>
+    """
+
+
+def test_find_job_elements_matches_full_page_parse():
+    """求人テーブルだけを解析しても、ページ全体を解析した場合と同じ辞書になる"""
+    from html_parsing import find_job_elements
+
+    cards = [
+        str(get_mock_soup("250,000円〜500,000円")),
+        str(get_mock_soup("時給 1,200円〜1,500円")),
+        str(get_mock_soup("月給 200,000円〜")),
+        str(get_mock_soup_with_url("/detail/12345", "日給 9,000円")),
+    ]
+    html = get_mock_page(cards)
+
+    full_page = BeautifulSoup(html, "html.parser").select("table.kyujin")
+    expected = [parse_job_html(table) for table in full_page]
+
+    assert len(expected) == 4
+    for parser in ["lxml", "html.parser"]:
+        tables = find_job_elements(html, "table", "kyujin", parser=parser)
+        assert [parse_job_html(table) for table in tables] == expected
@@ -0,0 +1,206 @@
+# backend/test/test_reclassify.py
+import pytest
+import sqlite3
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestReclassifyIndustries:
+    """業界の再分類のテスト"""
+
+    def teardown_method(self):
+        from database import close_pools
+
+        close_pools()
+
+    def _make_db(self, tmp_path, count=10):
+        from database import init_db_with_path, save_jobs_bulk
+
+        db_path = str(tmp_path / "reclassify.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        # 古いルールで分類された想定で、すべて「その他」として保存する
+        save_jobs_bulk(
+            conn,
+            [
+                (
+                    f"看護師{i}" if i % 2 else f"求人{i}",
+                    250000,
+                    0,
+                    "monthly",
+                    "A社",
+                    "東京都",
+                    "",
+                    "その他",
+                )
+                for i in range(count)
+            ],
+        )
+        conn.close()
+        return db_path
+
+    def _industries(self, db_path):
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute("SELECT industry FROM jobs ORDER BY id").fetchall()
+        conn.close()
+        return [row[0] for row in rows]
+
+    def test_updates_only_changed_rows(self, tmp_path):
+        """分類が変わった行だけを更新し、集計にも反映する"""
+        from database import get_data_version, get_industry_stats
+        from reclassify import reclassify_industries
+
+        db_path = self._make_db(tmp_path)
+        version = get_data_version(db_path)
+
+        result = reclassify_industries(db_name=db_path, batch_size=3)
+
+        assert result == {"scanned": 10, "updated": 5, "resumed_from": None}
+        assert self._industries(db_path) == ["その他", "医療・介護"] * 5
+        assert get_data_version(db_path) > version
+        stats = {row["industry"]: row["count"] for row in get_industry_stats(db_path)}
+        assert stats == {"その他": 5, "医療・介護": 5}
+
+        # 2回目は変更なし
+        result = reclassify_industries(db_name=db_path, batch_size=3)
+        assert result["updated"] == 0
+
+    def test_refreshes_aggregates_once_at_end(self, tmp_path, monkeypatch):
+        """集計の最大・最小値はバッチごとではなく最後に1度だけ計算し直す"""
+        import reclassify
+        from database import refresh_job_aggregates
+
+        stale_counts = []
+
+        def counting_refresh(conn):
+            stale_counts.append(self._stale_count(conn))
+            return refresh_job_aggregates(conn)
+
+        monkeypatch.setattr(reclassify, "refresh_job_aggregates", counting_refresh)
+        db_path = self._make_db(tmp_path)
+
+        reclassify.reclassify_industries(db_name=db_path, batch_size=3)
+
+        # 4バッチ分の「その他」の最大値の変化を最後にまとめて計算し直す
+        assert stale_counts == [1]
+        conn = sqlite3.connect(db_path)
+        assert self._stale_count(conn) == 0
+        conn.close()
+
+    def _stale_count(self, conn):
+        return conn.execute(
+            "SELECT COUNT(*) FROM job_aggregates WHERE stale"
+        ).fetchone()[0]
+
+    def test_resumes_from_checkpoint(self, tmp_path):
+        """中断した場合は次回チェックポイントの続きから処理する"""
+        from reclassify import reclassify_industries
+
+        db_path = self._make_db(tmp_path)
+
+        def interrupt(progress):
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            reclassify_industries(db_name=db_path, batch_size=4, on_batch=interrupt)
+        assert self._industries(db_path)[:4] == ["その他", "医療・介護"] * 2
+        assert self._industries(db_path)[4:] == ["その他"] * 6
+        conn = sqlite3.connect(db_path)
+        assert self._stale_count(conn) == 1
+
+        result = reclassify_industries(db_name=db_path, batch_size=4)
+
+        assert result["resumed_from"] == 4
+        assert result["scanned"] == 6
+        assert self._industries(db_path) == ["その他", "医療・介護"] * 5
+        # 中断した回の再計算待ちも、再開した回の最後に計算し直す
+        assert self._stale_count(conn) == 0
+        conn.close()
+
+    def test_reset_discards_checkpoint(self, tmp_path):
+        """DBをリセットしたらidが振り直されるため、中断したチェックポイントを使わない"""
+        from database import init_db_with_path, save_jobs_bulk
+        from reclassify import reclassify_industries
+
+        db_path = self._make_db(tmp_path)
+
+        def interrupt(progress):
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            reclassify_industries(db_name=db_path, batch_size=4, on_batch=interrupt)
+
+        init_db_with_path(db_path, reset=True)
+        conn = sqlite3.connect(db_path)
+        save_jobs_bulk(
+            conn,
+            [
+                (f"看護師{i}", 250000, 0, "monthly", "B社", "東京都", "", "その他")
+                for i in range(3)
+            ],
+        )
+        conn.close()
+
+        result = reclassify_industries(db_name=db_path, batch_size=4)
+
+        assert result == {"scanned": 3, "updated": 3, "resumed_from": None}
+        assert self._industries(db_path) == ["医療・介護"] * 3
+
+    def test_rule_change_restarts_from_beginning(self, tmp_path, monkeypatch):
+        """分類ルールが変わっていればチェックポイントを使わない"""
+        import reclassify
+        from reclassify import reclassify_industries
+
+        db_path = self._make_db(tmp_path)
+
+        def interrupt(progress):
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            reclassify_industries(db_name=db_path, batch_size=4, on_batch=interrupt)
+
+        monkeypatch.setattr(reclassify, "rules_fingerprint", lambda: 1)
+        result = reclassify_industries(db_name=db_path, batch_size=4)
+
+        assert result["resumed_from"] is None
+        assert result["scanned"] == 10
+
+
+class TestReclassifyAPI:
+    """再分類APIのテスト"""
+
+    def teardown_method(self):
+        from database import close_pools
+
+        close_pools()
+
+    def test_reclassify_runs_in_background(self, tmp_path, monkeypatch):
+        """POSTで開始し、状態APIで結果を取得できる"""
+        import routes.jobs
+        from app import app
+        from database import init_db_with_path, save_jobs_bulk
+
+        db_path = str(tmp_path / "reclassify.db")
+        init_db_with_path(db_path)
+        conn = sqlite3.connect(db_path)
+        save_jobs_bulk(
+            conn, [("看護師", 250000, 0, "monthly", "A社", "東京都", "", "その他")]
+        )
+        conn.close()
+        monkeypatch.setattr(routes.jobs, "DB_NAME", db_path)
+        client = app.test_client()
+
+        response = client.post("/api/reclassify", json={"restart": True})
+        assert response.status_code == 202
+
+        for _ in range(100):
+            status = client.get("/api/reclassify/status").get_json()
+            if not status["is_running"]:
+                break
+            time.sleep(0.05)
+
+        assert status["last_result"]["success"] is True
+        assert status["last_result"]["updated"] == 1
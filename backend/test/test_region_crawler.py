@@ -0,0 +1,171 @@
+# backend/test/test_region_crawler.py
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _per_prefecture(page, form):
+    """都道府県ごとに別の事業所・検索条件のページにする"""
+    code = form.get("tDFK1CmbBox", [""])[0]
+    text = page.decode("utf-8")
+    text = text.replace("株式会社テスト", f"株式会社テスト{code}")
+    text = text.replace("医療法人テスト会", f"医療法人テスト会{code}")
+    text = text.replace(
+        'name="tDFK1CmbBox" value="13"', f'name="tDFK1CmbBox" value="{code}"'
+    )
+    return text.encode("utf-8")
+
+
+@pytest.fixture
+def stand_in_server(stand_in_server, monkeypatch):
+    """都道府県ごとに別の求人を返し、応答に時間のかかる代役サーバー"""
+    import crawler
+
+    stand_in_server.latency = 0.05
+    stand_in_server.rewrite_page = _per_prefecture
+    monkeypatch.setattr(crawler, "HELLOWORK_BASE_URL", stand_in_server.base_url)
+    return stand_in_server
+
+
+class TestCrawlPrefectures:
+    """複数都道府県の並列クロールのテスト"""
+
+    def teardown_method(self):
+        from database import close_pools
+
+        close_pools()
+
+    def _make_db(self, tmp_path):
+        from database import init_db_with_path
+
+        db_path = str(tmp_path / "region.db")
+        init_db_with_path(db_path)
+        return db_path
+
+    def test_crawls_all_prefectures_in_parallel(self, stand_in_server, tmp_path):
+        """都道府県を同時に取得し、すべての求人を保存する"""
+        from region_crawler import crawl_prefectures
+
+        db_path = self._make_db(tmp_path)
+        prefectures = ["北海道", "東京都", "大阪府", "福岡県"]
+
+        result = crawl_prefectures(
+            prefectures,
+            workers=4,
+            max_pages=3,
+            fetch_mode="http",
+            politeness_delay=0,
+            db_name=db_path,
+        )
+
+        assert result["success"] is True
+        assert result["count"] == 12
+        assert result["prefectures"]["大阪府"] == {
+            "status": "done",
+            "pages": 2,
+            "count": 3,
+            "error": None,
+        }
+        assert stand_in_server.max_active > 1
+
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute(
+            "SELECT prefecture, COUNT(*) FROM jobs GROUP BY prefecture"
+        ).fetchall()
+        conn.close()
+        # 就業場所に都道府県がない求人は検索条件の都道府県になる
+        assert dict(rows) == {"東京都": 9, "北海道": 1, "大阪府": 1, "福岡県": 1}
+
+    def test_saves_on_single_writer_thread(
+        self, stand_in_server, tmp_path, monkeypatch
+    ):
+        """保存はすべて1つの書き込みスレッドで行う"""
+        import job_writer
+        from region_crawler import crawl_prefectures
+
+        db_path = self._make_db(tmp_path)
+        threads = set()
+        original = job_writer.save_jobs_bulk
+
+        def recording_save(conn, rows, dedupe=True):
+            threads.add(threading.current_thread().name)
+            return original(conn, rows, dedupe=dedupe)
+
+        monkeypatch.setattr(job_writer, "save_jobs_bulk", recording_save)
+
+        crawl_prefectures(
+            ["北海道", "東京都", "大阪府"],
+            workers=3,
+            fetch_mode="http",
+            politeness_delay=0,
+            db_name=db_path,
+        )
+
+        assert threads == {"job-writer"}
+
+    def test_reports_progress_and_failures(self, stand_in_server, tmp_path):
+        """都道府県ごとの進捗を通知し、失敗した都道府県を記録する"""
+        from region_crawler import crawl_prefectures
+
+        db_path = self._make_db(tmp_path)
+        updates = []
+        # 検索ページが404になる状態にして失敗させる
+        stand_in_server.down = True
+
+        result = crawl_prefectures(
+            ["北海道"],
+            workers=1,
+            fetch_mode="http",
+            politeness_delay=0,
+            db_name=db_path,
+            on_progress=updates.append,
+        )
+
+        assert result["success"] is False
+        assert updates[0]["北海道"]["status"] == "running"
+        assert updates[-1]["北海道"]["status"] == "failed"
+        assert updates[-1]["北海道"]["error"]
+
+
+class TestHostRateLimiter:
+    """ホスト単位のアクセス間隔のテスト"""
+
+    def test_shared_between_threads(self):
+        """複数スレッドで共有しても最小間隔を守る"""
+        from crawl_waits import PolitenessDelay
+
+        delay = PolitenessDelay(0.05)
+        times = []
+        lock = threading.Lock()
+
+        def access():
+            delay.wait()
+            with lock:
+                times.append(time.monotonic())
+
+        threads = [threading.Thread(target=access) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        times.sort()
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        assert all(gap >= 0.04 for gap in gaps)
+
+    def test_same_host_returns_same_limiter(self):
+        """同じホストには同じPolitenessDelayを返す"""
+        from crawl_waits import host_rate_limiter
+
+        first = host_rate_limiter("example.test", 1.0)
+        second = host_rate_limiter("example.test", 0.5)
+
+        assert first is second
+        assert second.min_interval == 0.5
+        assert host_rate_limiter("other.test") is not first
@@ -0,0 +1,64 @@
+# backend/test/test_wage_parser.py
+from wage_parser import parse_wage, parse_wages, scan_wage_text
+
+
+def test_parse_wage_types():
+    """給与形態のキーワードを判定する"""
+    assert parse_wage("時給 1,200円〜1,500円") == ("hourly", 1200, 1500)
+    assert parse_wage("月給 200,000円〜") == ("monthly", 200000, 200000)
+    assert parse_wage("月収 30万円") == ("monthly", 300000, 300000)
+    assert parse_wage("日給 9,000円〜12,000円") == ("daily", 9000, 12000)
+    assert parse_wage("年収 500万円") == ("annual", 5000000, 5000000)
+    assert parse_wage("年俸 4,800,000円") == ("annual", 4800000, 4800000)
+
+
+def test_parse_wage_priority():
+    """複数の給与形態が書かれている場合は優先順位（時給 > 月給 > 日給 > 年収）で決める"""
+    assert parse_wage("月給 25万円（時給換算 1,500円）")[0] == "hourly"
+    assert parse_wage("年収 400万円 / 月給 25万円")[0] == "monthly"
+
+
+def test_parse_wage_man_yen_takes_precedence():
+    """「万円」表記の金額があれば「円」表記より優先する"""
+    assert parse_wage("月給 25.5万円 ~ 30万円（賞与 100,000円）") == (
+        "monthly",
+        255000,
+        300000,
+    )
+
+
+def test_parse_wage_infers_type_from_amount():
+    """給与形態が書かれていなければ金額から推測する"""
+    assert parse_wage("250,000円〜500,000円") == ("monthly", 250000, 500000)
+    assert parse_wage("1,100円") == ("hourly", 1100, 1100)
+    assert parse_wage("50,000円") == ("unknown", 50000, 50000)
+    assert parse_wage("応相談") == ("unknown", 0, 0)
+    assert parse_wage("") == ("unknown", 0, 0)
+
+
+def test_parse_wage_fallback_text():
+    """給与欄に給与形態・金額がなければ補助テキストから探す"""
+    assert parse_wage("", "仕事の内容 時給 1,300円") == ("hourly", 1300, 1300)
+    assert parse_wage("220,000円", "月給制・賞与あり") == ("monthly", 220000, 220000)
+    # 給与欄の情報を優先する
+    assert parse_wage("日給 10,000円", "時給 1,000円") == ("daily", 10000, 10000)
+
+
+def test_scan_wage_text():
+    """1回の走査で給与形態と金額のリストを返す"""
+    assert scan_wage_text("時給 1,000円〜1,200円 交通費 500円") == (
+        "hourly",
+        [1000, 1200, 500],
+    )
+    assert scan_wage_text(None) == (None, [])
+
+
+def test_parse_wages_batch():
+    """まとめて解析しても1件ずつの結果と同じ順序で返す"""
+    texts = ["時給 1,200円", "月給 25万円", "時給 1,200円", ""]
+
+    assert parse_wages(texts) == [parse_wage(text) for text in texts]
+    assert parse_wages(["", "200,000円"], ["時給 1,000円", ""]) == [
+        ("hourly", 1000, 1000),
+        ("monthly", 200000, 200000),
+    ]
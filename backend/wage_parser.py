@@ -0,0 +1,126 @@
+# backend/wage_parser.py
+"""
+給与テキストの解析
+ハローワーク・Indeedのパーサーで共有する、給与形態と金額の抽出
+正規表現は起動時に1度だけコンパイルし、テキストは1回の走査で解析する
+"""
+import re
+
+# 給与形態のキーワード（優先順位の高い順）
+WAGE_TYPE_KEYWORDS = (
+    ("hourly", ("時給",)),
+    ("monthly", ("月給", "月収")),
+    ("daily", ("日給",)),
+    ("annual", ("年収", "年俸")),
+)
+
+_TYPE_PRIORITY = {
+    keyword: (priority, wage_type)
+    for priority, (wage_type, keywords) in enumerate(WAGE_TYPE_KEYWORDS)
+    for keyword in keywords
+}
+
+# 給与形態のキーワード・「◯万円」・「◯円」を1回の走査で取り出す
+_WAGE_TOKEN_PATTERN = re.compile(
+    "(?P<type>"
+    + "|".join(re.escape(keyword) for keyword in _TYPE_PRIORITY)
+    + r")|(?P<man>\d+(?:\.\d+)?)\s*万円|(?P<yen>\d[\d,]*)円"
+)
+
+_NON_DIGIT_PATTERN = re.compile(r"[^\d]")
+
+
+def clean_money(text):
+    """金額文字列を数値に変換する"""
+    if not text:
+        return 0
+    clean_text = _NON_DIGIT_PATTERN.sub("", str(text))
+    if not clean_text:
+        return 0
+    return int(clean_text)
+
+
+def scan_wage_text(text):
+    """
+    テキストを1回走査して、給与形態と金額を取り出す
+
+    Returns:
+        (給与形態（見つからなければNone）, 金額（円）のリスト)
+        「万円」表記の金額があればそれを優先し、なければ「円」表記の金額を返す
+    """
+    best = None
+    man_amounts = []
+    yen_amounts = []
+    for match in _WAGE_TOKEN_PATTERN.finditer(text or ""):
+        kind = match.lastgroup
+        if kind == "type":
+            candidate = _TYPE_PRIORITY[match.group("type")]
+            if best is None or candidate < best:
+                best = candidate
+        elif kind == "man":
+            man_amounts.append(int(float(match.group("man")) * 10000))
+        else:
+            yen_amounts.append(clean_money(match.group("yen")))
+
+    wage_type = best[1] if best else None
+    return wage_type, man_amounts or yen_amounts
+
+
+def parse_wage(text, fallback_text=None):
+    """
+    給与テキストから給与形態と金額を求める
+
+    Args:
+        text: 給与欄のテキスト
+        fallback_text: 給与欄に給与形態・金額がない場合に探すテキスト（求人カード全体など）
+
+    Returns:
+        (wage_type, wage_min, wage_max)
+        給与形態が書かれていない場合は金額から推測し、判定できなければ"unknown"
+    """
+    wage_type, amounts = scan_wage_text(text)
+    if fallback_text is not None and (wage_type is None or not amounts):
+        fallback_type, fallback_amounts = scan_wage_text(fallback_text)
+        wage_type = wage_type or fallback_type
+        amounts = amounts or fallback_amounts
+
+    wage_min = amounts[0] if amounts else 0
+    wage_max = amounts[1] if len(amounts) >= 2 else wage_min
+
+    # 金額から賃金形態を推測
+    if wage_type is None:
+        wage_type = "unknown"
+        if wage_min > 0:
+            if wage_min < 10000:
+                wage_type = "hourly"
+            elif wage_min >= 100000:
+                wage_type = "monthly"
+
+    return wage_type, wage_min, wage_max
+
+
+def parse_wages(texts, fallback_texts=None):
+    """
+    複数の給与テキストをまとめて解析する（保存済みデータの再解析用）
+    同じテキストの組み合わせは1度だけ解析する
+
+    Args:
+        texts: 給与欄のテキストのイテラブル
+        fallback_texts: textsと同じ長さの補助テキストのイテラブル（省略可）
+
+    Returns:
+        (wage_type, wage_min, wage_max) のリスト（textsと同じ順序）
+    """
+    if fallback_texts is None:
+        pairs = ((text, None) for text in texts)
+    else:
+        pairs = zip(texts, fallback_texts)
+
+    cache = {}
+    results = []
+    for pair in pairs:
+        result = cache.get(pair)
+        if result is None:
+            result = cache[pair] = parse_wage(*pair)
+        results.append(result)
+    return results
@@ -9,6 +9,10 @@ export const industries = [
   "その他",
 ];
 
+// 一覧で表示するカラムと1回に取得する件数
+const JOB_FIELDS = "title,company,location,wage_min,wage_type,industry,url";
+const PAGE_SIZE = 50;
+
 export function useJobs() {
   const jobs = ref([]);
   const filterType = ref("all");
@@ -18,16 +22,38 @@ export function useJobs() {
   const wageMin = ref("");
   const wageMax = ref("");
 
+  // ページング状態（次ページのカーソルと該当件数の見積もり）
+  const nextAfterId = ref(null);
+  // キーワード検索（関連度順）ではidと合わせて関連度もカーソルにする
+  const nextAfterScore = ref(null);
+  const totalEstimate = ref(0);
+  const lastRequest = ref(null);
+
+  async function fetchPage(path, params, append) {
+    params.set("fields", JOB_FIELDS);
+    params.set("limit", PAGE_SIZE);
+    params.delete("after_id");
+    params.delete("after_score");
+    if (append && nextAfterId.value) params.set("after_id", nextAfterId.value);
+    if (append && nextAfterScore.value)
+      params.set("after_score", nextAfterScore.value);
+
+    const res = await fetch(`http://127.0.0.1:5000${path}?${params.toString()}`);
+    const page = await res.json();
+    jobs.value = append ? jobs.value.concat(page) : page;
+    nextAfterId.value = res.headers.get("X-Next-After-Id");
+    nextAfterScore.value = res.headers.get("X-Next-After-Score");
+    totalEstimate.value = Number(res.headers.get("X-Total-Estimate") || 0);
+    lastRequest.value = { path, params: new URLSearchParams(params) };
+  }
+
   async function fetchJobs() {
     try {
-      let url = "http://127.0.0.1:5000/api/jobs";
       const params = new URLSearchParams();
       if (filterType.value !== "all")
         params.append("wage_type", filterType.value);
-      if (params.toString()) url += `?${params.toString()}`;
 
-      const res = await fetch(url);
-      jobs.value = await res.json();
+      await fetchPage("/api/jobs", params, false);
     } catch (e) {
       console.error("求人取得エラー:", e);
       jobs.value = [];
@@ -44,15 +70,23 @@ export function useJobs() {
         params.append("industry", filterIndustry.value);
       if (filterLocation.value) params.append("location", filterLocation.value);
 
-      const res = await fetch(
-        `http://127.0.0.1:5000/api/search?${params.toString()}`
-      );
-      jobs.value = await res.json();
+      await fetchPage("/api/search", params, false);
     } catch (e) {
       console.error("検索エラー:", e);
     }
   }
 
+  // 直前の一覧・検索条件のまま次のページを追加で読み込む
+  async function fetchMoreJobs() {
+    if (!nextAfterId.value || !lastRequest.value) return;
+    try {
+      const { path, params } = lastRequest.value;
+      await fetchPage(path, params, true);
+    } catch (e) {
+      console.error("追加取得エラー:", e);
+    }
+  }
+
   // Watch for filter changes to trigger search or fetch
   watch([filterType, filterIndustry, filterLocation], () => {
     if (
@@ -77,7 +111,10 @@ export function useJobs() {
     wageMin,
     wageMax,
     industries,
+    nextAfterId,
+    totalEstimate,
     fetchJobs,
     searchJobs,
+    fetchMoreJobs,
   };
 }